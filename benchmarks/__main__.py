@@ -0,0 +1,104 @@
+"""
+Runs the benchmark suite and compares it with the stored baseline.
+Exits with status 1 when any metric regressed beyond the threshold.
+
+    python -m benchmarks                     # run and compare
+    python -m benchmarks --save-baseline     # run and store new baseline
+    python -m benchmarks --only decode_token --iterations 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+from benchmarks.cases import cpu_cases, database_available, db_cases
+from benchmarks.harness import (
+    BenchResult,
+    compare,
+    load_baseline,
+    results_document,
+    run_case,
+    save_results,
+)
+from src.core.db_init import db_url
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+async def run(
+    url: str,
+    only: list[str] | None,
+    iterations: int | None,
+    repeat: int,
+    with_db: bool,
+) -> list[BenchResult]:
+    async with AsyncExitStack() as stack:
+        cases = cpu_cases()
+        if with_db and await database_available(url):
+            cases += await stack.enter_async_context(db_cases(url))
+        elif with_db:
+            print(f'[INFO] Database at {url} is unavailable, DB cases skipped')
+        results: list[BenchResult] = []
+        for case in cases:
+            if only and case.name not in only:
+                continue
+            results.append(
+                await run_case(case, iterations=iterations, repeat=repeat)
+            )
+        return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default=db_url)
+    parser.add_argument('--no-db', action='store_true')
+    parser.add_argument('--only', nargs='*', help='case names to run')
+    parser.add_argument(
+        '--iterations', type=int, help='overrides iterations of every case'
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.25,
+        help='allowed relative regression, 0.25 means 25%%',
+    )
+    parser.add_argument('--output', type=Path, help='write results here')
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        run(
+            args.url,
+            args.only,
+            args.iterations,
+            args.repeat,
+            not args.no_db,
+        )
+    )
+    print(json.dumps(results_document(results), indent=2))
+    if args.output:
+        save_results(args.output, results)
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        return 0
+    regressions = compare(
+        results, load_baseline(args.baseline), threshold=args.threshold
+    )
+    for regression in regressions:
+        print(
+            f'[ERROR] {regression.name}: {regression.metric} '
+            f'{regression.baseline} -> {regression.current} '
+            f'({regression.change:+.1%})'
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
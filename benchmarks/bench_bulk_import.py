@@ -0,0 +1,72 @@
+"""
+Throughput of create_users_bulk in rows/s.
+
+Runs against the database from settings (or --url) that has the users
+table. Rows written by the run are removed afterwards.
+
+    python -m benchmarks.bench_bulk_import --rows 2000 --chunk-size 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.core.db_init import create_app_engine, db_url
+from src.core.hashing import shutdown_hash_executor
+from src.crud.db.user_service import create_users_bulk
+from src.models.user_model import User
+from src.schemas.user_schema import RegisterUserSchema
+
+
+async def run(url: str, rows: int, chunk_size: int) -> dict[str, float]:
+    engine = create_app_engine(url=url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    run_id: str = uuid.uuid4().hex[:8]
+    users = (
+        RegisterUserSchema(
+            email=f'bench-{run_id}-{index}@example.com',
+            password=f'password-{index}',
+        )
+        for index in range(rows)
+    )
+    try:
+        async with session_factory() as session:
+            started_at = time.perf_counter()
+            report = await create_users_bulk(
+                session=session, users=users, chunk_size=chunk_size
+            )
+            elapsed = time.perf_counter() - started_at
+            await session.execute(
+                delete(User).where(User.email.like(f'bench-{run_id}-%'))
+            )
+            await session.commit()
+    finally:
+        await engine.dispose()
+        shutdown_hash_executor()
+    return {
+        'rows': rows,
+        'created': len(report.created),
+        'seconds': round(elapsed, 3),
+        'rows_per_s': round(rows / elapsed, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default=db_url)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    args = parser.parse_args()
+    result = asyncio.run(run(args.url, args.rows, args.chunk_size))
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
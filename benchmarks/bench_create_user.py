@@ -0,0 +1,123 @@
+"""
+Single user registration: current single statement create_user against
+the previous SELECT + INSERT + COMMIT + REFRESH implementation.
+
+Runs against the database from settings (or --url) that has the users
+table. Rows written by the run are removed afterwards.
+
+    python -m benchmarks.bench_create_user --users 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.db_init import create_app_engine, db_url
+from src.crud.db.user_service import create_user
+from src.errors.db_errors import UserAlreadyExistsError
+from src.models.user_model import User
+from src.schemas.user_schema import CreateUserSchema, UserSchema
+
+HASHED_PASSWORD: str = User.hash_password('bench-password')
+
+
+async def create_user_legacy(
+    session: AsyncSession, user: CreateUserSchema
+) -> UserSchema:
+    """create_user as it was before the single statement version."""
+    existing_user: User | None = await session.scalar(
+        select(User).where(User.email == user.email)
+    )
+    if existing_user:
+        raise UserAlreadyExistsError('User already exists')
+    new_user = User(**user.model_dump())
+    session.add(new_user)
+    await session.commit()
+    await session.refresh(new_user)
+    return UserSchema.model_validate(new_user)
+
+
+async def measure(
+    session_factory: async_sessionmaker[AsyncSession],
+    create: Callable[[AsyncSession, CreateUserSchema], Awaitable[UserSchema]],
+    prefix: str,
+    users: int,
+) -> dict[str, float]:
+    latencies: list[float] = []
+    async with session_factory() as session:
+        for index in range(users):
+            user = CreateUserSchema(
+                email=f'{prefix}-{index}@example.com', password=HASHED_PASSWORD
+            )
+            started_at = time.perf_counter()
+            await create(session, user)
+            latencies.append(time.perf_counter() - started_at)
+        """duplicates"""
+        duplicate_latencies: list[float] = []
+        for index in range(min(users, 100)):
+            user = CreateUserSchema(
+                email=f'{prefix}-{index}@example.com', password=HASHED_PASSWORD
+            )
+            started_at = time.perf_counter()
+            try:
+                await create(session, user)
+            except UserAlreadyExistsError:
+                pass
+            duplicate_latencies.append(time.perf_counter() - started_at)
+        await session.execute(
+            delete(User).where(User.email.like(f'{prefix}-%'))
+        )
+        await session.commit()
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        'ops_per_s': round(len(latencies) / sum(latencies), 1),
+        'p50_ms': round(quantiles[49] * 1000, 3),
+        'p99_ms': round(quantiles[98] * 1000, 3),
+        'duplicate_p50_ms': round(
+            statistics.median(duplicate_latencies) * 1000, 3
+        ),
+    }
+
+
+async def run(url: str, users: int) -> dict[str, dict[str, float]]:
+    engine = create_app_engine(url=url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    run_id: str = uuid.uuid4().hex[:8]
+    try:
+        return {
+            'legacy': await measure(
+                session_factory,
+                create_user_legacy,
+                f'bench-legacy-{run_id}',
+                users,
+            ),
+            'single_statement': await measure(
+                session_factory,
+                lambda session, user: create_user(session=session, user=user),
+                f'bench-single-{run_id}',
+                users,
+            ),
+        }
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default=db_url)
+    parser.add_argument('--users', type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.url, args.users)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
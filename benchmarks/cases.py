@@ -0,0 +1,270 @@
+"""
+Benchmark cases for the auth hot paths. CPU cases need nothing, database
+cases need the users table in the database at url and are skipped when
+it is unreachable.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.harness import BenchCase
+from src.core.db_init import create_app_engine
+from src.core.metrics import HTTP_REQUEST_DURATION
+from src.core.tokens import TOKEN_CODECS, build_token_codec
+from src.crud.db.read_models import UserProfile
+from src.crud.db.user_cache import user_cache
+from src.crud.db.user_service import (
+    PROFILE_COLUMNS,
+    create_user,
+    get_login_credentials,
+    get_user_by_email,
+)
+from src.crud.routers.responses import user_response
+from src.models.user_model import User
+from src.schemas.user_schema import CreateUserSchema, UserSchema
+
+PASSWORD = 'bench-password'
+BULK_ROWS = 1000
+
+
+def cpu_cases() -> list[BenchCase]:
+    hashed_password: str = User.hash_password(PASSWORD)
+    user = User(
+        id=uuid.uuid4(),
+        email='bench@example.com',
+        full_name='Bench User',
+        hashed_password=hashed_password,
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+    )
+    token: str = user.generate_token()['access_token']
+    payload = {
+        'email': 'bench@example.com',
+        'full_name': 'Bench User',
+        'password': hashed_password,
+    }
+    return [
+        BenchCase(
+            'hash_password',
+            lambda: User.hash_password(PASSWORD),
+            iterations=10,
+            warmup=1,
+        ),
+        BenchCase(
+            'validate_password',
+            lambda: user.validate_password(PASSWORD),
+            iterations=10,
+            warmup=1,
+        ),
+        BenchCase('generate_token', user.generate_token, iterations=5000),
+        BenchCase(
+            'decode_token', lambda: User.decode_token(token), iterations=5000
+        ),
+        BenchCase(
+            'create_user_schema',
+            lambda: CreateUserSchema(**payload),
+            iterations=5000,
+        ),
+        BenchCase(
+            'user_schema_validate',
+            lambda: UserSchema.model_validate(user),
+            iterations=5000,
+        ),
+        BenchCase(
+            'metrics_observe',
+            lambda: HTTP_REQUEST_DURATION.labels(
+                'POST', '/login', '200'
+            ).observe(0.01),
+            iterations=5000,
+        ),
+    ] + token_codec_cases(user.generate_claims()) + serialization_cases(
+        UserSchema.model_construct(**user.to_dict())
+    )
+
+
+def token_codec_cases(claims: dict[str, Any]) -> list[BenchCase]:
+    """token_encode_<backend> and token_decode_<backend> for every codec
+    able to use the configured keys."""
+    cases: list[BenchCase] = []
+    for backend in TOKEN_CODECS:
+        try:
+            codec = build_token_codec(backend)
+        except ValueError:
+            continue
+        token = codec.encode(claims)
+        cases += [
+            BenchCase(
+                f'token_encode_{backend}',
+                functools.partial(codec.encode, claims),
+                iterations=5000,
+            ),
+            BenchCase(
+                f'token_decode_{backend}',
+                functools.partial(codec.decode, token),
+                iterations=5000,
+            ),
+        ]
+    return cases
+
+
+def serialization_cases(user: UserSchema) -> list[BenchCase]:
+    """Response encoding, FastAPI's response_model path (validation,
+    jsonable_encoder, json) against user_response, for one user and a
+    page of 1000."""
+    users = [
+        user.model_copy(update={'id': uuid.uuid4()}) for _ in range(1000)
+    ]
+    user_field = create_model_field(
+        'response', UserSchema, mode='serialization'
+    )
+    users_field = create_model_field(
+        'response', list[UserSchema], mode='serialization'
+    )
+
+    async def _default(field: Any, content: Any) -> bytes:
+        return JSONResponse(
+            await serialize_response(
+                field=field, response_content=content, is_coroutine=True
+            )
+        ).body
+
+    return [
+        BenchCase(
+            'serialize_user_default',
+            functools.partial(_default, user_field, user),
+            iterations=5000,
+        ),
+        BenchCase(
+            'serialize_user_orjson',
+            functools.partial(user_response, user),
+            iterations=5000,
+        ),
+        BenchCase(
+            'serialize_users_1000_default',
+            functools.partial(_default, users_field, users),
+            iterations=50,
+        ),
+        BenchCase(
+            'serialize_users_1000_orjson',
+            functools.partial(user_response, users),
+            iterations=50,
+        ),
+    ]
+
+
+async def database_available(url: str) -> bool:
+    engine = create_app_engine(url=url)
+    try:
+        async with engine.connect() as conn:
+            query = text("SELECT to_regclass('users') IS NOT NULL")
+            return bool(await conn.scalar(query))
+    except (SQLAlchemyError, DBAPIError, OSError):
+        return False
+    finally:
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def db_cases(url: str) -> AsyncIterator[list[BenchCase]]:
+    """Cases for create_user, get_user_by_email (cache hit and miss) and
+    column projections against full entity loads, for one row and for
+    1000 rows. Rows written by the run are removed on exit."""
+    engine = create_app_engine(url=url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    prefix = f'bench-{uuid.uuid4().hex[:8]}'
+    email = f'{prefix}-lookup@example.com'
+    counter = itertools.count()
+    hashed_password: str = User.hash_password(PASSWORD)
+    session: AsyncSession = session_factory()
+
+    async def _create() -> None:
+        await create_user(
+            session=session,
+            user=CreateUserSchema(
+                email=f'{prefix}-{next(counter)}@example.com',
+                password=hashed_password,
+            ),
+        )
+
+    async def _get_uncached() -> None:
+        user_cache.invalidate(email)
+        await get_user_by_email(session=session, email=email)
+
+    async def _load_entity() -> None:
+        """reference: full ORM entity load the projections replace"""
+        result = await session.execute(select(User).where(User.email == email))
+        result.scalars().one()
+        session.expunge_all()
+
+    in_range = User.email.between(f'{prefix}-bulk-', f'{prefix}-bulk-~')
+
+    async def _load_entities() -> None:
+        result = await session.execute(select(User).where(in_range))
+        assert len(result.scalars().all()) == BULK_ROWS
+        session.expunge_all()
+
+    async def _load_profiles() -> None:
+        result = await session.execute(
+            select(*PROFILE_COLUMNS).where(in_range)
+        )
+        assert len([UserProfile(*row) for row in result]) == BULK_ROWS
+
+    try:
+        await create_user(
+            session=session,
+            user=CreateUserSchema(email=email, password=hashed_password),
+        )
+        await session.execute(
+            insert(User),
+            [
+                {
+                    'email': f'{prefix}-bulk-{i:04}@example.com',
+                    'hashed_password': hashed_password,
+                }
+                for i in range(BULK_ROWS)
+            ],
+        )
+        await session.commit()
+        yield [
+            BenchCase('create_user', _create, iterations=500),
+            BenchCase(
+                'get_user_by_email',
+                lambda: get_user_by_email(session=session, email=email),
+                iterations=5000,
+            ),
+            BenchCase(
+                'get_user_by_email_uncached', _get_uncached, iterations=1000
+            ),
+            BenchCase(
+                'get_login_credentials',
+                lambda: get_login_credentials(session=session, email=email),
+                iterations=1000,
+            ),
+            BenchCase('load_user_entity', _load_entity, iterations=1000),
+            BenchCase(
+                'load_users_1000_entity', _load_entities, iterations=50
+            ),
+            BenchCase(
+                'load_users_1000_projection', _load_profiles, iterations=50
+            ),
+        ]
+    finally:
+        await session.execute(
+            delete(User).where(User.email.like(f'{prefix}-%'))
+        )
+        await session.commit()
+        await session.close()
+        await engine.dispose()
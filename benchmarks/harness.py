@@ -0,0 +1,179 @@
+"""
+Minimal benchmark harness: times a callable (sync or async) per call,
+measures its allocation high-water mark with tracemalloc and compares
+results against a stored baseline.
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+# Metrics compared with the baseline, True - higher is better. p99 is
+# reported only, on a shared machine it's dominated by scheduling noise
+COMPARED_METRICS: dict[str, bool] = {
+    'ops_per_s': True,
+    'p50_us': False,
+    'peak_alloc_bytes': False,
+}
+# Allocation differences below this are noise (interned objects, caches)
+ALLOC_SLACK_BYTES = 1024
+
+
+class BenchCase(NamedTuple):
+    name: str
+    func: Callable[[], Any]
+    iterations: int = 1000
+    warmup: int = 10
+
+
+class BenchResult(NamedTuple):
+    name: str
+    iterations: int
+    ops_per_s: float
+    p50_us: float
+    p99_us: float
+    peak_alloc_bytes: int
+
+
+class Regression(NamedTuple):
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+
+async def _call(func: Callable[[], Any]) -> None:
+    result = func()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def _peak_alloc(func: Callable[[], Any], samples: int) -> int:
+    """Median over samples of memory allocated on top of what was traced
+    before the call (peak, so freed temporaries count too)."""
+    peaks: list[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            before, _peak = tracemalloc.get_traced_memory()
+            await _call(func)
+            _current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return int(statistics.median(peaks))
+
+
+async def run_case(
+    case: BenchCase, iterations: int | None = None, repeat: int = 3
+) -> BenchResult:
+    """
+    Runs case: warmup, repeat rounds of timed iterations, then a few traced
+    calls for allocations (tracemalloc is slow, so it stays out of the
+    timing). The fastest round is reported, slower ones are mostly
+    interference from the rest of the machine.
+
+    Args:
+        case (BenchCase): Case to run.
+        iterations (int | None): Overrides case.iterations.
+        repeat (int): Number of timed rounds.
+
+    Returns:
+        BenchResult: Throughput, latency percentiles and allocations.
+    """
+    iterations = max(2, iterations or case.iterations)
+    for _ in range(case.warmup):
+        await _call(case.func)
+    durations: list[float] = []
+    for _ in range(max(1, repeat)):
+        round_durations: list[float] = []
+        for _ in range(iterations):
+            started_at = time.perf_counter()
+            await _call(case.func)
+            round_durations.append(time.perf_counter() - started_at)
+        if not durations or sum(round_durations) < sum(durations):
+            durations = round_durations
+    quantiles = statistics.quantiles(durations, n=100, method='inclusive')
+    return BenchResult(
+        name=case.name,
+        iterations=iterations,
+        ops_per_s=round(len(durations) / sum(durations), 1),
+        p50_us=round(quantiles[49] * 1e6, 1),
+        p99_us=round(quantiles[98] * 1e6, 1),
+        peak_alloc_bytes=await _peak_alloc(
+            case.func, samples=min(iterations, 20)
+        ),
+    )
+
+
+def compare(
+    results: list[BenchResult],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[Regression]:
+    """
+    Finds metrics worse than baseline by more than threshold.
+
+    Args:
+        results (list[BenchResult]): Current results.
+        baseline (dict): Results by case name, as stored by save_results.
+        threshold (float): Allowed relative change, 0.2 means 20%.
+
+    Returns:
+        list[Regression]: Regressions, empty when everything is fine.
+        Cases missing from baseline are not compared.
+    """
+    regressions: list[Regression] = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old: float = reference.get(metric, 0)
+            new: float = getattr(result, metric)
+            if old <= 0:
+                continue
+            change = (new - old) / old
+            if metric == 'peak_alloc_bytes' and new - old < ALLOC_SLACK_BYTES:
+                continue
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(
+                    Regression(
+                        name=result.name,
+                        metric=metric,
+                        baseline=old,
+                        current=new,
+                        change=round(change, 3),
+                    )
+                )
+    return regressions
+
+
+def results_document(results: list[BenchResult]) -> dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': {
+            result.name: result._asdict() for result in results
+        },
+    }
+
+
+def save_results(path: Path, results: list[BenchResult]) -> None:
+    path.write_text(json.dumps(results_document(results), indent=2) + '\n')
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, float]]:
+    """Results by case name, empty when there's no baseline yet."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())['results']
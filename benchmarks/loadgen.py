@@ -0,0 +1,378 @@
+"""
+HTTP load generator for capacity planning. Drives the app in-process
+through ASGI transport (database from settings, lifespan included) or a
+running server with --base-url.
+
+Closed loop (default): --concurrency workers send requests back to back.
+Open loop: --rate requests per second arrive on a Poisson schedule, at
+most --concurrency in flight. Latency is measured from the scheduled
+arrival, so a saturated server shows up as queueing latency instead of
+silently lowering the request rate (coordinated omission).
+
+    python -m benchmarks.loadgen --scenario mixed --concurrency 32
+    python -m benchmarks.loadgen --base-url http://localhost:3000 --rate 200
+
+Login scenarios exceed the per IP and per account limits by design, run
+them with LOGIN_RATE_LIMIT_ENABLED=false and LOGIN_MAX_IN_FLIGHT at least
+--concurrency, otherwise 429/503 are what gets measured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, NamedTuple
+
+import httpx
+
+from src.core.sql_instrumentation import PoolStats
+
+PASSWORD = 'load-password'
+PERCENTILES = (50, 75, 90, 95, 99, 99.9, 99.99, 100)
+SCENARIOS: dict[str, dict[str, float]] = {
+    'login': {'login': 1},
+    'register': {'register': 1},
+    'read_user': {'read_user': 1},
+    'mixed': {'login': 0.3, 'read_user': 0.6, 'register': 0.1},
+}
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of microsecond latencies in the spirit of
+    HdrHistogram: every power of two range is split into the same number
+    of buckets, so relative error stays under 1/2**(SUB_BUCKET_BITS - 1)
+    at any magnitude while memory stays small.
+    """
+
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self) -> None:
+        self.counts: Counter[int] = Counter()
+        self.total = 0
+        self.max_us = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.SUB_BUCKET_BITS)
+        return (shift << self.SUB_BUCKET_BITS) | (value >> shift)
+
+    def _upper(self, index: int) -> int:
+        shift = index >> self.SUB_BUCKET_BITS
+        sub_bucket = index & ((1 << self.SUB_BUCKET_BITS) - 1)
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(0, round(seconds * 1e6))
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.max_us = max(self.max_us, value)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in seconds at percent (0-100), 0 for empty histogram."""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(percent / 100 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper(index), self.max_us) / 1e6
+        return self.max_us / 1e6
+
+    def distribution(self) -> dict[str, float]:
+        return {
+            f'p{percent:g}': round(self.percentile(percent) * 1000, 3)
+            for percent in PERCENTILES
+        }
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.histogram = LatencyHistogram()
+        self.statuses: Counter[str] = Counter()
+        self.errors = 0
+
+    def record(self, seconds: float, status: str, ok: bool) -> None:
+        self.histogram.record(seconds)
+        self.statuses[status] += 1
+        if not ok:
+            self.errors += 1
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        requests = self.histogram.total
+        return {
+            'requests': requests,
+            'throughput_rps': round(requests / elapsed, 1),
+            'errors': self.errors,
+            'error_rate': round(self.errors / requests, 4) if requests else 0,
+            'statuses': dict(self.statuses),
+            'latency_ms': self.histogram.distribution(),
+        }
+
+
+class LoadUser(NamedTuple):
+    email: str
+    token: str
+
+
+class PoolSampler:
+    """Samples pool occupancy while the load runs, reports checkout waits
+    accumulated during the run."""
+
+    def __init__(
+        self, sample: Callable[[], PoolStats | None], interval: float = 0.1
+    ) -> None:
+        self.sample = sample
+        self.interval = interval
+        self.first: PoolStats | None = None
+        self.last: PoolStats | None = None
+        self.max_checked_out = 0
+        self.max_overflow = 0
+
+    def _take(self) -> None:
+        stats = self.sample()
+        if stats is None:
+            return
+        self.first = self.first or stats
+        self.last = stats
+        self.max_checked_out = max(self.max_checked_out, stats.checked_out)
+        self.max_overflow = max(self.max_overflow, stats.overflow)
+
+    async def run(self) -> None:
+        while True:
+            self._take()
+            await asyncio.sleep(self.interval)
+
+    def report(self) -> dict[str, Any] | None:
+        self._take()
+        if self.first is None or self.last is None:
+            return None
+        checkouts = self.last.checkouts - self.first.checkouts
+        wait = self.last.checkout_wait_total - self.first.checkout_wait_total
+        return {
+            'size': self.last.size,
+            'max_checked_out': self.max_checked_out,
+            'max_overflow': self.max_overflow,
+            'checkouts': checkouts,
+            'mean_checkout_wait_ms': (
+                round(wait / checkouts * 1000, 3) if checkouts else 0
+            ),
+            'max_checkout_wait_ms': round(
+                self.last.checkout_wait_max * 1000, 3
+            ),
+        }
+
+
+async def prepare_users(
+    client: httpx.AsyncClient, count: int, prefix: str
+) -> list[LoadUser]:
+    """Registers users and logs them in, tokens are used by read_user."""
+    users: list[LoadUser] = []
+    for index in range(count):
+        email = f'{prefix}-{index}@example.com'
+        body = {'email': email, 'password': PASSWORD}
+        response = await client.post('/users', json=body)
+        if response.status_code not in (201, 409):
+            response.raise_for_status()
+        response = await client.post('/login', json=body)
+        response.raise_for_status()
+        users.append(LoadUser(email, response.json()['access_token']))
+    return users
+
+
+def _requests(
+    client: httpx.AsyncClient, users: list[LoadUser], prefix: str
+) -> dict[str, Callable[[], Awaitable[httpx.Response]]]:
+    counter = itertools.count()
+
+    def _login() -> Awaitable[httpx.Response]:
+        user = random.choice(users)
+        return client.post(
+            '/login', json={'email': user.email, 'password': PASSWORD}
+        )
+
+    def _register() -> Awaitable[httpx.Response]:
+        return client.post(
+            '/users',
+            json={
+                'email': f'{prefix}-new-{next(counter)}@example.com',
+                'password': PASSWORD,
+            },
+        )
+
+    def _read_user() -> Awaitable[httpx.Response]:
+        user = random.choice(users)
+        return client.get(
+            f'/users/{user.email}',
+            headers={'Authorization': f'Bearer {user.token}'},
+        )
+
+    return {'login': _login, 'register': _register, 'read_user': _read_user}
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    scenario: str = 'mixed',
+    concurrency: int = 16,
+    rate: float | None = None,
+    duration: float = 10,
+    max_requests: int | None = None,
+    users: int = 20,
+    pool_sample: Callable[[], PoolStats | None] | None = None,
+) -> dict[str, Any]:
+    """
+    Runs the load and returns the report.
+
+    Args:
+        client (httpx.AsyncClient): Client with base_url set.
+        scenario (str): Key of SCENARIOS.
+        concurrency (int): Workers (closed loop) or in-flight cap (open).
+        rate (float | None): Arrivals per second, None for closed loop.
+        duration (float): Seconds to run.
+        max_requests (int | None): Stops earlier after that many requests.
+        users (int): Registered users the requests are spread across.
+        pool_sample (Callable | None): Returns engine pool stats, in-process
+            runs only.
+
+    Returns:
+        dict[str, Any]: Report, JSON serializable.
+    """
+    prefix = f'load-{uuid.uuid4().hex[:8]}'
+    load_users = await prepare_users(client, users, prefix)
+    senders = _requests(client, load_users, prefix)
+    weights = SCENARIOS[scenario]
+    names, probabilities = list(weights), list(weights.values())
+    stats: dict[str, EndpointStats] = {name: EndpointStats() for name in names}
+    budget = iter(range(max_requests)) if max_requests else None
+
+    def _has_budget() -> bool:
+        return budget is None or next(budget, None) is not None
+
+    async def _send(scheduled_at: float) -> None:
+        name = random.choices(names, probabilities)[0]
+        try:
+            response = await senders[name]()
+            status, ok = str(response.status_code), response.is_success
+        except httpx.HTTPError as e:
+            status, ok = type(e).__name__, False
+        stats[name].record(time.perf_counter() - scheduled_at, status, ok)
+
+    started_at = time.perf_counter()
+    deadline = started_at + duration
+
+    async def _worker() -> None:
+        while time.perf_counter() < deadline and _has_budget():
+            await _send(time.perf_counter())
+
+    async def _open_loop() -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+        in_flight: set[asyncio.Task] = set()
+
+        async def _arrival(scheduled_at: float) -> None:
+            async with semaphore:
+                await _send(scheduled_at)
+
+        scheduled_at = started_at
+        while scheduled_at < deadline and _has_budget():
+            await asyncio.sleep(max(0.0, scheduled_at - time.perf_counter()))
+            task = asyncio.create_task(_arrival(scheduled_at))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            scheduled_at += random.expovariate(rate)
+        await asyncio.gather(*in_flight)
+
+    sampler = PoolSampler(pool_sample) if pool_sample else None
+    sampler_task = asyncio.create_task(sampler.run()) if sampler else None
+    try:
+        if rate:
+            await _open_loop()
+        else:
+            await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    finally:
+        if sampler_task:
+            sampler_task.cancel()
+    elapsed = time.perf_counter() - started_at
+    total = sum(endpoint.histogram.total for endpoint in stats.values())
+    errors = sum(endpoint.errors for endpoint in stats.values())
+    return {
+        'scenario': scenario,
+        'mode': 'open' if rate else 'closed',
+        'concurrency': concurrency,
+        'rate': rate,
+        'elapsed_s': round(elapsed, 3),
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 1),
+        'error_rate': round(errors / total, 4) if total else 0,
+        'endpoints': {
+            name: endpoint.report(elapsed) for name, endpoint in stats.items()
+        },
+        'pool': sampler.report() if sampler else None,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    async with AsyncExitStack() as stack:
+        pool_sample: Callable[[], PoolStats | None] | None = None
+        if args.base_url:
+            transport = None
+            base_url = args.base_url
+        else:
+            from src.app import app
+            from src.core.db_init import get_app_engine
+            from src.core.sql_instrumentation import pool_stats
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = 'http://loadgen'
+
+            def pool_sample() -> PoolStats | None:
+                return pool_stats(get_app_engine())
+
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(
+                transport=transport,
+                base_url=base_url,
+                timeout=args.timeout,
+                limits=httpx.Limits(max_connections=args.concurrency),
+            )
+        )
+        return await run_load(
+            client,
+            scenario=args.scenario,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            duration=args.duration,
+            max_requests=args.requests,
+            users=args.users,
+            pool_sample=pool_sample,
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        '--base-url', help='running server, in-process when unset'
+    )
+    parser.add_argument('--scenario', choices=SCENARIOS, default='mixed')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--rate', type=float, help='arrivals per second')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--requests', type=int, help='stop after N requests')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=30)
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,6 @@
 from __future__ import with_statement
 
 import asyncio
-import os
 from logging.config import fileConfig
 
 from sqlalchemy import pool
@@ -11,15 +10,20 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 # from sqlalchemy import engine_from_config
 from alembic import context
 from src.core.base import Base
+from src.core.db_init import db_url
+from src.models import RefreshToken, RevokedToken, User  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
 # Interpret the config file for Python logging.
-# This line sets up loggers basically.
-if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+# This line sets up loggers basically. Skipped when src.core.migrate runs
+# migrations inside the app process, whose logging is configured already.
+if config.config_file_name is not None and config.attributes.get(
+    'configure_logger', True
+):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -27,17 +31,9 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
-# Read env vars
-PG_ASYNC_PREFIX = os.getenv('PG_ASYNC_PREFIX', 'postgresql+asyncpg')
-USER = os.getenv('PG_USER', 'user')
-PASSWORD = os.getenv('PG_PASSWORD', 'password')
-HOST = os.getenv('PG_HOST', 'localhost')
-PORT = os.getenv('PG_PORT', '5432')
-DB = os.getenv('PG_DB', 'mydb')
-
-DB_URL = f"{PG_ASYNC_PREFIX}://{USER}:{PASSWORD}@{HOST}:{PORT}/{DB}"
-
-config.set_main_option("sqlalchemy.url", DB_URL)
+# Same settings as the app, URL passed by caller (tests, migrate) wins
+if not config.get_main_option('sqlalchemy.url'):
+    config.set_main_option('sqlalchemy.url', db_url.replace('%', '%%'))
 
 
 # other values from the config, defined by the needs of env.py,
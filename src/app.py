@@ -1,9 +1,22 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
+from src.core.db_init import new_session
+from src.core.engines import close_all_engines
+from src.core.hashing import shutdown_hash_executor
+from src.core.metrics import MetricsMiddleware
 from src.core.settings import settings
 from src.core.start import startup
+from src.core.tokens import get_token_codec
+from src.crud.db.email_filter import maintain_email_filter
+from src.crud.db.revocation_list import maintain_revocation_list
+from src.crud.routers.auth_router import router as auth_router
+from src.crud.routers.jwks_router import router as jwks_router
+from src.crud.routers.metrics_router import router as metrics_router
+from src.crud.routers.responses import ORJSONResponse
+from src.crud.routers.user_router import router as user_router
 
 
 @asynccontextmanager
@@ -13,25 +26,34 @@ async def lifespan(app: FastAPI):
     To understand more, read https://fastapi.tiangolo.com/advanced/events/
     """
     await startup()
+    get_token_codec()
     # print('\n\nLifespan\n\n')
+    background_tasks: list[asyncio.Task] = [
+        asyncio.create_task(maintain_revocation_list(new_session))
+    ]
+    if settings.email_filter_enabled:
+        background_tasks.append(
+            asyncio.create_task(maintain_email_filter(new_session))
+        )
     yield
     # print('after')
-
-
-app = FastAPI(lifespan=lifespan, title=settings.project_name)
-
-
-
-@app.get('/login')
-def login():
-    """Processes user's authentication and returns a token
-    on successful authentication.
-
-    request body:
-
-    - username: Unique identifier for a user e.g email, 
-                phone number, name
-
-    - password:
-    """
-    return "ThisTokenIsFake!"
\ No newline at end of file
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    shutdown_hash_executor()
+    await close_all_engines()
+
+
+app = FastAPI(
+    lifespan=lifespan,
+    title=settings.project_name,
+    default_response_class=ORJSONResponse,
+)
+
+app.add_middleware(MetricsMiddleware)
+
+app.include_router(auth_router)
+app.include_router(user_router)
+app.include_router(jwks_router)
+app.include_router(metrics_router)
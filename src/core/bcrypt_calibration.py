@@ -0,0 +1,97 @@
+"""
+Picks bcrypt cost factor for the current machine: the highest cost whose
+verification still fits into the target time.
+
+    python -m src.core.bcrypt_calibration --target-ms 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import NamedTuple
+
+import bcrypt
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+
+class RoundsTiming(NamedTuple):
+    rounds: int
+    median_ms: float
+
+
+class Calibration(NamedTuple):
+    rounds: int
+    target_ms: float
+    timings: list[RoundsTiming]
+
+
+def measure(rounds: int, samples: int = 3) -> float:
+    """Median time (ms) of verifying a password hashed at rounds cost."""
+    password = b'calibration-password'
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+    durations: list[float] = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        bcrypt.checkpw(password, hashed)
+        durations.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(durations)
+
+
+def calibrate(
+    target_ms: float,
+    min_rounds: int = MIN_ROUNDS,
+    max_rounds: int = MAX_ROUNDS,
+    samples: int = 3,
+) -> Calibration:
+    """
+    Measures costs from min_rounds upwards and stops at the first one
+    exceeding target_ms. Each extra round doubles the work, so this costs
+    about twice the time of the last measurement.
+
+    Args:
+        target_ms (float): Verification time budget in milliseconds.
+        min_rounds (int): Lowest cost returned even if it misses target.
+        max_rounds (int): Highest cost considered.
+        samples (int): Verifications per cost, median is used.
+
+    Returns:
+        Calibration: Chosen cost and the measurements behind it.
+    """
+    chosen = min_rounds
+    timings: list[RoundsTiming] = []
+    for rounds in range(min_rounds, max_rounds + 1):
+        median_ms = measure(rounds, samples)
+        timings.append(RoundsTiming(rounds, round(median_ms, 3)))
+        if median_ms > target_ms:
+            break
+        chosen = rounds
+    return Calibration(rounds=chosen, target_ms=target_ms, timings=timings)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--target-ms',
+        type=float,
+        default=250,
+        help='verification time budget per login',
+    )
+    parser.add_argument('--samples', type=int, default=3)
+    parser.add_argument('--max-rounds', type=int, default=16)
+    args = parser.parse_args(argv)
+    calibration = calibrate(
+        target_ms=args.target_ms,
+        max_rounds=args.max_rounds,
+        samples=args.samples,
+    )
+    for timing in calibration.timings:
+        print(f'[INFO] rounds={timing.rounds} median={timing.median_ms}ms')
+    print(f'BCRYPT_ROUNDS={calibration.rounds}')
+
+
+if __name__ == '__main__':
+    main()
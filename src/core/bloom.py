@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Classic Bloom filter over strings: no false negatives, false positives
+    at about fp_rate while no more than capacity items are added.
+    Positions come from double hashing of a single blake2b digest.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float) -> None:
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        if not 0 < fp_rate < 1:
+            raise ValueError('fp_rate must be between 0 and 1')
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.size = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [
+            (first + index * second) % self.size
+            for index in range(self.hashes)
+        ]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def estimated_fp_rate(self) -> float:
+        """False positive rate for the number of items actually added."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** (
+            self.hashes
+        )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -10,7 +10,14 @@ from sqlalchemy.ext.asyncio import (
 )
 
 # from src.core.base import Base
+from src.core.engines import created_engines, get_engine, register_engine
+from src.core.metrics import Samples, registry
 from src.core.settings import settings
+from src.core.sql_instrumentation import (
+    InstrumentedAsyncPool,
+    instrument_engine,
+    pool_stats,
+)
 
 # from src.models.user_model import User
 
@@ -21,18 +28,82 @@ admin_db_url: str = (
     f'{settings.pg_host}:{settings.pg_port}/postgres'
 )
 
-admin_engine: AsyncEngine = create_async_engine(
-    url=admin_db_url, isolation_level='AUTOCOMMIT', echo=True, future=True
-)
+ADMIN_ENGINE = 'admin'
+APP_ENGINE = 'app'
+
+
+def create_admin_engine(url: str = admin_db_url) -> AsyncEngine:
+    return instrument_engine(
+        create_async_engine(url=url, isolation_level='AUTOCOMMIT', future=True)
+    )
 
 db_url: str = (
     f'{settings.pg_async_prefix}://{settings.pg_user}:{settings.pg_password}@'
     f'{settings.pg_host}:{settings.pg_port}/{settings.pg_db}'
 )
 
-engine: AsyncEngine = create_async_engine(
-    url=db_url, isolation_level='AUTOCOMMIT', echo=True, future=True
-)
+
+def create_app_engine(url: str = db_url) -> AsyncEngine:
+    """
+    Creates engine with connection pool tuned from settings. The engine is
+    meant to live as long as the process, it's disposed on app shutdown.
+
+    Args:
+        url (str): Database URL.
+
+    Returns:
+        AsyncEngine: Pooled engine.
+    """
+    return instrument_engine(
+        create_async_engine(
+            url=url,
+            isolation_level='AUTOCOMMIT',
+            future=True,
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.pg_pool_size,
+            max_overflow=settings.pg_max_overflow,
+            pool_timeout=settings.pg_pool_timeout,
+            pool_pre_ping=settings.pg_pool_pre_ping,
+            pool_recycle=settings.pg_pool_recycle,
+        )
+    )
+
+
+register_engine(ADMIN_ENGINE, create_admin_engine)
+register_engine(APP_ENGINE, create_app_engine)
+
+
+def get_admin_engine() -> AsyncEngine:
+    """Engine connected as superuser to the postgres database."""
+    return get_engine(ADMIN_ENGINE)
+
+
+def get_app_engine() -> AsyncEngine:
+    """Pooled application engine, created on first use."""
+    return get_engine(APP_ENGINE)
+
+
+def _app_pool_samples(field: str) -> Samples:
+    """Pool stats of the app engine, nothing until it's created - scrape
+    must not open connections."""
+    if APP_ENGINE not in created_engines():
+        return []
+    stats = pool_stats(get_app_engine())
+    return [((), getattr(stats, field))] if stats else []
+
+
+for _name, _field, _documentation, _kind in (
+    ('db_pool_size', 'size', 'Pool size', 'gauge'),
+    ('db_pool_checked_out', 'checked_out', 'Connections in use', 'gauge'),
+    ('db_pool_overflow', 'overflow', 'Connections above size', 'gauge'),
+    ('db_pool_checkouts', 'checkouts', 'Connection checkouts', 'counter'),
+):
+    registry.collected(
+        _name,
+        _documentation,
+        lambda field=_field: _app_pool_samples(field),
+        kind=_kind,
+    )
 
 
 # class Base(DeclarativeBase):
@@ -44,14 +115,24 @@ engine: AsyncEngine = create_async_engine(
 
 
 async_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-    engine, expire_on_commit=False
+    expire_on_commit=False
 )
 
 
+def new_session() -> AsyncSession:
+    """Session bound to the application engine of current process."""
+    return async_session_factory(bind=get_app_engine())
+
+
+def get_session_factory() -> Callable[[], AsyncSession]:
+    """Dependency for work that outlives the request, e.g. background
+    tasks, which must open their own sessions."""
+    return new_session
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
+    async with new_session() as session:
         yield session
-    await engine.dispose()  # Close all connections in the pool when done
 
 
 # --------------------------------------------------------------------------
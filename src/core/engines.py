@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_factories: dict[str, Callable[[], AsyncEngine]] = {}
+_engines: dict[str, AsyncEngine] = {}
+_pid: int = os.getpid()
+
+
+def register_engine(name: str, factory: Callable[[], AsyncEngine]) -> None:
+    """Registers factory, nothing is created until get_engine(name)."""
+    _factories[name] = factory
+
+
+def get_engine(name: str) -> AsyncEngine:
+    """
+    Returns engine registered under name, creating it on first use in the
+    current process.
+
+    Args:
+        name (str): Name given to register_engine.
+
+    Returns:
+        AsyncEngine: Engine owned by current process.
+    """
+    if os.getpid() != _pid:
+        _forget_inherited_engines()
+    engine = _engines.get(name)
+    if engine is None:
+        engine = _engines[name] = _factories[name]()
+    return engine
+
+
+def created_engines() -> list[str]:
+    """Names of engines created in current process so far."""
+    return list(_engines)
+
+
+async def close_all_engines() -> None:
+    """Disposes every created engine, next get_engine creates new one."""
+    engines = list(_engines.values())
+    _engines.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+def _forget_inherited_engines() -> None:
+    """
+    Child process must not touch connections inherited from parent. Pools
+    are dropped without closing sockets parent still uses, see
+    https://docs.sqlalchemy.org/en/20/core/pooling.html#using-connection-pools-with-multiprocessing-or-os-fork
+    """
+    global _pid
+    for engine in _engines.values():
+        engine.sync_engine.dispose(close=False)
+    _engines.clear()
+    _pid = os.getpid()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_inherited_engines)
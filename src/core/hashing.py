@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Generic, Literal, NamedTuple, TypeVar
+
+import bcrypt
+
+from src.core.metrics import HASH_DURATION, HASH_QUEUE_WAIT, registry
+from src.core.settings import settings
+
+T = TypeVar('T')
+
+HashPoolMode = Literal['process', 'thread']
+
+
+class PoolResult(NamedTuple, Generic[T]):
+    """Value computed in the hashing pool and the time (seconds) the call
+    spent waiting in the pool queue before a worker picked it up."""
+
+    value: T
+    queue_wait: float
+
+
+def hash_password(password: str, rounds: int | None = None) -> str:
+    """Hashes password with bcrypt at settings.bcrypt_rounds cost unless
+    rounds is given. Runs inside pool workers, so it must stay a picklable
+    module level function."""
+    salt = bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
+    return bcrypt.hashpw(password.encode(), salt).decode('utf-8')
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    """Verifies password against bcrypt hash. Runs inside pool workers."""
+    return bcrypt.checkpw(password.encode(), hashed_password.encode())
+
+
+def hash_rounds(hashed_password: str) -> int:
+    """Cost factor stored in bcrypt hash: $2b$<rounds>$<salt+digest>."""
+    return int(hashed_password.split('$')[2])
+
+
+def needs_rehash(hashed_password: str, rounds: int | None = None) -> bool:
+    """True when hash was made with a cost other than the configured one."""
+    return hash_rounds(hashed_password) != (rounds or settings.bcrypt_rounds)
+
+
+def _timed_call(func: Callable[..., T], *args: Any) -> tuple[T, float]:
+    """Wraps func to report the moment a worker actually started it.
+    time.monotonic is system wide, so it's comparable across processes."""
+    started_at = time.monotonic()
+    return func(*args), started_at
+
+
+def create_hash_executor(mode: HashPoolMode, size: int) -> Executor:
+    """
+    Creates executor for password hashing.
+
+    Args:
+        mode (HashPoolMode): 'process' - one process per core, fully
+            isolated from the event loop; 'thread' - cheaper to start,
+            works in parallel as bcrypt releases the GIL.
+        size (int): Number of workers.
+
+    Returns:
+        Executor: New executor.
+    """
+    if mode == 'thread':
+        return ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix='hash-pool'
+        )
+    return ProcessPoolExecutor(
+        max_workers=size, mp_context=multiprocessing.get_context('spawn')
+    )
+
+
+_executor: Executor | None = None
+"""calls submitted and not finished, per executor"""
+_in_flight: dict[Executor, int] = {}
+
+
+def _worker_count(executor: Executor) -> int:
+    """Workers of the executor: both pool classes keep it in _max_workers,
+    others are assumed to run one call at a time."""
+    return getattr(executor, '_max_workers', 1)
+
+
+def _queue_depth() -> int:
+    """Calls waiting for a free worker, summed over executors in use."""
+    return sum(
+        max(0, in_flight - _worker_count(executor))
+        for executor, in_flight in list(_in_flight.items())
+    )
+
+
+def get_hash_executor() -> Executor:
+    """Returns the shared hashing executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = create_hash_executor(
+            mode=settings.hash_pool_mode, size=settings.hash_pool_size
+        )
+    return _executor
+
+
+def shutdown_hash_executor(wait: bool = True) -> None:
+    """Stops the shared hashing executor, next call creates a new one."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+async def run_in_hash_pool(
+    func: Callable[..., T], *args: Any, executor: Executor | None = None
+) -> PoolResult[T]:
+    """
+    Runs CPU bound func off the event loop.
+
+    Args:
+        func (Callable): Picklable module level function.
+        *args: Picklable arguments for func.
+        executor (Executor | None): Executor to use, shared one by default.
+
+    Returns:
+        PoolResult: func result and time spent in the queue.
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or get_hash_executor()
+    submitted_at = time.monotonic()
+    _in_flight[executor] = _in_flight.get(executor, 0) + 1
+    try:
+        value, started_at = await loop.run_in_executor(
+            executor, _timed_call, func, *args
+        )
+    finally:
+        if _in_flight[executor] == 1:
+            del _in_flight[executor]
+        else:
+            _in_flight[executor] -= 1
+    finished_at = time.monotonic()
+    queue_wait = max(0.0, started_at - submitted_at)
+    HASH_QUEUE_WAIT.labels(func.__name__).observe(queue_wait)
+    HASH_DURATION.labels(func.__name__).observe(finished_at - started_at)
+    return PoolResult(value, queue_wait)
+
+
+registry.collected(
+    'hash_pool_in_flight',
+    'Hashing calls submitted and not finished yet',
+    lambda: [((), sum(_in_flight.values()))],
+)
+registry.collected(
+    'hash_pool_queue_depth',
+    'Hashing calls waiting for a free worker',
+    lambda: [((), _queue_depth())],
+)
@@ -0,0 +1,198 @@
+"""
+Signing keys for access tokens.
+
+Asymmetric keys are PEM private keys in settings.jwt_keys_dir, one file
+per key named <kid>.pem: RSA keys sign RS256, Ed25519 keys sign EdDSA.
+settings.jwt_active_kid signs new tokens, every key in the directory
+verifies and is published in JWKS. Rotation: add the new key file and
+restart, so downstream services fetch it with JWKS; then make it active;
+remove the old file once tokens signed by it have expired.
+
+Without jwt_keys_dir tokens are signed HS256 with settings.secret_key and
+nothing is published.
+
+    python -m src.core.jwt_keys generate --kind ed25519 --kid 2026-10
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from src.core.settings import settings
+
+HMAC_KID = 'hmac'
+HMAC_ALGORITHMS = ('HS256', 'HS384', 'HS512')
+
+
+class SigningKey(NamedTuple):
+    """
+    Key material, parsed once per process. Asymmetric keys are
+    cryptography key objects, HMAC keys are the secret bytes for both.
+    Token codecs derive their backend specific key objects from these.
+    """
+
+    kid: str
+    algorithm: str
+    private_key: Any
+    public_key: Any
+    public_jwk: dict[str, str] | None
+
+
+class KeyRing(NamedTuple):
+    active: SigningKey
+    keys: dict[str, SigningKey]
+
+    def jwks(self) -> dict[str, list[dict[str, str]]]:
+        return {
+            'keys': [
+                key.public_jwk
+                for key in self.keys.values()
+                if key.public_jwk is not None
+            ]
+        }
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def _b64url_uint(value: int) -> str:
+    return _b64url(value.to_bytes((value.bit_length() + 7) // 8, 'big'))
+
+
+def load_pem_key(kid: str, pem: bytes) -> SigningKey:
+    """
+    Builds SigningKey from PEM private key.
+
+    Args:
+        kid (str): Key id put into token header and JWKS.
+        pem (bytes): PEM encoded RSA or Ed25519 private key.
+
+    Returns:
+        SigningKey: RS256 key for RSA, EdDSA key for Ed25519.
+    """
+    private_key = serialization.load_pem_private_key(pem, password=None)
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        public_key = private_key.public_key()
+        numbers = public_key.public_numbers()
+        public_jwk = {
+            'kty': 'RSA',
+            'n': _b64url_uint(numbers.n),
+            'e': _b64url_uint(numbers.e),
+            'alg': 'RS256',
+            'kid': kid,
+            'use': 'sig',
+        }
+        return SigningKey(kid, 'RS256', private_key, public_key, public_jwk)
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        public_key = private_key.public_key()
+        raw = public_key.public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        public_jwk = {
+            'kty': 'OKP',
+            'crv': 'Ed25519',
+            'x': _b64url(raw),
+            'alg': 'EdDSA',
+            'kid': kid,
+            'use': 'sig',
+        }
+        return SigningKey(kid, 'EdDSA', private_key, public_key, public_jwk)
+    raise ValueError(f'Key {kid}: only RSA and Ed25519 keys are supported')
+
+
+def load_key_ring(
+    keys_dir: str | None = None,
+    active_kid: str | None = None,
+    secret_key: str | None = None,
+    algorithm: str | None = None,
+) -> KeyRing:
+    """
+    Loads keys from keys_dir or builds the HMAC fallback.
+
+    Args:
+        keys_dir (str | None): Directory with <kid>.pem files.
+        active_kid (str | None): Signing key, may be omitted with one key.
+        secret_key (str | None): HMAC secret for the fallback.
+        algorithm (str | None): HMAC algorithm for the fallback.
+
+    Returns:
+        KeyRing: Active key and all verification keys by kid.
+    """
+    if not keys_dir:
+        secret = (secret_key or settings.secret_key).encode()
+        algorithm = algorithm or settings.algorithm
+        if algorithm not in HMAC_ALGORITHMS:
+            raise ValueError(f'{algorithm} needs JWT_KEYS_DIR')
+        key = SigningKey(HMAC_KID, algorithm, secret, secret, None)
+        return KeyRing(active=key, keys={HMAC_KID: key})
+    keys = {
+        path.stem: load_pem_key(path.stem, path.read_bytes())
+        for path in sorted(Path(keys_dir).glob('*.pem'))
+    }
+    if not keys:
+        raise ValueError(f'No *.pem keys in {keys_dir}')
+    if active_kid is None:
+        if len(keys) > 1:
+            raise ValueError('JWT_ACTIVE_KID is required with several keys')
+        active_kid = next(iter(keys))
+    if active_kid not in keys:
+        raise ValueError(f'Active key {active_kid} is not in {keys_dir}')
+    return KeyRing(active=keys[active_kid], keys=keys)
+
+
+@lru_cache(maxsize=1)
+def get_key_ring() -> KeyRing:
+    """Key ring from settings, loaded on first use."""
+    return load_key_ring(
+        keys_dir=settings.jwt_keys_dir, active_kid=settings.jwt_active_kid
+    )
+
+
+@lru_cache(maxsize=1)
+def jwks_document() -> bytes:
+    """Serialized JWKS, it only changes with the key ring."""
+    return json.dumps(get_key_ring().jwks(), separators=(',', ':')).encode()
+
+
+def generate_pem(kind: str) -> bytes:
+    private_key: rsa.RSAPrivateKey | ed25519.Ed25519PrivateKey = (
+        rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        if kind == 'rsa'
+        else ed25519.Ed25519PrivateKey.generate()
+    )
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help='write new private key')
+    generate.add_argument('--kind', choices=['rsa', 'ed25519'], default='rsa')
+    generate.add_argument('--kid', required=True)
+    generate.add_argument('--dir', default=settings.jwt_keys_dir or '.')
+    args = parser.parse_args(argv)
+    path = Path(args.dir) / f'{args.kid}.pem'
+    if path.exists():
+        raise SystemExit(f'{path} already exists')
+    path.write_bytes(generate_pem(args.kind))
+    path.chmod(0o600)
+    print(f'[INFO] Written {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+"""
+Prometheus text format metrics without third party client.
+
+Recording happens on the event loop thread, so plain attribute updates
+are atomic enough and no locks are taken. Label children are created once
+per label combination and cached, histograms keep preallocated bucket
+counters, so the hot path is a dict lookup, a bisect and an increment.
+Values that already live somewhere (pool, cache stats) are collected by
+callbacks at scrape time instead of being mirrored on every change.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+Labels = tuple[str, ...]
+Samples = Iterable[tuple[Labels, float]]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names: Labels, values: Labels) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name,
+            value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'),
+        )
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.sum: float = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric(ABC):
+    kind = ''
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Labels = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _header(self) -> list[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Exposition lines of the metric, header included."""
+
+
+class _ChildMetric(_Metric):
+    """Metric recorded through a child per label values combination."""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Labels = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._children: dict[Labels, Any] = {}
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        """Empty child for a label values combination seen first."""
+
+    def labels(self, *values: str) -> Any:
+        """Child for label values, keep it around on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f'{self.name} expects {self.labelnames}')
+            child = self._children[values] = self._new_child()
+        return child
+
+
+class Counter(_ChildMetric):
+    kind = 'counter'
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for values, child in self._children.items():
+            lines.append(
+                f'{self.name}_total'
+                f'{_format_labels(self.labelnames, values)} '
+                f'{_format_value(child.value)}'
+            )
+        return lines
+
+
+class Histogram(_ChildMetric):
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        names = (*self.labelnames, 'le')
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                labels = _format_labels(names, (*values, _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f'{self.name}_sum{labels} {_format_value(child.sum)}')
+            lines.append(f'{self.name}_count{labels} {child.count}')
+        return lines
+
+
+class Collected(_Metric):
+    """Gauge or counter whose samples are read by callback on scrape."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Samples],
+        labelnames: Labels = (),
+        kind: str = 'gauge',
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.collect = collect
+
+    def labels(self, *values: str) -> Any:
+        raise TypeError(
+            f'{self.name} is collected at scrape time, it has no children '
+            'to record into'
+        )
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        suffix = '_total' if self.kind == 'counter' else ''
+        for values, value in self.collect():
+            lines.append(
+                f'{self.name}{suffix}'
+                f'{_format_labels(self.labelnames, values)} '
+                f'{_format_value(value)}'
+            )
+        return lines
+
+
+M = TypeVar('M', bound=_Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Labels = ()
+    ) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def collected(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Samples],
+        labelnames: Labels = (),
+        kind: str = 'gauge',
+    ) -> Collected:
+        return self.register(
+            Collected(name, documentation, collect, labelnames, kind)
+        )
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route template',
+    ('method', 'route', 'status'),
+)
+DB_CHECKOUT_WAIT = registry.histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time waited for a pooled connection, connecting included',
+)
+HASH_DURATION = registry.histogram(
+    'hash_duration_seconds',
+    'bcrypt work time in the hashing pool',
+    ('operation',),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+HASH_QUEUE_WAIT = registry.histogram(
+    'hash_queue_wait_seconds',
+    'Time hashing calls waited for a free pool worker',
+    ('operation',),
+)
+TOKENS_ISSUED = registry.counter(
+    'tokens_issued', 'Access tokens issued', ('kind',)
+)
+TOKENS_VERIFIED = registry.counter(
+    'tokens_verified', 'Access token verifications', ('result',)
+)
+
+
+# Methods labelled as is, any other one a client sends is 'other'
+HTTP_METHODS = frozenset(
+    ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing HTTP requests. Route template (e.g.
+    /users/{email}) and method from HTTP_METHODS are used as labels, so
+    label count stays bounded; requests no route matched share the
+    'unmatched' label, unknown methods the 'other' one.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        started_at = time.perf_counter()
+        status = 500
+
+        async def _send(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            route = scope.get('route')
+            method: str = scope['method']
+            HTTP_REQUEST_DURATION.labels(
+                method if method in HTTP_METHODS else 'other',
+                getattr(route, 'path', 'unmatched'),
+                str(status),
+            ).observe(time.perf_counter() - started_at)
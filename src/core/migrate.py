@@ -0,0 +1,65 @@
+"""
+One-shot schema migration: provisions role and database when missing,
+then upgrades the schema to the Alembic head revision.
+
+    python -m src.core.migrate
+"""
+
+import asyncio
+from functools import lru_cache
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from alembic import command
+from src.core.db_init import get_admin_engine
+from src.core.engines import close_all_engines
+from src.core.settings import settings
+from src.core.startup.creation import provision_database
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / 'alembic.ini'
+
+
+def alembic_config(url: str | None = None) -> Config:
+    """Alembic config of the project, url overrides the one from settings.
+    Logging setup of alembic.ini is left to the alembic command line."""
+    config = Config(str(ALEMBIC_INI))
+    config.attributes['configure_logger'] = False
+    if url is not None:
+        config.set_main_option('sqlalchemy.url', url.replace('%', '%%'))
+    return config
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str | None:
+    """Revision the code expects, read from migration scripts once."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def upgrade(url: str | None = None, revision: str = 'head') -> None:
+    """Upgrades schema. Runs its own event loop, so call it from sync code
+    or a worker thread."""
+    command.upgrade(alembic_config(url), revision)
+
+
+async def provision() -> None:
+    try:
+        async with get_admin_engine().connect() as conn:
+            await provision_database(
+                conn,
+                db_name=settings.pg_db,
+                user_name=settings.pg_user,
+                password=settings.pg_password,
+            )
+    finally:
+        await close_all_engines()
+
+
+def main() -> None:
+    asyncio.run(provision())
+    upgrade()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+Login abuse protection that runs before any database access or bcrypt:
+token buckets keyed by client IP and by account email, and an admission
+gate bounding concurrent password verifications.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from src.core.metrics import registry
+from src.core.settings import settings
+
+LOGIN_REJECTED = registry.counter(
+    'login_rejected', 'Logins rejected before verification', ('reason',)
+)
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool
+    retry_after: float
+
+
+class RateLimitStats(NamedTuple):
+    keys: int
+    allowed: int
+    limited: int
+    evictions: int
+
+
+class _Shard:
+    __slots__ = ('lock', 'buckets')
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        """key -> (tokens, updated_at), least recently used first"""
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket per key: burst requests at once, then rate per second.
+    Keys are spread over shards with a lock each, so concurrent callers
+    (event loop plus threadpool endpoints) rarely contend. A bucket idle
+    long enough to refill completely is the same as no bucket, so such
+    entries are dropped; beyond max_keys the least recently used one is
+    evicted. Memory stays bounded whatever the number of distinct keys.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int,
+        shards: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._shard_keys = max(1, max_keys // len(self._shards))
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+
+    @property
+    def idle_ttl(self) -> float:
+        """Time an untouched bucket needs to refill to burst."""
+        return self.burst / self.rate if self.rate > 0 else math.inf
+
+    def acquire(self, key: str, cost: float = 1) -> RateLimitDecision:
+        """Takes cost tokens from key's bucket if it has them."""
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = self.clock()
+        with shard.lock:
+            entry = shard.buckets.pop(key, None)
+            if entry is None:
+                tokens = self.burst
+            else:
+                tokens = min(
+                    self.burst, entry[0] + (now - entry[1]) * self.rate
+                )
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            shard.buckets[key] = (tokens, now)
+            self._expire(shard, now)
+        if allowed:
+            self.allowed += 1
+            return RateLimitDecision(True, 0)
+        self.limited += 1
+        retry_after = (
+            (cost - tokens) / self.rate if self.rate > 0 else math.inf
+        )
+        return RateLimitDecision(False, retry_after)
+
+    def _expire(self, shard: _Shard, now: float) -> None:
+        """Drops full buckets from the LRU end, then the overflow. Called
+        with shard.lock held."""
+        buckets = shard.buckets
+        idle_ttl = self.idle_ttl
+        while buckets:
+            key, (_, updated_at) = next(iter(buckets.items()))
+            if now - updated_at >= idle_ttl:
+                del buckets[key]
+            elif len(buckets) > self._shard_keys:
+                del buckets[key]
+                self.evictions += 1
+            else:
+                break
+
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+    def stats(self) -> RateLimitStats:
+        return RateLimitStats(
+            keys=len(self),
+            allowed=self.allowed,
+            limited=self.limited,
+            evictions=self.evictions,
+        )
+
+
+class AdmissionGate:
+    """
+    Caps work admitted at once. try_enter never waits: when limit calls
+    are in flight it refuses right away, so an overload is answered in
+    microseconds instead of piling requests up in the hashing queue.
+    Used from the event loop only.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.rejected = 0
+
+    def try_enter(self) -> bool:
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def leave(self) -> None:
+        self.in_flight -= 1
+
+
+def _per_second(per_minute: float) -> float:
+    return per_minute / 60
+
+
+login_ip_limiter = TokenBucketLimiter(
+    rate=_per_second(settings.login_ip_per_minute),
+    burst=settings.login_ip_burst,
+    max_keys=settings.rate_limit_max_keys,
+    shards=settings.rate_limit_shards,
+)
+login_email_limiter = TokenBucketLimiter(
+    rate=_per_second(settings.login_email_per_minute),
+    burst=settings.login_email_burst,
+    max_keys=settings.rate_limit_max_keys,
+    shards=settings.rate_limit_shards,
+)
+password_check_gate = AdmissionGate(limit=settings.login_max_in_flight)
+
+
+def check_login_rate(ip: str | None, email: str) -> RateLimitDecision:
+    """
+    Applies per IP and per account limits of a login attempt.
+
+    Args:
+        ip (str | None): Client address, None when unknown.
+        email (str): Account the attempt is for.
+
+    Returns:
+        RateLimitDecision: Allowed, or rejected with seconds to wait.
+    """
+    if not settings.login_rate_limit_enabled:
+        return RateLimitDecision(True, 0)
+    if ip is not None:
+        decision = login_ip_limiter.acquire(ip)
+        if not decision.allowed:
+            LOGIN_REJECTED.labels('ip').inc()
+            return decision
+    decision = login_email_limiter.acquire(email.lower())
+    if not decision.allowed:
+        LOGIN_REJECTED.labels('email').inc()
+    return decision
+
+
+registry.collected(
+    'login_rate_limit_keys',
+    'Token buckets kept by login rate limiters',
+    lambda: [
+        (('ip',), len(login_ip_limiter)),
+        (('email',), len(login_email_limiter)),
+    ],
+    labelnames=('limiter',),
+)
+registry.collected(
+    'password_checks_in_flight',
+    'Password verifications admitted and not finished yet',
+    lambda: [((), password_check_gate.in_flight)],
+)
@@ -1,3 +1,5 @@
+import os
+import uuid
 from typing import Literal
 
 from pydantic import Field
@@ -12,15 +14,91 @@ class Settings(BaseSettings):
     pg_host: str = Field('localhost', alias='PG_HOST')
     pg_port: str = Field('5432', alias='PG_PORT')
     pg_db: str = Field('default_db', alias='PG_DB')
+    pg_pool_size: int = Field(10, alias='PG_POOL_SIZE')
+    pg_max_overflow: int = Field(10, alias='PG_MAX_OVERFLOW')
+    pg_pool_timeout: float = Field(30, alias='PG_POOL_TIMEOUT')
+    pg_pool_pre_ping: bool = Field(True, alias='PG_POOL_PRE_PING')
+    pg_pool_recycle: int = Field(1800, alias='PG_POOL_RECYCLE')
+
+    sql_log_mode: Literal['off', 'slow', 'sample'] = Field(
+        'off', alias='SQL_LOG_MODE'
+    )
+    sql_slow_threshold_ms: float = Field(100, alias='SQL_SLOW_THRESHOLD_MS')
+    sql_sample_percent: float = Field(1, alias='SQL_SAMPLE_PERCENT')
+
+    user_cache_size: int = Field(10_000, alias='USER_CACHE_SIZE')
+    user_cache_ttl_seconds: float = Field(60, alias='USER_CACHE_TTL_SECONDS')
+    user_cache_negative_ttl_seconds: float = Field(
+        0, alias='USER_CACHE_NEGATIVE_TTL_SECONDS'
+    )
+
+    email_filter_enabled: bool = Field(False, alias='EMAIL_FILTER_ENABLED')
+    email_filter_fp_rate: float = Field(0.001, alias='EMAIL_FILTER_FP_RATE')
+    email_filter_capacity: int = Field(
+        1_000_000, alias='EMAIL_FILTER_CAPACITY'
+    )
+    email_filter_fetch_size: int = Field(
+        10_000, alias='EMAIL_FILTER_FETCH_SIZE'
+    )
+    email_filter_sync_seconds: float = Field(
+        10, alias='EMAIL_FILTER_SYNC_SECONDS'
+    )
+    email_filter_rebuild_seconds: float = Field(
+        3600, alias='EMAIL_FILTER_REBUILD_SECONDS'
+    )
+
+    export_fetch_size: int = Field(5000, alias='EXPORT_FETCH_SIZE')
 
     environment: Literal['dev', 'prod', 'test'] = 'dev'
     debug: bool = Field(False, alias='DEBUG')
 
     secret_key: str = Field('default_secret', alias='SECRET_KEY')
     algorithm: str = Field('HS256', alias='ALGORITHM')
+    jwt_keys_dir: str | None = Field(None, alias='JWT_KEYS_DIR')
+    jwt_active_kid: str | None = Field(None, alias='JWT_ACTIVE_KID')
+    token_backend: Literal['jose', 'pyjwt', 'hmac'] = Field(
+        'pyjwt', alias='TOKEN_BACKEND'
+    )
     access_token_expire_minutes: int = Field(
         30, alias='ACCESS_TOKEN_EXPIRE_MINUTES'
     )
+    refresh_token_expire_days: int = Field(
+        30, alias='REFRESH_TOKEN_EXPIRE_DAYS'
+    )
+    revocation_sync_seconds: float = Field(
+        2, alias='REVOCATION_SYNC_SECONDS'
+    )
+    # Users allowed to read all accounts, JSON list of ids, none by default
+    admin_user_ids: frozenset[uuid.UUID] = Field(
+        frozenset(), alias='ADMIN_USER_IDS'
+    )
+
+    bcrypt_rounds: int = Field(12, ge=4, le=31, alias='BCRYPT_ROUNDS')
+    hash_pool_mode: Literal['process', 'thread'] = Field(
+        'process', alias='HASH_POOL_MODE'
+    )
+    hash_pool_size: int = Field(
+        default_factory=lambda: os.cpu_count() or 1, alias='HASH_POOL_SIZE'
+    )
+
+    login_rate_limit_enabled: bool = Field(
+        True, alias='LOGIN_RATE_LIMIT_ENABLED'
+    )
+    # Rates must stay positive, disable limiting with the flag above
+    login_ip_per_minute: float = Field(
+        60, gt=0, alias='LOGIN_IP_PER_MINUTE'
+    )
+    login_ip_burst: int = Field(20, ge=1, alias='LOGIN_IP_BURST')
+    login_email_per_minute: float = Field(
+        10, gt=0, alias='LOGIN_EMAIL_PER_MINUTE'
+    )
+    login_email_burst: int = Field(5, ge=1, alias='LOGIN_EMAIL_BURST')
+    rate_limit_max_keys: int = Field(100_000, alias='RATE_LIMIT_MAX_KEYS')
+    rate_limit_shards: int = Field(16, alias='RATE_LIMIT_SHARDS')
+    login_max_in_flight: int = Field(
+        default_factory=lambda: 4 * (os.cpu_count() or 1),
+        alias='LOGIN_MAX_IN_FLIGHT',
+    )
 
     model_config = SettingsConfigDict(
         env_file='.db.env', extra='ignore', populate_by_name=True
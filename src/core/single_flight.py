@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, NamedTuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+class FlightResult(NamedTuple, Generic[T]):
+    """Value of the call and whether it came from another caller's call."""
+
+    value: T
+    shared: bool
+
+
+class SingleFlight(Generic[K, T]):
+    """
+    Coalesces concurrent calls with the same key: the first caller starts
+    the work, callers arriving while it runs await the same result or
+    exception. Nothing is cached, the key is forgotten as soon as the work
+    is done. The work runs as its own task and callers await it shielded,
+    so a caller cancelled midway (client gone) doesn't cancel it for the
+    others. Used from the event loop only.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[K, asyncio.Task[T]] = {}
+
+    def _forget(self, key: K, task: asyncio.Task[T]) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            """nobody may be left to await it, mark exception retrieved"""
+            task.exception()
+
+    async def do(
+        self, key: K, func: Callable[[], Awaitable[T]]
+    ) -> FlightResult[T]:
+        """
+        Runs func unless a call with key is already in flight.
+
+        Args:
+            key (K): Identity of the work.
+            func (Callable[[], Awaitable[T]]): Starts the work.
+
+        Returns:
+            FlightResult[T]: Result and whether it was shared.
+        """
+        task = self._flights.get(key)
+        if task is not None:
+            return FlightResult(await asyncio.shield(task), True)
+        task = asyncio.ensure_future(func())
+        self._flights[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return FlightResult(await asyncio.shield(task), False)
+
+    def __len__(self) -> int:
+        return len(self._flights)
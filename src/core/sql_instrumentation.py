@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from functools import lru_cache
+from typing import Any, Literal, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from src.core.metrics import DB_CHECKOUT_WAIT
+from src.core.settings import settings
+
+SqlLogMode = Literal['off', 'slow', 'sample']
+
+logger = logging.getLogger('src.sql')
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r'\s+')
+
+
+class PoolStats(NamedTuple):
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    checkout_wait_total: float
+    checkout_wait_max: float
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Pool that remembers how long the last checkout of each connection waited
+    for a free slot (connecting included). The value lives in
+    connection.info['checkout_wait'] in seconds, totals are in stats().
+    """
+
+    checkouts: int = 0
+    checkout_wait_total: float = 0.0
+    checkout_wait_max: float = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        record = super()._do_get()
+        wait = time.perf_counter() - started_at
+        record.info['checkout_wait'] = wait
+        self.checkouts += 1
+        self.checkout_wait_total += wait
+        self.checkout_wait_max = max(self.checkout_wait_max, wait)
+        DB_CHECKOUT_WAIT.observe(wait)
+        return record
+
+    def stats(self) -> PoolStats:
+        """Current occupancy and checkout wait totals since pool creation
+        (engine.dispose() creates a new pool)."""
+        return PoolStats(
+            size=self.size(),
+            checked_out=self.checkedout(),
+            overflow=max(0, self.overflow()),
+            checkouts=self.checkouts,
+            checkout_wait_total=self.checkout_wait_total,
+            checkout_wait_max=self.checkout_wait_max,
+        )
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats | None:
+    """Stats of engine's pool, None unless it's InstrumentedAsyncPool."""
+    pool = engine.sync_engine.pool
+    return pool.stats() if isinstance(pool, InstrumentedAsyncPool) else None
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> tuple[str, str]:
+    """
+    Normalizes statement: literals replaced by '?' (this way inlined
+    secrets never reach logs) and whitespace collapsed.
+
+    Args:
+        statement (str): SQL statement as sent to the driver.
+
+    Returns:
+        tuple[str, str]: Short fingerprint hash and normalized statement.
+    """
+    normalized = _SPACES.sub(' ', _LITERALS.sub('?', statement)).strip()
+    digest = hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+    return digest, normalized
+
+
+class _SqlInstrumentation:
+    """Cursor event listeners emitting one structured record per query."""
+
+    def __init__(
+        self, mode: SqlLogMode, slow_threshold_ms: float, sample_percent: float
+    ) -> None:
+        self.mode = mode
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.sample_rate = sample_percent / 100
+
+    def before_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        if context is None:
+            return
+        if self.mode == 'sample' and random.random() >= self.sample_rate:
+            context._sql_started_at = None  # type: ignore[attr-defined]
+            return
+        context._sql_started_at = time.perf_counter()  # type: ignore
+
+    def after_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        started_at: float | None = getattr(context, '_sql_started_at', None)
+        if started_at is None:
+            return
+        duration = time.perf_counter() - started_at
+        if self.mode == 'slow' and duration < self.slow_threshold:
+            return
+        statement_fingerprint, normalized = fingerprint(statement)
+        checkout_wait: float | None = conn.info.get('checkout_wait')
+        record: dict[str, Any] = {
+            'fingerprint': statement_fingerprint,
+            'statement': normalized,
+            'duration_ms': round(duration * 1000, 3),
+            'rowcount': cursor.rowcount,
+            'checkout_wait_ms': (
+                None
+                if checkout_wait is None
+                else round(checkout_wait * 1000, 3)
+            ),
+            'executemany': executemany,
+        }
+        logger.log(
+            logging.WARNING if self.mode == 'slow' else logging.INFO,
+            'sql %(fingerprint)s %(duration_ms)sms rows=%(rowcount)s',
+            record,
+            extra={'sql': record},
+        )
+
+
+class JsonSqlFormatter(logging.Formatter):
+    """One JSON object per line: time, level and the fields of the
+    structured record, statement and checkout wait included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields: dict[str, Any] = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+        }
+        sql: dict[str, Any] | None = getattr(record, 'sql', None)
+        if sql is None:
+            fields['message'] = record.getMessage()
+        else:
+            fields.update(sql)
+        return json.dumps(fields, default=str)
+
+
+def configure_sql_logger() -> None:
+    """
+    Makes records of the enabled mode reach an output. The logger level
+    is lowered to INFO unless set explicitly, and when neither src.sql nor
+    its ancestors have handlers (nothing configured logging) JSON lines
+    go to stderr. An existing logging setup keeps receiving the records.
+    """
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+    if not logger.hasHandlers():
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonSqlFormatter())
+        logger.addHandler(handler)
+
+
+def instrument_engine(
+    engine: AsyncEngine,
+    mode: SqlLogMode = settings.sql_log_mode,
+    slow_threshold_ms: float = settings.sql_slow_threshold_ms,
+    sample_percent: float = settings.sql_sample_percent,
+) -> AsyncEngine:
+    """
+    Attaches SQL instrumentation to engine. Mode 'off' attaches nothing, so
+    there is no per query cost at all.
+
+    Args:
+        engine (AsyncEngine): Engine to instrument.
+        mode (SqlLogMode): 'off', 'slow' - only queries slower than
+            slow_threshold_ms, 'sample' - sample_percent of queries.
+        slow_threshold_ms (float): Threshold for 'slow' mode.
+        sample_percent (float): Share of queries for 'sample' mode, 0-100.
+
+    Returns:
+        AsyncEngine: The same engine, for chaining.
+    """
+    if mode == 'off':
+        return engine
+    configure_sql_logger()
+    instrumentation = _SqlInstrumentation(
+        mode=mode,
+        slow_threshold_ms=slow_threshold_ms,
+        sample_percent=sample_percent,
+    )
+    event.listen(
+        engine.sync_engine,
+        'before_cursor_execute',
+        instrumentation.before_cursor_execute,
+    )
+    event.listen(
+        engine.sync_engine,
+        'after_cursor_execute',
+        instrumentation.after_cursor_execute,
+    )
+    return engine
@@ -1,36 +1,43 @@
 from sqlalchemy.ext.asyncio import AsyncEngine
 
-from src.core.base import Base
-from src.core.db_init import admin_engine, engine
+from src.core.db_init import get_admin_engine, get_app_engine
+from src.core.migrate import head_revision
 from src.core.settings import settings
 from src.core.startup.creation import (
-    create_database_if_not_exists,
-    create_user_if_not_exists,
-    grant_all_preveleges,
+    get_schema_revision,
+    is_provisioned,
+    provision_database,
 )
-from src.models.user_model import User  # type: ignore # noqa: F401
-
-
-async def create_all_tables(engine: AsyncEngine) -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+from src.errors.db_errors import SchemaMismatchError
 
 
 async def startup() -> None:
+    """
+    Makes sure database is ready. Schema is managed by Alembic
+    (python -m src.core.migrate), app refuses to start on a database at
+    other revision instead of reflecting and patching the catalog.
+    """
     print('\n\nStartup\n\n')
-    await create_user_if_not_exists(
-        engine=admin_engine,
-        user_name=settings.pg_user,
-        password=settings.pg_password,
-    )
-    await create_database_if_not_exists(
-        engine=admin_engine,
-        db_name=settings.pg_db,
-    )
-    await grant_all_preveleges(
-        engine=admin_engine,
-        db_name=settings.pg_db,
-        user_name=settings.pg_user,
-    )
-    await create_all_tables(engine=engine)
-    # print('\n\nStartup complete\n\n')
\ No newline at end of file
+    engine: AsyncEngine = get_app_engine()
+    revision: str | None = head_revision()
+    if await is_provisioned(engine=engine, revision=revision):
+        print('[INFO] Database is provisioned already.')
+        return
+    admin_engine: AsyncEngine = get_admin_engine()
+    try:
+        async with admin_engine.connect() as conn:
+            await provision_database(
+                conn,
+                db_name=settings.pg_db,
+                user_name=settings.pg_user,
+                password=settings.pg_password,
+            )
+    finally:
+        await admin_engine.dispose()
+    current_revision: str | None = await get_schema_revision(engine=engine)
+    if current_revision != revision:
+        raise SchemaMismatchError(
+            f'Database schema revision is {current_revision}, '
+            f'expected {revision}. Run: python -m src.core.migrate'
+        )
+    # print('\n\nStartup complete\n\n')
@@ -1,12 +1,19 @@
 # import asyncio
 # from typing import Optional
 
+from asyncpg import PostgresError
 from sqlalchemy import text
 from sqlalchemy.exc import DBAPIError, SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    create_async_engine,
+)
 from sqlalchemy.sql import quoted_name
 
+from src.core.db_init import get_admin_engine
 from src.core.settings import settings
+from src.core.sql_instrumentation import instrument_engine
 
 ADMIN_DB_URL = (
     f'{settings.pg_async_prefix}://postgres:postgres@'
@@ -17,9 +24,7 @@ ADMIN_DB_URL = (
 async def create_user_if_not_exists(
     user_name: str = settings.pg_user,
     password: str = settings.pg_password,
-    engine: AsyncEngine = create_async_engine(
-        url=ADMIN_DB_URL, isolation_level='AUTOCOMMIT', echo=True, future=True
-    ),
+    engine: AsyncEngine | None = None,
 ) -> list[str]:
     """
     Ensure a PostgreSQL user exist, creating it if necessary.
@@ -27,30 +32,18 @@ async def create_user_if_not_exists(
     Args:
         user_name (str): User_name to create or verify.
         password (str): Password for the user.
-        engine (AsyncEngine): Async SQLAlchemy engine for admin operations.
+        engine (AsyncEngine | None): Async SQLAlchemy engine for admin
+            operations, shared admin engine by default.
 
     Returns:
         List[str]: Log messages about actions taken.
     """
     messages: list[str] = []
+    engine = engine or get_admin_engine()
     # print(f'\n\nuser_name: {user_name}\n')
     try:
         async with engine.begin() as conn:
-            """Check and create user"""
-            user_exists_query = text(
-                'SELECT 1 FROM pg_roles WHERE rolname = :user_name'
-            )
-            result = await conn.execute(user_exists_query, {'user_name': user_name})
-            user_exists = result.scalar_one_or_none()
-            if not user_exists:
-                await conn.execute(
-                    text(f"CREATE USER {user_name} WITH PASSWORD '{password}'")
-                )
-                messages.append(f"[INFO] User '{user_name}' created.")
-                print(messages[-1])
-            else:
-                messages.append(f"[INFO] User '{user_name}' already exists.")
-                print(messages[-1])
+            await _create_user(conn, user_name, password, messages)
 
     except (SQLAlchemyError, DBAPIError) as e:
         messages.append(f'[ERROR] Database operation failed: {str(e)}')
@@ -65,47 +58,48 @@ async def create_user_if_not_exists(
     return messages
 
 
+async def _create_user(
+    conn: AsyncConnection, user_name: str, password: str, messages: list[str]
+) -> None:
+    """Check and create user"""
+    user_exists_query = text(
+        'SELECT 1 FROM pg_roles WHERE rolname = :user_name'
+    )
+    result = await conn.execute(user_exists_query, {'user_name': user_name})
+    user_exists = result.scalar_one_or_none()
+    if not user_exists:
+        await conn.execute(
+            text(f"CREATE USER {user_name} WITH PASSWORD '{password}'")
+        )
+        messages.append(f"[INFO] User '{user_name}' created.")
+        print(messages[-1])
+    else:
+        messages.append(f"[INFO] User '{user_name}' already exists.")
+        print(messages[-1])
+
+
 async def create_database_if_not_exists(
     db_name: str,
-    engine: AsyncEngine = create_async_engine(
-        url=ADMIN_DB_URL, isolation_level='AUTOCOMMIT', echo=True, future=True
-    ),
+    engine: AsyncEngine | None = None,
 ) -> list[str]:
     """Ensure create_database_if_not_exists creates the DB if missing."""
     messages: list[str] = []
+    engine = engine or get_admin_engine()
     try:
         async with engine.begin() as conn:
-            """Check and create database"""
-            db_exists_query = text(
-                'SELECT 1 FROM pg_database WHERE datname = :db_name'
-            )
-            result = await conn.execute(db_exists_query, {'db_name': db_name})
-            db_exists = result.scalar_one_or_none()
+            db_exists = await _database_exists(conn, db_name)
             """Create database outside transaction block"""
             if not db_exists:
-                autocommit_engine: AsyncEngine = create_async_engine(
-                    url=ADMIN_DB_URL,
-                    isolation_level='AUTOCOMMIT',
-                    echo=True,
-                    future=True,
+                autocommit_engine: AsyncEngine = instrument_engine(
+                    create_async_engine(
+                        url=ADMIN_DB_URL,
+                        isolation_level='AUTOCOMMIT',
+                        future=True,
+                    )
                 )
                 async with autocommit_engine.connect() as conn:
                     try:
-                        await conn.execute(
-                            text(
-                                f'CREATE DATABASE {quoted_name(db_name, quote=True)}'
-                            )
-                        )
-                        # f'CREATE DATABASE \'{db_name}\''))
-                        messages.append(f"[INFO] Database '{db_name}' created.")
-                        print(messages[-1])
-                    except SQLAlchemyError as e:
-                        # Likely race condition (DB created by another process)
-                        messages.append(
-                            f"[WARN] Database '{db_name}' may already exist "
-                            f'({str(e)}).'
-                        )
-                        print(messages[-1])
+                        await _create_database(conn, db_name, messages)
                     finally:
                         await autocommit_engine.dispose()
             else:
@@ -124,12 +118,39 @@ async def create_database_if_not_exists(
     return messages
 
 
+async def _database_exists(conn: AsyncConnection, db_name: str) -> bool:
+    """Check database"""
+    db_exists_query = text(
+        'SELECT 1 FROM pg_database WHERE datname = :db_name'
+    )
+    result = await conn.execute(db_exists_query, {'db_name': db_name})
+    return result.scalar_one_or_none() is not None
+
+
+async def _create_database(
+    conn: AsyncConnection, db_name: str, messages: list[str]
+) -> None:
+    """Create database, conn has to be in AUTOCOMMIT mode"""
+    try:
+        await conn.execute(
+            text(f'CREATE DATABASE {quoted_name(db_name, quote=True)}')
+        )
+        # f'CREATE DATABASE \'{db_name}\''))
+        messages.append(f"[INFO] Database '{db_name}' created.")
+        print(messages[-1])
+    except SQLAlchemyError as e:
+        # Likely race condition (DB created by another process)
+        messages.append(
+            f"[WARN] Database '{db_name}' may already exist "
+            f'({str(e)}).'
+        )
+        print(messages[-1])
+
+
 async def grant_all_preveleges(
     db_name: str = settings.pg_db,
     user_name: str = settings.pg_user,
-    engine: AsyncEngine = create_async_engine(
-        url=ADMIN_DB_URL, isolation_level='AUTOCOMMIT', echo=True, future=True
-    ),
+    engine: AsyncEngine | None = None,
 ) -> list[str]:
     """
     Grants all privileges on an existing PostgreSQL database to an existing
@@ -138,100 +159,17 @@ async def grant_all_preveleges(
     Args:
         db_name (str): Name of the target database.
         user_name (str): PostgreSQL role/user to grant privileges to.
-        engine (AsyncEngine): SQLAlchemy AsyncEngine connected to the admin
-            database.
+        engine (AsyncEngine | None): SQLAlchemy AsyncEngine connected to the
+            admin database, shared admin engine by default.
 
     Returns:
         list[str]: Log messages describing performed actions.
     """
     messages: list[str] = []
+    engine = engine or get_admin_engine()
     try:
         async with engine.begin() as conn:
-            """Verify database and role existence"""
-            user_exists_result = await conn.execute(
-                text('SELECT 1 FROM pg_roles WHERE rolname = :user_name'), 
-                {'user_name': user_name}
-            )
-            if not user_exists_result.scalar_one_or_none():
-                messages.append(f"[ERROR] User '{user_name}' does not exist.")
-                print(messages[-1])
-                return messages
-            db_exists_result = await conn.execute(
-                text('SELECT 1 FROM pg_database WHERE datname = :db_name'), 
-                {'db_name': db_name}
-            )
-            if not db_exists_result.scalar_one_or_none():
-                messages.append(f"[ERROR] Database '{db_name}' does not exist.")
-                print(messages[-1])
-                return messages
-
-            """Perform GRANT — double-quoted to safely handle names"""
-            """Grant access to database itself"""
-            grant_sql = text(
-                f'GRANT ALL PRIVILEGES ON DATABASE '
-                f'{quoted_name(db_name, quote=True)} TO '
-                f'{quoted_name(user_name, quote=True)};'
-            )
-            await conn.execute(grant_sql)
-            """Switch to target DB explicitly (for schema/table grants)"""
-            await conn.execute(
-                text(
-                    f'ALTER DATABASE '
-                    f'{quoted_name(db_name, quote=True)} OWNER TO '
-                    f'{quoted_name(user_name, quote=True)};'
-                )
-            )
-            """Grant on schema (assuming 'public')"""
-            await conn.execute(
-                text(
-                    'GRANT ALL ON SCHEMA public TO '
-                    f'{quoted_name(user_name, quote=True)};'
-                )
-            )
-            """Grant on all existing tables, sequences, and functions"""
-            await conn.execute(
-                text(
-                    'GRANT ALL ON ALL TABLES IN SCHEMA public TO '
-                    f'{quoted_name(user_name, quote=True)};'
-                )
-            )
-            await conn.execute(
-                text(
-                    'GRANT ALL ON ALL SEQUENCES IN SCHEMA public TO '
-                    f'{quoted_name(user_name, quote=True)};'
-                )
-            )
-            await conn.execute(
-                text(
-                    'GRANT ALL ON ALL FUNCTIONS IN SCHEMA public TO '
-                    f'{quoted_name(user_name, quote=True)};'
-                )
-            )
-            """Grant defaults for future objects"""
-            await conn.execute(
-                text(
-                    f'ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON '
-                    f'TABLES TO {quoted_name(user_name, quote=True)};'
-                )
-            )
-            await conn.execute(
-                text(
-                    f'ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON '
-                    f'SEQUENCES TO {quoted_name(user_name, quote=True)};'
-                )
-            )
-            await conn.execute(
-                text(
-                    f'ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON '
-                    f'FUNCTIONS TO {quoted_name(user_name, quote=True)};'
-                )
-            )
-
-            messages.append(
-                '[INFO] Granted all privileges on database '
-                f"'{db_name}' to user '{user_name}'."
-            )
-            print(messages[-1])
+            await _grant_privileges(conn, db_name, user_name, messages)
         # await engine.dispose()
 
     except (SQLAlchemyError, DBAPIError) as e:
@@ -248,3 +186,174 @@ async def grant_all_preveleges(
         await engine.dispose()
 
     return messages
+
+
+async def _grant_privileges(
+    conn: AsyncConnection, db_name: str, user_name: str, messages: list[str]
+) -> None:
+    """Verify database and role existence"""
+    user_exists_result = await conn.execute(
+        text('SELECT 1 FROM pg_roles WHERE rolname = :user_name'),
+        {'user_name': user_name}
+    )
+    if not user_exists_result.scalar_one_or_none():
+        messages.append(f"[ERROR] User '{user_name}' does not exist.")
+        print(messages[-1])
+        return
+    db_exists_result = await conn.execute(
+        text('SELECT 1 FROM pg_database WHERE datname = :db_name'),
+        {'db_name': db_name}
+    )
+    if not db_exists_result.scalar_one_or_none():
+        messages.append(f"[ERROR] Database '{db_name}' does not exist.")
+        print(messages[-1])
+        return
+
+    """Perform GRANT — double-quoted to safely handle names"""
+    """Grant access to database itself"""
+    grant_sql = text(
+        f'GRANT ALL PRIVILEGES ON DATABASE '
+        f'{quoted_name(db_name, quote=True)} TO '
+        f'{quoted_name(user_name, quote=True)};'
+    )
+    await conn.execute(grant_sql)
+    """Switch to target DB explicitly (for schema/table grants)"""
+    await conn.execute(
+        text(
+            f'ALTER DATABASE '
+            f'{quoted_name(db_name, quote=True)} OWNER TO '
+            f'{quoted_name(user_name, quote=True)};'
+        )
+    )
+    """Grant on schema (assuming 'public')"""
+    await conn.execute(
+        text(
+            'GRANT ALL ON SCHEMA public TO '
+            f'{quoted_name(user_name, quote=True)};'
+        )
+    )
+    """Grant on all existing tables, sequences, and functions"""
+    await conn.execute(
+        text(
+            'GRANT ALL ON ALL TABLES IN SCHEMA public TO '
+            f'{quoted_name(user_name, quote=True)};'
+        )
+    )
+    await conn.execute(
+        text(
+            'GRANT ALL ON ALL SEQUENCES IN SCHEMA public TO '
+            f'{quoted_name(user_name, quote=True)};'
+        )
+    )
+    await conn.execute(
+        text(
+            'GRANT ALL ON ALL FUNCTIONS IN SCHEMA public TO '
+            f'{quoted_name(user_name, quote=True)};'
+        )
+    )
+    """Grant defaults for future objects"""
+    await conn.execute(
+        text(
+            f'ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON '
+            f'TABLES TO {quoted_name(user_name, quote=True)};'
+        )
+    )
+    await conn.execute(
+        text(
+            f'ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON '
+            f'SEQUENCES TO {quoted_name(user_name, quote=True)};'
+        )
+    )
+    await conn.execute(
+        text(
+            f'ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON '
+            f'FUNCTIONS TO {quoted_name(user_name, quote=True)};'
+        )
+    )
+
+    messages.append(
+        '[INFO] Granted all privileges on database '
+        f"'{db_name}' to user '{user_name}'."
+    )
+    print(messages[-1])
+
+
+async def provision_database(
+    conn: AsyncConnection,
+    db_name: str = settings.pg_db,
+    user_name: str = settings.pg_user,
+    password: str = settings.pg_password,
+) -> list[str]:
+    """
+    Creates user and database and grants privileges, all on one admin
+    connection.
+
+    Args:
+        conn (AsyncConnection): Admin connection in AUTOCOMMIT mode.
+        db_name (str): Name of the target database.
+        user_name (str): PostgreSQL role/user owning the database.
+        password (str): Password for the user.
+
+    Returns:
+        list[str]: Log messages describing performed actions.
+    """
+    messages: list[str] = []
+    await _create_user(conn, user_name, password, messages)
+    if await _database_exists(conn, db_name):
+        messages.append(f"[INFO] Database '{db_name}' already exists.")
+        print(messages[-1])
+    else:
+        await _create_database(conn, db_name, messages)
+    await _grant_privileges(conn, db_name, user_name, messages)
+    return messages
+
+
+async def is_provisioned(engine: AsyncEngine, revision: str | None) -> bool:
+    """
+    Fast startup check in a single query on the application engine.
+    Successful connection proves role and database exist, the query checks
+    database ownership, privileges and the schema revision stamped by
+    Alembic.
+
+    Args:
+        engine (AsyncEngine): Engine connecting as application user to the
+            target database.
+        revision (str | None): Schema revision the code expects.
+
+    Returns:
+        bool: True when there's nothing to provision or migrate.
+    """
+    query = text(
+        """
+        SELECT
+            v.version_num = :revision
+            AND pg_get_userbyid(d.datdba) = current_user
+            AND has_database_privilege(
+                current_user, d.datname, 'CREATE, CONNECT, TEMPORARY'
+            )
+            AND has_schema_privilege(current_user, 'public', 'CREATE, USAGE')
+        FROM alembic_version AS v, pg_database AS d
+        WHERE d.datname = current_database()
+        """
+    )
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(query, {'revision': revision})
+            return bool(result.scalar_one_or_none())
+    except (SQLAlchemyError, DBAPIError, PostgresError, OSError) as e:
+        """Missing role, database or alembic_version table end up here"""
+        print(f'[INFO] Provisioning check failed: {str(e)}')
+        return False
+
+
+async def get_schema_revision(engine: AsyncEngine) -> str | None:
+    """Schema revision stamped by Alembic, None for unmigrated database."""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text('SELECT version_num FROM alembic_version')
+            )
+            return result.scalar_one_or_none()
+    except (SQLAlchemyError, DBAPIError, PostgresError) as e:
+        print(f'[INFO] Schema revision is unknown: {str(e)}')
+        return None
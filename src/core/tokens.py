@@ -0,0 +1,314 @@
+"""
+Access token codecs. A codec signs and verifies compact JWTs with the key
+ring keys; backend specific key objects are derived once when the codec
+is built, not per token. settings.token_backend picks the backend:
+
+    jose   python-jose, EdDSA done directly with cryptography
+    pyjwt  PyJWT, handles every algorithm of the key ring
+    hmac   hashlib/hmac only, HS256/384/512 key rings
+
+Whatever the backend, verification takes the algorithm from the key named
+by the kid header, never from the token, and failures raise jose's
+JWTError (ExpiredSignatureError for expired tokens).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+import jwt as pyjwt
+from cryptography.exceptions import InvalidSignature
+from jose import ExpiredSignatureError, JWTError, jwk
+from jose import jwt as jose_jwt
+
+from src.core.jwt_keys import (
+    HMAC_ALGORITHMS,
+    KeyRing,
+    SigningKey,
+    get_key_ring,
+    jwks_document,
+)
+from src.core.settings import settings
+
+HMAC_DIGESTS = {
+    'HS256': hashlib.sha256,
+    'HS384': hashlib.sha384,
+    'HS512': hashlib.sha512,
+}
+NUMERIC_DATE_CLAIMS = ('exp', 'iat', 'nbf')
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _json(value: dict[str, Any]) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def _numeric_dates(claims: dict[str, Any]) -> dict[str, Any]:
+    """datetime exp/iat/nbf to unix time, as jose and PyJWT do."""
+    if not any(
+        isinstance(claims.get(claim), datetime)
+        for claim in NUMERIC_DATE_CLAIMS
+    ):
+        return claims
+    return {
+        name: int(value.timestamp())
+        if name in NUMERIC_DATE_CLAIMS and isinstance(value, datetime)
+        else value
+        for name, value in claims.items()
+    }
+
+
+def _check_exp(claims: Any) -> dict[str, Any]:
+    if not isinstance(claims, dict):
+        raise JWTError('Invalid payload string: must be a json object')
+    exp = claims.get('exp')
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise JWTError('Expiration Time claim (exp) must be a number.')
+        if exp <= time.time():
+            raise ExpiredSignatureError('Signature has expired.')
+    return claims
+
+
+def _split(token: str) -> tuple[dict[str, Any], bytes, str, bytes]:
+    """Header, signing input, payload segment and signature of token."""
+    try:
+        signing_input, signature = token.rsplit('.', 1)
+        header_segment, payload_segment = signing_input.split('.')
+        header = json.loads(_b64decode(header_segment))
+        signature_bytes = _b64decode(signature)
+    except ValueError:
+        raise JWTError('Error decoding token headers.')
+    if not isinstance(header, dict):
+        raise JWTError('Invalid header string: must be a json object')
+    return header, signing_input.encode(), payload_segment, signature_bytes
+
+
+class TokenCodec(ABC):
+    """Signs with the key ring's active key, verifies with any of its
+    keys."""
+
+    name: str
+
+    def __init__(self, key_ring: KeyRing) -> None:
+        self.key_ring = key_ring
+
+    def _verification_key(self, header: dict[str, Any]) -> SigningKey:
+        kid = header.get('kid')
+        if kid is not None and not isinstance(kid, str):
+            raise JWTError('Key ID header parameter must be a string')
+        if not isinstance(header.get('alg'), str):
+            raise JWTError('Algorithm header parameter must be a string')
+        key = (
+            self.key_ring.active
+            if kid is None
+            else self.key_ring.keys.get(kid)
+        )
+        if key is None:
+            raise JWTError('Unknown key id')
+        if header.get('alg') != key.algorithm:
+            raise JWTError('The specified alg value is not allowed')
+        return key
+
+    @abstractmethod
+    def encode(self, claims: dict[str, Any]) -> str:
+        """Signs claims, exp may be a datetime."""
+
+    @abstractmethod
+    def decode(self, token: str) -> dict[str, Any]:
+        """Verifies signature and exp, returns claims."""
+
+
+class JoseCodec(TokenCodec):
+    name = 'jose'
+
+    def __init__(self, key_ring: KeyRing) -> None:
+        super().__init__(key_ring)
+        self._signing = {
+            kid: self._jose_key(key, key.private_key)
+            for kid, key in key_ring.keys.items()
+        }
+        self._verifying = {
+            kid: self._jose_key(key, key.public_key)
+            for kid, key in key_ring.keys.items()
+        }
+
+    @staticmethod
+    def _jose_key(key: SigningKey, material: Any) -> Any:
+        """python-jose has no EdDSA, cryptography objects are used as is"""
+        if key.algorithm == 'EdDSA':
+            return material
+        return jwk.construct(material, key.algorithm)
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        key = self.key_ring.active
+        if key.algorithm == 'EdDSA':
+            header = {'alg': 'EdDSA', 'typ': 'JWT', 'kid': key.kid}
+            signing_input = b'.'.join(
+                (
+                    _b64encode(_json(header)),
+                    _b64encode(_json(_numeric_dates(claims))),
+                )
+            )
+            signature = self._signing[key.kid].sign(signing_input)
+            return b'.'.join((signing_input, _b64encode(signature))).decode()
+        return jose_jwt.encode(
+            claims,
+            self._signing[key.kid],
+            algorithm=key.algorithm,
+            headers={'kid': key.kid},
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        key = self._verification_key(jose_jwt.get_unverified_header(token))
+        if key.algorithm != 'EdDSA':
+            return jose_jwt.decode(
+                token, self._verifying[key.kid], algorithms=[key.algorithm]
+            )
+        _, signing_input, payload, signature = _split(token)
+        try:
+            self._verifying[key.kid].verify(signature, signing_input)
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, InvalidSignature):
+            raise JWTError('Signature verification failed.')
+        return _check_exp(claims)
+
+
+class PyJWTCodec(TokenCodec):
+    name = 'pyjwt'
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        key = self.key_ring.active
+        return pyjwt.encode(
+            claims,
+            key.private_key,
+            algorithm=key.algorithm,
+            headers={'kid': key.kid},
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            key = self._verification_key(pyjwt.get_unverified_header(token))
+            return pyjwt.decode(
+                token, key.public_key, algorithms=[key.algorithm]
+            )
+        except pyjwt.ExpiredSignatureError as e:
+            raise ExpiredSignatureError(str(e)) from e
+        except pyjwt.InvalidTokenError as e:
+            raise JWTError(str(e)) from e
+
+
+class HmacCodec(TokenCodec):
+    """
+    Compact JWS with the standard library only. Per key the HMAC state
+    with the secret already absorbed is kept and copied per token, and
+    the active key's header segment is serialized once.
+    """
+
+    name = 'hmac'
+
+    def __init__(self, key_ring: KeyRing) -> None:
+        super().__init__(key_ring)
+        for key in key_ring.keys.values():
+            if key.algorithm not in HMAC_ALGORITHMS:
+                raise ValueError(
+                    f'hmac token backend supports {HMAC_ALGORITHMS}, '
+                    f'key {key.kid} is {key.algorithm}'
+                )
+        self._macs = {
+            kid: hmac.new(
+                key.private_key, digestmod=HMAC_DIGESTS[key.algorithm]
+            )
+            for kid, key in key_ring.keys.items()
+        }
+        active = key_ring.active
+        self._header_segment = _b64encode(
+            _json({'alg': active.algorithm, 'typ': 'JWT', 'kid': active.kid})
+        )
+
+    def _sign(self, kid: str, signing_input: bytes) -> bytes:
+        mac = self._macs[kid].copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        signing_input = b'.'.join(
+            (self._header_segment, _b64encode(_json(_numeric_dates(claims))))
+        )
+        signature = self._sign(self.key_ring.active.kid, signing_input)
+        return b'.'.join((signing_input, _b64encode(signature))).decode()
+
+    def decode(self, token: str) -> dict[str, Any]:
+        header, signing_input, payload, signature = _split(token)
+        key = self._verification_key(header)
+        if not hmac.compare_digest(
+            self._sign(key.kid, signing_input), signature
+        ):
+            raise JWTError('Signature verification failed.')
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            raise JWTError('Invalid payload string')
+        return _check_exp(claims)
+
+
+TOKEN_CODECS: dict[str, type[TokenCodec]] = {
+    codec.name: codec for codec in (JoseCodec, PyJWTCodec, HmacCodec)
+}
+
+
+def build_token_codec(
+    backend: str | None = None, key_ring: KeyRing | None = None
+) -> TokenCodec:
+    """
+    Builds codec for backend with keys of key_ring.
+
+    Args:
+        backend (str | None): One of TOKEN_CODECS, settings' by default.
+        key_ring (KeyRing | None): Keys, settings' key ring by default.
+
+    Raises:
+        ValueError: Backend can't handle the key ring's algorithms.
+
+    Returns:
+        TokenCodec: Ready to use codec.
+    """
+    codec_class = TOKEN_CODECS[backend or settings.token_backend]
+    return codec_class(key_ring or get_key_ring())
+
+
+@lru_cache(maxsize=1)
+def get_token_codec() -> TokenCodec:
+    """Codec from settings, built on first use (app startup)."""
+    return build_token_codec()
+
+
+def reload_token_codec() -> TokenCodec:
+    """Rereads keys from settings, e.g. after rotation."""
+    get_key_ring.cache_clear()
+    jwks_document.cache_clear()
+    get_token_codec.cache_clear()
+    return get_token_codec()
+
+
+def encode_token(claims: dict[str, Any]) -> str:
+    return get_token_codec().encode(claims)
+
+
+def decode_token(token: str) -> dict[str, Any]:
+    return get_token_codec().decode(token)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, NamedTuple
+
+from sqlalchemy import ARRAY, Text, bindparam, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.bloom import BloomFilter
+from src.core.settings import settings
+from src.models.user_model import User
+
+# Channel new emails are announced on, one notification per email
+EMAIL_CHANNEL = 'user_emails'
+
+# Rows committed by long transactions may carry created_at older than
+# the previous sync point, so every sync looks that far back
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+class EmailFilterStats(NamedTuple):
+    ready: bool
+    capacity: int
+    count: int
+    memory_bytes: int
+    fp_rate: float
+    estimated_fp_rate: float
+    short_circuits: int
+    listening: bool
+
+
+class EmailFilter:
+    """
+    Probabilistic set of existing emails. A definite miss lets lookups
+    skip the database. Until the first build everything "might exist".
+
+    The filter is per process. Registrations made by other workers arrive
+    as notifications on EMAIL_CHANNEL while listening, a miss is trusted
+    between syncs. The periodic sync covers notifications lost with the
+    listening connection, the periodic rebuild drops deleted emails.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float, fetch_size: int) -> None:
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.fetch_size = fetch_size
+        self.bloom: BloomFilter | None = None
+        self.synced_until: datetime | None = None
+        self.short_circuits = 0
+        self._pending: list[str] | None = None
+        """asyncpg connection notifications arrive on"""
+        self._listener: Any = None
+
+    def might_exist(self, email: str) -> bool:
+        bloom = self.bloom
+        if bloom is None or email in bloom:
+            return True
+        self.short_circuits += 1
+        return False
+
+    @property
+    def listening(self) -> bool:
+        return self._listener is not None and not self._listener.is_closed()
+
+    @asynccontextmanager
+    async def listen(self, session: AsyncSession) -> AsyncIterator[None]:
+        """
+        Adds emails announced by notify_created while the context is open.
+        Holds the session's connection outside of any transaction, LISTEN
+        is issued directly on the asyncpg connection.
+        """
+        connection = await session.connection(
+            execution_options={'isolation_level': 'AUTOCOMMIT'}
+        )
+        listener = (await connection.get_raw_connection()).driver_connection
+        await listener.add_listener(EMAIL_CHANNEL, self._on_notification)
+        self._listener = listener
+        try:
+            yield
+        finally:
+            self._listener = None
+            if not listener.is_closed():
+                await listener.remove_listener(
+                    EMAIL_CHANNEL, self._on_notification
+                )
+
+    def _on_notification(
+        self, connection: Any, pid: int, channel: str, email: str
+    ) -> None:
+        self.add(email)
+
+    def add(self, email: str) -> None:
+        if self.bloom is not None:
+            self.bloom.add(email)
+        if self._pending is not None:
+            self._pending.append(email)
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """
+        Builds new filter streaming all emails through a server side cursor
+        and swaps it in. Emails added meanwhile are replayed into it.
+        Cursor needs a transaction, hence explicit isolation level.
+        """
+        self._pending = []
+        try:
+            await session.connection(
+                execution_options={'isolation_level': 'REPEATABLE READ'}
+            )
+            estimate: float = (
+                await session.scalar(
+                    text(
+                        "SELECT reltuples FROM pg_class "
+                        "WHERE oid = 'users'::regclass"
+                    )
+                )
+            ) or 0
+            bloom = BloomFilter(
+                capacity=max(self.capacity, int(estimate * 1.5)),
+                fp_rate=self.fp_rate,
+            )
+            started_at: datetime = await session.scalar(select(func.now()))
+            result = await session.stream_scalars(
+                select(User.email),
+                execution_options={'yield_per': self.fetch_size},
+            )
+            async for email in result:
+                bloom.add(email)
+            for email in self._pending:
+                bloom.add(email)
+            self.bloom = bloom
+            self.synced_until = started_at
+        finally:
+            self._pending = None
+            await session.rollback()
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Adds emails created since the previous sync or rebuild."""
+        if self.bloom is None or self.synced_until is None:
+            return
+        started_at: datetime = await session.scalar(select(func.now()))
+        emails = await session.scalars(
+            select(User.email).where(
+                User.created_at > self.synced_until - SYNC_OVERLAP
+            )
+        )
+        for email in emails:
+            self.bloom.add(email)
+        self.synced_until = started_at
+        await session.rollback()
+
+    def stats(self) -> EmailFilterStats:
+        bloom = self.bloom
+        return EmailFilterStats(
+            ready=bloom is not None,
+            capacity=bloom.capacity if bloom else 0,
+            count=bloom.count if bloom else 0,
+            memory_bytes=bloom.memory_bytes if bloom else 0,
+            fp_rate=self.fp_rate,
+            estimated_fp_rate=bloom.estimated_fp_rate() if bloom else 0,
+            short_circuits=self.short_circuits,
+            listening=self.listening,
+        )
+
+
+async def notify_created(session: AsyncSession, emails: list[str]) -> None:
+    """
+    Announces emails inserted in the session's transaction to listening
+    filters of all workers. Notifications are delivered on commit and
+    dropped on rollback. A no-op while email filter is disabled.
+    """
+    if not settings.email_filter_enabled or not emails:
+        return
+    await session.execute(
+        text(
+            'SELECT pg_notify(:channel, email) '
+            'FROM unnest(CAST(:emails AS text[])) AS email'
+        ).bindparams(
+            bindparam('channel', EMAIL_CHANNEL),
+            bindparam('emails', emails, type_=ARRAY(Text)),
+        )
+    )
+
+
+email_filter = EmailFilter(
+    capacity=settings.email_filter_capacity,
+    fp_rate=settings.email_filter_fp_rate,
+    fetch_size=settings.email_filter_fetch_size,
+)
+
+
+async def maintain_email_filter(
+    session_factory: Callable[[], AsyncSession],
+    sync_seconds: float = settings.email_filter_sync_seconds,
+    rebuild_seconds: float = settings.email_filter_rebuild_seconds,
+) -> None:
+    """Background task: listens for new emails, builds the filter, then
+    keeps syncing and periodically rebuilding it until cancelled. A lost
+    listening connection is reopened and followed by a sync."""
+    rebuilt_at: float | None = None
+    while True:
+        try:
+            async with (
+                session_factory() as listen_session,
+                email_filter.listen(listen_session),
+            ):
+                """listen first, rows committed meanwhile are synced"""
+                while email_filter.listening:
+                    async with session_factory() as session:
+                        if (
+                            rebuilt_at is None
+                            or time.monotonic() - rebuilt_at >= rebuild_seconds
+                        ):
+                            await email_filter.rebuild(session)
+                            rebuilt_at = time.monotonic()
+                            print(
+                                '[INFO] Email filter built: '
+                                f'{email_filter.stats()}'
+                            )
+                        else:
+                            await email_filter.sync(session)
+                    await asyncio.sleep(sync_seconds)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f'[ERROR] Email filter maintenance failed: {str(e)}')
+        await asyncio.sleep(sync_seconds)
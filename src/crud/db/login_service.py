@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+from typing import Callable, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.metrics import registry
+from src.core.rate_limit import password_check_gate
+from src.core.single_flight import SingleFlight
+from src.crud.db.read_models import LoginCredentials
+from src.crud.db.user_service import get_login_credentials
+from src.errors.auth_errors import LoginOverloadedError
+from src.models.user_model import User
+
+LOGIN_VERIFICATIONS = registry.counter(
+    'login_verifications',
+    'Login credential checks, shared ones were answered by a concurrent '
+    'identical attempt',
+    ('result',),
+)
+_LEADER = LOGIN_VERIFICATIONS.labels('leader')
+_SHARED = LOGIN_VERIFICATIONS.labels('shared')
+
+# Flights never leave the process, so a per process key is enough.
+_FLIGHT_KEY = secrets.token_bytes(32)
+
+
+class LoginVerification(NamedTuple):
+    credentials: LoginCredentials | None
+    password_valid: bool
+
+
+_login_flights: SingleFlight[bytes, LoginVerification] = SingleFlight()
+
+
+def login_attempt_key(email: str, password: str) -> bytes:
+    """HMAC of the pair, so no password stays in the flight table and the
+    keys are useless for offline guessing."""
+    return hmac.new(
+        _FLIGHT_KEY,
+        email.encode() + b'\0' + password.encode(),
+        hashlib.sha256,
+    ).digest()
+
+
+async def _verify(
+    session_factory: Callable[[], AsyncSession], email: str, password: str
+) -> LoginVerification:
+    if not password_check_gate.try_enter():
+        raise LoginOverloadedError('Too many password checks in flight')
+    try:
+        async with session_factory() as session:
+            credentials = await get_login_credentials(
+                session=session, email=email
+            )
+        if credentials is None:
+            return LoginVerification(None, False)
+        user = User(
+            id=credentials.id, hashed_password=credentials.hashed_password
+        )
+        verified = await user.validate_password_async(password)
+        return LoginVerification(credentials, verified.value)
+    finally:
+        password_check_gate.leave()
+
+
+async def verify_login(
+    session_factory: Callable[[], AsyncSession], email: str, password: str
+) -> LoginVerification:
+    """
+    Looks up credentials and checks password. Identical attempts arriving
+    while one is being checked (client retries) wait for its outcome
+    instead of doing their own lookup and bcrypt run. The check uses its
+    own session, it may outlive the request that started it.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Creates the session.
+        email (str): User's email.
+        password (str): Raw password.
+
+    Raises:
+        LoginOverloadedError: Admission gate is full.
+
+    Returns:
+        LoginVerification: Credentials (None for unknown email) and
+            whether the password matched.
+    """
+    result = await _login_flights.do(
+        login_attempt_key(email, password),
+        lambda: _verify(session_factory, email, password),
+    )
+    (_SHARED if result.shared else _LEADER).inc()
+    return result.value
+
+
+registry.collected(
+    'login_verifications_in_flight',
+    'Distinct login checks running, duplicates excluded',
+    lambda: [((), len(_login_flights))],
+)
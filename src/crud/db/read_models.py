@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import NamedTuple
+
+from src.schemas.user_schema import UserSchema
+
+
+class LoginCredentials(NamedTuple):
+    """Columns login needs, fetched without building an ORM entity."""
+
+    id: uuid.UUID
+    hashed_password: str
+    is_active: bool
+
+
+class UserProfile(NamedTuple):
+    """Public user fields, immutable and cheap to keep in cache."""
+
+    id: uuid.UUID
+    email: str
+    full_name: str | None
+    is_active: bool
+    created_at: datetime
+
+
+class UserPage(NamedTuple):
+    """One page of users and the cursor of the next one, None at the end."""
+
+    users: list[UserSchema]
+    next_cursor: str | None
+
+
+class BulkImportReport(NamedTuple):
+    """Outcome of bulk user import, emails in input order."""
+
+    created: list[str]
+    duplicates: list[str]
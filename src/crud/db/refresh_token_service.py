@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy import String, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.metrics import TOKENS_ISSUED
+from src.core.settings import settings
+from src.errors.auth_errors import (
+    InvalidRefreshTokenError,
+    RefreshTokenReuseError,
+)
+from src.models.refresh_token_model import RefreshToken
+from src.models.user_model import User
+
+
+class RotatedRefreshToken(NamedTuple):
+    user_id: uuid.UUID
+    refresh_token: str
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    SHA-256 hex of the token. Tokens are 256 bit random values, so unlike
+    passwords they need no salt nor slow hashing: lookup by hash is a
+    plain unique index probe.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_token() -> tuple[str, str, datetime]:
+    token = secrets.token_urlsafe(32)
+    expires_at = datetime.now(timezone.utc) + timedelta(
+        days=settings.refresh_token_expire_days
+    )
+    return token, hash_refresh_token(token), expires_at
+
+
+async def issue_refresh_token(
+    session: AsyncSession, user_id: uuid.UUID
+) -> str:
+    """
+    Starts new token family for user, e.g. on password login.
+
+    Args:
+        session (AsyncSession): Database session.
+        user_id (uuid.UUID): Token owner.
+
+    Returns:
+        str: Raw token, it's never stored.
+    """
+    token, token_hash, expires_at = _new_token()
+    try:
+        await session.execute(
+            insert(RefreshToken).values(
+                token_hash=token_hash,
+                user_id=user_id,
+                family_id=uuid.uuid4(),
+                expires_at=expires_at,
+            )
+        )
+        await session.commit()
+        TOKENS_ISSUED.labels('refresh').inc()
+        return token
+    except (SQLAlchemyError, DBAPIError) as e:
+        await session.rollback()
+        raise RuntimeError(f'Database error: {str(e)}') from e
+
+
+async def rotate_refresh_token(
+    session: AsyncSession, token: str
+) -> RotatedRefreshToken:
+    """
+    Consumes refresh token and issues the next one of its family in one
+    statement: UPDATE marks the token used only if it's still valid and
+    its owner is active, INSERT of the successor reads from the UPDATE's
+    RETURNING. Two concurrent uses can't both succeed, the row lock lets
+    the second one see used_at already set.
+
+    Args:
+        session (AsyncSession): Database session.
+        token (str): Raw refresh token from the client.
+
+    Raises:
+        RefreshTokenReuseError: Token was used before, its family is
+            revoked.
+        InvalidRefreshTokenError: Token is unknown, expired or revoked.
+
+    Returns:
+        RotatedRefreshToken: Owner and the new raw token.
+    """
+    token_hash = hash_refresh_token(token)
+    new_token, new_hash, expires_at = _new_token()
+    used = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now(),
+            User.id == RefreshToken.user_id,
+            User.is_active,
+        )
+        .values(used_at=func.now())
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+        .cte('used')
+    )
+    query = (
+        insert(RefreshToken)
+        .from_select(
+            ['id', 'token_hash', 'user_id', 'family_id', 'expires_at'],
+            select(
+                literal(uuid.uuid4(), UUID(as_uuid=True)),
+                literal(new_hash, String()),
+                used.c.user_id,
+                used.c.family_id,
+                literal(expires_at, TIMESTAMP(timezone=True)),
+            ),
+        )
+        .returning(RefreshToken.user_id)
+    )
+    try:
+        user_id = (await session.execute(query)).scalar_one_or_none()
+        if user_id is not None:
+            await session.commit()
+            TOKENS_ISSUED.labels('refresh').inc()
+            return RotatedRefreshToken(user_id, new_token)
+        """rare path: find out why and react to reuse"""
+        presented = (
+            await session.execute(
+                select(RefreshToken.family_id, RefreshToken.used_at).where(
+                    RefreshToken.token_hash == token_hash
+                )
+            )
+        ).one_or_none()
+        if presented is not None and presented.used_at is not None:
+            await revoke_refresh_token_family(session, presented.family_id)
+            raise RefreshTokenReuseError('Refresh token reuse detected')
+        await session.rollback()
+        raise InvalidRefreshTokenError('Invalid refresh token')
+    except InvalidRefreshTokenError:
+        raise
+    except (SQLAlchemyError, DBAPIError) as e:
+        await session.rollback()
+        raise RuntimeError(f'Database error: {str(e)}') from e
+
+
+async def revoke_refresh_token_family(
+    session: AsyncSession, family_id: uuid.UUID
+) -> int:
+    """Revokes every not yet revoked token of the family, returns count."""
+    result = await session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.family_id == family_id,
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=func.now())
+    )
+    await session.commit()
+    return result.rowcount
+
+
+async def revoke_refresh_token(session: AsyncSession, token: str) -> int:
+    """Revokes family of the token (logout), returns revoked count."""
+    family_id = await session.scalar(
+        select(RefreshToken.family_id).where(
+            RefreshToken.token_hash == hash_refresh_token(token)
+        )
+    )
+    if family_id is None:
+        return 0
+    return await revoke_refresh_token_family(session, family_id)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.metrics import registry
+from src.core.settings import settings
+from src.models.revoked_token_model import RevokedToken
+
+# Identity values are handed out before commit, so a row with a lower id
+# may become visible after a higher one was synced. Skipped ids are
+# re-checked that long, then treated as rolled back.
+GAP_TIMEOUT = 60
+MAX_GAPS = 10_000
+
+REVOCATION_CHECK = registry.histogram(
+    'revocation_check_seconds',
+    'Revocation list lookup time',
+    buckets=(1e-7, 2.5e-7, 5e-7, 1e-6, 2.5e-6, 5e-6, 1e-5, 1e-4),
+)
+
+
+class RevocationListStats(NamedTuple):
+    entries: int
+    memory_bytes: int
+    cursor: int
+    gaps: int
+
+
+class RevocationList:
+    """
+    In-memory mirror of revoked_tokens: jti -> exp (unix time). Checking a
+    token is a dict lookup, no database query per request. Expired entries
+    are pruned in exp order via a heap. Revocations made by other workers
+    show up after the next sync.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+        self.cursor = 0
+        self._revoked: dict[str, float] = {}
+        self._expirations: list[tuple[float, str]] = []
+        self._gaps: dict[int, float] = {}
+
+    def is_revoked(self, jti: str) -> bool:
+        started_at = time.perf_counter()
+        revoked = jti in self._revoked
+        REVOCATION_CHECK.observe(time.perf_counter() - started_at)
+        return revoked
+
+    def add(self, jti: str, expires_at: float) -> None:
+        if jti in self._revoked or expires_at <= self.clock():
+            return
+        self._revoked[jti] = expires_at
+        heapq.heappush(self._expirations, (expires_at, jti))
+
+    def prune(self) -> int:
+        """Drops entries past their exp, returns how many."""
+        now = self.clock()
+        pruned = 0
+        while self._expirations and self._expirations[0][0] <= now:
+            _, jti = heapq.heappop(self._expirations)
+            del self._revoked[jti]
+            pruned += 1
+        return pruned
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Fetches rows added since the previous sync, plus ids skipped by
+        then, and prunes expired entries."""
+        now = self.clock()
+        self._gaps = {
+            gap: seen_at
+            for gap, seen_at in self._gaps.items()
+            if now - seen_at < GAP_TIMEOUT
+        }
+        query = (
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+            .where(
+                or_(
+                    RevokedToken.id > self.cursor,
+                    RevokedToken.id.in_(list(self._gaps)),
+                ),
+                RevokedToken.expires_at > func.now(),
+            )
+            .order_by(RevokedToken.id)
+        )
+        rows = (await session.execute(query)).all()
+        await session.rollback()
+        for row_id, jti, expires_at in rows:
+            self.add(jti, expires_at.timestamp())
+            self._gaps.pop(row_id, None)
+            if row_id > self.cursor:
+                if self.cursor and len(self._gaps) < MAX_GAPS:
+                    for gap in range(
+                        self.cursor + 1,
+                        min(row_id, self.cursor + 1 + MAX_GAPS),
+                    ):
+                        self._gaps[gap] = now
+                self.cursor = row_id
+        self.prune()
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def clear(self) -> None:
+        self.cursor = 0
+        self._revoked.clear()
+        self._expirations.clear()
+        self._gaps.clear()
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the structures, keys included."""
+        return (
+            sys.getsizeof(self._revoked)
+            + sys.getsizeof(self._expirations)
+            + sum(sys.getsizeof(jti) for jti in self._revoked)
+            + len(self._expirations) * sys.getsizeof((0.0, ''))
+        )
+
+    def stats(self) -> RevocationListStats:
+        return RevocationListStats(
+            entries=len(self),
+            memory_bytes=self.memory_bytes(),
+            cursor=self.cursor,
+            gaps=len(self._gaps),
+        )
+
+
+revocation_list = RevocationList()
+
+
+async def revoke_token(
+    session: AsyncSession,
+    jti: str,
+    expires_at: datetime,
+    user_id: uuid.UUID | None = None,
+) -> None:
+    """
+    Persists revocation and applies it in this process right away.
+
+    Args:
+        session (AsyncSession): Database session.
+        jti (str): Token's jti claim.
+        expires_at (datetime): Token's exp, row is useless afterwards.
+        user_id (uuid.UUID | None): Token owner, for audit.
+    """
+    try:
+        await session.execute(
+            pg_insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        await session.commit()
+    except (SQLAlchemyError, DBAPIError) as e:
+        await session.rollback()
+        raise RuntimeError(f'Database error: {str(e)}') from e
+    revocation_list.add(jti, expires_at.timestamp())
+
+
+async def maintain_revocation_list(
+    session_factory: Callable[[], AsyncSession],
+    sync_seconds: float = settings.revocation_sync_seconds,
+) -> None:
+    """Background task: keeps revocation_list in sync until cancelled."""
+    while True:
+        try:
+            async with session_factory() as session:
+                await revocation_list.sync(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f'[ERROR] Revocation list sync failed: {str(e)}')
+        await asyncio.sleep(sync_seconds)
+
+
+registry.collected(
+    'revocation_list_entries',
+    'Revoked tokens kept in memory',
+    lambda: [((), len(revocation_list))],
+)
+registry.collected(
+    'revocation_list_memory_bytes',
+    'Approximate memory of the in-memory revocation list',
+    lambda: [((), revocation_list.memory_bytes())],
+)
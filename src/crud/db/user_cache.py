@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, NamedTuple, TypeVar
+
+from src.core.metrics import registry
+from src.core.settings import settings
+from src.crud.db.read_models import UserProfile
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+class CacheStats(NamedTuple):
+    size: int
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Size bounded LRU cache with per entry expiration. None stored with
+    set_negative marks a key known to be absent. Not thread safe, meant to
+    be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self._data: OrderedDict[K, tuple[float, V | None]] = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> V | None | _Missing:
+        """Returns value, None for negative entry or MISSING."""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return MISSING
+        self._data.move_to_end(key)
+        if entry[1] is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry[1]
+
+    def _put(
+        self, key: K, value: V | None, ttl: float, generation: int | None
+    ) -> None:
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            """invalidated while the value was being loaded"""
+            return
+        self._data[key] = (self.clock() + ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key: K, value: V, generation: int | None = None) -> None:
+        """
+        Stores value. Pass generation read before loading the value, so a
+        value loaded concurrently with invalidation is not stored.
+        """
+        self._put(key, value, self.ttl, generation)
+
+    def set_negative(self, key: K, generation: int | None = None) -> None:
+        """Remembers the key is absent, no-op unless negative_ttl > 0."""
+        self._put(key, None, self.negative_ttl, generation)
+
+    def invalidate(self, key: K) -> None:
+        self.generation += 1
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._data),
+            hits=self.hits,
+            negative_hits=self.negative_hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+
+user_cache: TTLCache[str, UserProfile] = TTLCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl_seconds,
+    negative_ttl=settings.user_cache_negative_ttl_seconds,
+)
+
+registry.collected(
+    'user_cache_lookups',
+    'User cache lookups by outcome',
+    lambda: [
+        (('hit',), user_cache.hits),
+        (('negative_hit',), user_cache.negative_hits),
+        (('miss',), user_cache.misses),
+    ],
+    labelnames=('result',),
+    kind='counter',
+)
+registry.collected(
+    'user_cache_evictions',
+    'Entries evicted from user cache by size limit',
+    lambda: [((), user_cache.evictions)],
+    kind='counter',
+)
+registry.collected(
+    'user_cache_size', 'Entries in user cache', lambda: [((), len(user_cache))]
+)
@@ -0,0 +1,207 @@
+"""
+Export of the users table for analytics, as NDJSON or CSV. Rows are
+streamed through a server side cursor fetch_size at a time and every
+fetched batch is encoded and handed over before the next one is read,
+so memory stays flat whatever the table size.
+
+    python -m src.crud.db.user_export --format csv --active > users.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import io
+import sys
+import uuid
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import datetime
+from typing import Any, Literal
+
+import orjson
+from sqlalchemy import Row, select
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db_init import new_session
+from src.core.engines import close_all_engines
+from src.core.settings import settings
+from src.crud.db.user_service import PROFILE_COLUMNS
+from src.models.user_model import User
+
+ExportFormat = Literal['ndjson', 'csv']
+MEDIA_TYPES: dict[str, str] = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+FIELDS = tuple(column.key for column in PROFILE_COLUMNS)
+
+
+def _json_default(value: Any) -> Any:
+    """asyncpg returns a uuid.UUID subclass orjson doesn't encode"""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f'Type is not JSON serializable: {type(value)}')
+
+
+def encode_ndjson(rows: Sequence[Row]) -> bytes:
+    """One JSON object per line, keys in FIELDS order."""
+    return b''.join(
+        orjson.dumps(
+            dict(zip(FIELDS, row)),
+            default=_json_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE,
+        )
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Row], header: bool = False) -> bytes:
+    """CSV lines in FIELDS order, empty full_name for NULL."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if header:
+        writer.writerow(FIELDS)
+    writer.writerows(
+        (
+            user_id,
+            email,
+            full_name,
+            'true' if is_active else 'false',
+            created_at.isoformat(),
+        )
+        for user_id, email, full_name, is_active, created_at in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def stream_user_rows(
+    session: AsyncSession,
+    is_active: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    fetch_size: int = settings.export_fetch_size,
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Profile rows ordered by (created_at, id), in batches of up to
+    fetch_size rows. A server side cursor needs a transaction, it runs in
+    REPEATABLE READ so the export is one consistent snapshot.
+
+    Args:
+        session (AsyncSession): Database session, used up by the export.
+        is_active (bool | None): Only active or inactive users, None for
+            both.
+        created_from (datetime | None): Created at or after.
+        created_to (datetime | None): Created before.
+        fetch_size (int): Rows fetched per round trip.
+    """
+    query = select(*PROFILE_COLUMNS).order_by(User.created_at, User.id)
+    if is_active is not None:
+        query = query.where(User.is_active.is_(is_active))
+    if created_from is not None:
+        query = query.where(User.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(User.created_at < created_to)
+    try:
+        await session.connection(
+            execution_options={'isolation_level': 'REPEATABLE READ'}
+        )
+        result = await session.stream(
+            query, execution_options={'yield_per': fetch_size}
+        )
+        async for rows in result.partitions():
+            yield rows
+    except (SQLAlchemyError, DBAPIError) as e:
+        raise RuntimeError(f'Database error: {str(e)}') from e
+    finally:
+        await session.rollback()
+
+
+async def export_users(
+    session_factory: Callable[[], AsyncSession],
+    export_format: ExportFormat = 'ndjson',
+    is_active: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    fetch_size: int = settings.export_fetch_size,
+) -> AsyncIterator[bytes]:
+    """
+    Encoded export, one chunk per fetched batch; CSV starts with a header
+    chunk. Opens its own session, so a streaming response can consume it
+    after the request scope is gone.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Creates the session.
+        export_format (ExportFormat): 'ndjson' or 'csv'.
+        is_active, created_from, created_to, fetch_size: See
+            stream_user_rows.
+
+    Returns:
+        AsyncIterator[bytes]: Body chunks.
+    """
+    if export_format == 'csv':
+        yield encode_csv((), header=True)
+    async with session_factory() as session:
+        async for rows in stream_user_rows(
+            session,
+            is_active=is_active,
+            created_from=created_from,
+            created_to=created_to,
+            fetch_size=fetch_size,
+        ):
+            if export_format == 'csv':
+                yield encode_csv(rows)
+            else:
+                yield encode_ndjson(rows)
+
+
+async def _write_export(args: argparse.Namespace) -> None:
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        async for chunk in export_users(
+            new_session,
+            export_format=args.format,
+            is_active=args.active,
+            created_from=args.created_from,
+            created_to=args.created_to,
+            fetch_size=args.fetch_size,
+        ):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+        await close_all_engines()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--format', choices=list(MEDIA_TYPES), default='ndjson')
+    parser.add_argument(
+        '--output', help='file to write, standard output by default'
+    )
+    active = parser.add_mutually_exclusive_group()
+    active.add_argument(
+        '--active', dest='active', action='store_true', default=None
+    )
+    active.add_argument('--inactive', dest='active', action='store_false')
+    parser.add_argument(
+        '--created-from',
+        type=datetime.fromisoformat,
+        help='ISO timestamp, inclusive',
+    )
+    parser.add_argument(
+        '--created-to',
+        type=datetime.fromisoformat,
+        help='ISO timestamp, exclusive',
+    )
+    parser.add_argument(
+        '--fetch-size', type=int, default=settings.export_fetch_size
+    )
+    asyncio.run(_write_export(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main()
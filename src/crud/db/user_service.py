@@ -1,26 +1,85 @@
-from sqlalchemy import select
+import asyncio
+import base64
+import uuid
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+)
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import DBAPIError, IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.errors.db_errors import UserAlreadyExistsError, UserNotFoundError
+from src.crud.db.email_filter import email_filter, notify_created
+from src.crud.db.read_models import (
+    BulkImportReport,
+    LoginCredentials,
+    UserPage,
+    UserProfile,
+)
+from src.crud.db.user_cache import MISSING, user_cache
+from src.errors.db_errors import (
+    InvalidCursorError,
+    UserAlreadyExistsError,
+    UserNotFoundError,
+)
 from src.models.user_model import User
-from src.schemas.user_schema import CreateUserSchema, UserSchema
+from src.schemas.user_schema import (
+    CreateUserSchema,
+    RegisterUserSchema,
+    UserSchema,
+)
+
+"""Column projections, in the field order of their read models"""
+PROFILE_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.is_active,
+    User.created_at,
+)
+LOGIN_COLUMNS = (User.id, User.hashed_password, User.is_active)
+
+"""Each row uses 5 bind parameters of the 32767 a statement can have"""
+MAX_BULK_CHUNK_SIZE = 6000
 
 
 async def create_user(
     session: AsyncSession, user: CreateUserSchema
 ) -> UserSchema:
+    """
+    Creates user in one round trip: INSERT ... ON CONFLICT DO NOTHING
+    RETURNING does existence check, insert and server defaults fetch at
+    once, no RETURNING row means the email is taken. With email filter
+    enabled one more statement announces the email to other workers.
+
+    Args:
+        session (AsyncSession): Database session.
+        user (CreateUserSchema): New user, password is expected hashed.
+
+    Returns:
+        UserSchema: Created user.
+    """
     try:
-        existing_user: User | None = await session.scalar(
-            select(User).where(User.email == user.email)
+        query = (
+            pg_insert(User)
+            .values(**user.model_dump())
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(*PROFILE_COLUMNS)
         )
-        if existing_user:
+        new_user = (await session.execute(query)).one_or_none()
+        if new_user is None:
             raise UserAlreadyExistsError('User already exists')
-        new_user = User(**user.model_dump())
-        session.add(new_user)
+        await notify_created(session, [user.email])
         await session.commit()
-        await session.refresh(new_user)
-        return UserSchema.model_validate(new_user)
+        user_cache.invalidate(user.email)
+        email_filter.add(user.email)
+        return UserSchema.model_construct(**new_user._mapping)
     except UserAlreadyExistsError:
         await session.rollback()
         raise
@@ -33,16 +92,139 @@ async def create_user(
         raise RuntimeError(f'Unexpected error: {str(e)}') from e
 
 
+async def _chunked(
+    users: Iterable[RegisterUserSchema] | AsyncIterable[RegisterUserSchema],
+    chunk_size: int,
+) -> AsyncIterator[list[RegisterUserSchema]]:
+    """Groups sync or async stream of users into lists of chunk_size."""
+    chunk: list[RegisterUserSchema] = []
+    if isinstance(users, AsyncIterable):
+        async for user in users:
+            chunk.append(user)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for user in users:
+            chunk.append(user)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _insert_users_chunk(
+    session: AsyncSession,
+    chunk: list[RegisterUserSchema],
+    report: BulkImportReport,
+) -> None:
+    """Hashes passwords of chunk in parallel and inserts it with a single
+    multi-row INSERT ... ON CONFLICT DO NOTHING statement."""
+    unique: dict[str, RegisterUserSchema] = {}
+    for user in chunk:
+        unique.setdefault(user.email, user)
+    hashed = await asyncio.gather(
+        *(
+            User.hash_password_async(user.password)
+            for user in unique.values()
+        )
+    )
+    rows: list[dict[str, Any]] = [
+        {
+            'email': user.email,
+            'full_name': user.full_name,
+            'hashed_password': hashed_password.value,
+        }
+        for user, hashed_password in zip(unique.values(), hashed)
+    ]
+    query = (
+        pg_insert(User)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.email)
+    )
+    created: set[str] = set((await session.execute(query)).scalars())
+    await notify_created(session, list(created))
+    await session.commit()
+    for email in created:
+        user_cache.invalidate(email)
+        email_filter.add(email)
+    for user in chunk:
+        if user.email in created:
+            report.created.append(user.email)
+            created.discard(user.email)
+        else:
+            report.duplicates.append(user.email)
+
+
+async def create_users_bulk(
+    session: AsyncSession,
+    users: Iterable[RegisterUserSchema] | AsyncIterable[RegisterUserSchema],
+    chunk_size: int = 1000,
+) -> BulkImportReport:
+    """
+    Imports users in chunks, each chunk costs one INSERT and one COMMIT.
+    Unlike create_user it takes raw passwords and hashes them in the
+    hashing pool. Existing emails and repeated emails are skipped.
+
+    Args:
+        session (AsyncSession): Database session.
+        users (Iterable | AsyncIterable): Users to import with raw
+            passwords, consumed lazily.
+        chunk_size (int): Rows per statement, 1 to MAX_BULK_CHUNK_SIZE.
+
+    Raises:
+        ValueError: chunk_size is out of range.
+
+    Returns:
+        BulkImportReport: Created and duplicate emails in input order.
+    """
+    if not 1 <= chunk_size <= MAX_BULK_CHUNK_SIZE:
+        raise ValueError(
+            f'chunk_size must be between 1 and {MAX_BULK_CHUNK_SIZE}'
+        )
+    report = BulkImportReport(created=[], duplicates=[])
+    try:
+        async for chunk in _chunked(users, chunk_size):
+            await _insert_users_chunk(session, chunk, report)
+        return report
+    except (SQLAlchemyError, DBAPIError) as e:
+        await session.rollback()
+        raise RuntimeError(f'Database error: {str(e)}') from e
+
+
 async def get_user_by_email(
     session: AsyncSession, email: str
 ) -> UserSchema | None:
+    """
+    Read-through cached lookup, see user_cache. Cached profiles are
+    trusted DB data, so they are not validated again.
+    """
+    cached = user_cache.get(email)
+    if isinstance(cached, UserProfile):
+        profile = cached
+    elif cached is MISSING and email_filter.might_exist(email):
+        profile = await _load_user_profile(session=session, email=email)
+    else:
+        raise UserNotFoundError('User not found exists')
+    return UserSchema.model_construct(**profile._asdict())
+
+
+async def _load_user_profile(session: AsyncSession, email: str) -> UserProfile:
+    """
+    Public columns only, as a plain row: no User entity is built, nothing
+    enters the session identity map, hashed_password isn't fetched.
+    """
+    generation: int = user_cache.generation
     try:
-        query = select(User).where(User.email == email)
-        result = await session.execute(query)
-        user_in_db: User | None = result.scalars().one_or_none()
-        # replay: UserSchema = UserSchema.model_validate(user_in_db)
-        if user_in_db:
-            return UserSchema.model_validate(user_in_db)
+        query = select(*PROFILE_COLUMNS).where(User.email == email)
+        row = (await session.execute(query)).one_or_none()
+        if row is not None:
+            profile = UserProfile(*row)
+            user_cache.set(email, profile, generation=generation)
+            return profile
+        user_cache.set_negative(email, generation=generation)
         raise UserNotFoundError('User not found exists')
     except UserNotFoundError:
         raise
@@ -50,3 +232,162 @@ async def get_user_by_email(
         raise RuntimeError(f'Database error: {str(e)}') from e
     except Exception as e:
         raise RuntimeError(f'Unexpected error: {str(e)}') from e
+
+
+def encode_cursor(created_at: datetime, user_id: uuid.UUID) -> str:
+    """Opaque cursor of the position right after the given user."""
+    raw = f'{created_at.isoformat()}|{user_id}'.encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Reverses encode_cursor.
+
+    Raises:
+        InvalidCursorError: Cursor wasn't made by encode_cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, user_id = raw.decode().split('|')
+        return datetime.fromisoformat(created_at), uuid.UUID(user_id)
+    except ValueError as e:
+        raise InvalidCursorError('Invalid cursor') from e
+
+
+async def list_users(
+    session: AsyncSession, limit: int = 100, cursor: str | None = None
+) -> UserPage:
+    """
+    Users ordered by (created_at, id), paginated by keyset: a page starts
+    right after the last row of the previous one, found by a range scan
+    of ix_users_created_at_id. Unlike OFFSET, a deep page costs the same
+    as the first one, and rows inserted meanwhile don't shift pages.
+
+    Args:
+        session (AsyncSession): Database session.
+        limit (int): Page size.
+        cursor (str | None): next_cursor of the previous page, None for
+            the first page.
+
+    Raises:
+        InvalidCursorError: Cursor can't be decoded.
+
+    Returns:
+        UserPage: Users and the cursor of the next page.
+    """
+    query = (
+        select(*PROFILE_COLUMNS)
+        .order_by(User.created_at, User.id)
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        query = query.where(
+            tuple_(User.created_at, User.id) > tuple_(*decode_cursor(cursor))
+        )
+    try:
+        rows = (await session.execute(query)).all()
+    except (SQLAlchemyError, DBAPIError) as e:
+        raise RuntimeError(f'Database error: {str(e)}') from e
+    users = [UserSchema.model_construct(**row._mapping) for row in rows[:limit]]
+    next_cursor = (
+        encode_cursor(users[-1].created_at, users[-1].id)
+        if len(rows) > limit
+        else None
+    )
+    return UserPage(users, next_cursor)
+
+
+async def get_login_credentials(
+    session: AsyncSession, email: str
+) -> LoginCredentials | None:
+    """
+    Fetches only what login needs in one round trip on the unique email
+    index. Unlike get_user_by_email it keeps hashed_password and skips
+    ORM entity and pydantic conversion. Emails email_filter knows to be
+    absent cost no round trip at all.
+
+    Args:
+        session (AsyncSession): Database session.
+        email (str): User's email.
+
+    Returns:
+        LoginCredentials | None: Credentials or None for unknown email.
+    """
+    if not email_filter.might_exist(email):
+        return None
+    try:
+        query = select(*LOGIN_COLUMNS).where(User.email == email)
+        row = (await session.execute(query)).one_or_none()
+        return LoginCredentials(*row) if row else None
+    except (SQLAlchemyError, DBAPIError) as e:
+        raise RuntimeError(f'Database error: {str(e)}') from e
+
+
+async def update_password_hash(
+    session: AsyncSession, user_id: uuid.UUID, old_hash: str, new_hash: str
+) -> bool:
+    """
+    Replaces password hash only if it's still the one the caller verified
+    against, so a password changed meanwhile is never overwritten.
+
+    Args:
+        session (AsyncSession): Database session.
+        user_id (uuid.UUID): User's id.
+        old_hash (str): Hash read before re-hashing.
+        new_hash (str): Hash of the same password at the new cost.
+
+    Returns:
+        bool: True if the hash was replaced.
+    """
+    try:
+        query = (
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        result = await session.execute(query)
+        await session.commit()
+        return result.rowcount == 1
+    except (SQLAlchemyError, DBAPIError) as e:
+        await session.rollback()
+        raise RuntimeError(f'Database error: {str(e)}') from e
+
+
+_rehashing: set[uuid.UUID] = set()
+
+
+async def rehash_password(
+    session_factory: Callable[[], AsyncSession],
+    user_id: uuid.UUID,
+    password: str,
+    old_hash: str,
+) -> None:
+    """
+    Background task run after successful login: hashes the password at the
+    configured cost and stores it. Concurrent logins of the same user
+    within this process start a single rehash.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Creates own session,
+            request session is closed by the time the task runs.
+        user_id (uuid.UUID): User's id.
+        password (str): Password just verified against old_hash.
+        old_hash (str): Current hash with outdated cost.
+    """
+    if user_id in _rehashing:
+        return
+    _rehashing.add(user_id)
+    try:
+        new_hash = (await User.hash_password_async(password)).value
+        async with session_factory() as session:
+            await update_password_hash(
+                session=session,
+                user_id=user_id,
+                old_hash=old_hash,
+                new_hash=new_hash,
+            )
+    except Exception as e:
+        print(f'[ERROR] Password rehash failed: {str(e)}')
+    finally:
+        _rehashing.discard(user_id)
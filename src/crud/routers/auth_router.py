@@ -0,0 +1,161 @@
+import math
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db_init import get_async_session, get_session_factory
+from src.core.rate_limit import LOGIN_REJECTED, check_login_rate
+from src.crud.db.login_service import verify_login
+from src.crud.db.refresh_token_service import (
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+from src.crud.db.revocation_list import revoke_token
+from src.crud.db.user_service import rehash_password
+from src.crud.routers.dependencies import get_token_payload
+from src.errors.auth_errors import (
+    InvalidRefreshTokenError,
+    LoginOverloadedError,
+    RefreshTokenReuseError,
+)
+from src.models.user_model import User
+from src.schemas.user_schema import LoginSchema, RefreshTokenSchema
+
+router = APIRouter(tags=['auth'])
+
+
+@router.post('/login')
+async def login(
+    credentials: LoginSchema,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+) -> dict[str, str]:
+    """Processes user's authentication and returns a token
+    on successful authentication.
+
+    request body:
+
+    - email: Unique identifier for a user
+
+    - password:
+    """
+    """rejections are decided before any session is opened"""
+    limited = check_login_rate(
+        ip=request.client.host if request.client else None,
+        email=credentials.email,
+    )
+    if not limited.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail='Too many login attempts',
+            headers={'Retry-After': str(math.ceil(limited.retry_after))},
+        )
+    try:
+        verification = await verify_login(
+            session_factory=session_factory,
+            email=credentials.email,
+            password=credentials.password,
+        )
+    except LoginOverloadedError:
+        LOGIN_REJECTED.labels('overload').inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Server is busy, retry later',
+            headers={'Retry-After': '1'},
+        )
+    login_credentials = verification.credentials
+    if login_credentials is None or not verification.password_valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Invalid credentials',
+        )
+    if not login_credentials.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail='Inactive user'
+        )
+    user = User(
+        id=login_credentials.id,
+        hashed_password=login_credentials.hashed_password,
+    )
+    if user.needs_rehash():
+        """hash made at other cost, replace it after the response is sent"""
+        background_tasks.add_task(
+            rehash_password,
+            session_factory=session_factory,
+            user_id=user.id,
+            password=credentials.password,
+            old_hash=user.hashed_password,
+        )
+    """verification closed its session already, one connection at a time"""
+    async with session_factory() as session:
+        refresh_token = await issue_refresh_token(
+            session=session, user_id=user.id
+        )
+    return {**user.generate_token(), 'refresh_token': refresh_token}
+
+
+@router.post('/token/refresh')
+async def refresh_token(
+    body: RefreshTokenSchema,
+    session: AsyncSession = Depends(get_async_session),
+) -> dict[str, str]:
+    """Exchanges refresh token for new access and refresh tokens. The
+    presented refresh token can't be used again.
+
+    request body:
+
+    - refresh_token: Token from login or previous refresh
+    """
+    try:
+        rotated = await rotate_refresh_token(
+            session=session, token=body.refresh_token
+        )
+    except RefreshTokenReuseError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Refresh token reuse detected',
+        )
+    except InvalidRefreshTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Invalid refresh token',
+        )
+    return {
+        **User(id=rotated.user_id).generate_token(),
+        'refresh_token': rotated.refresh_token,
+    }
+
+
+@router.post('/logout', status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: RefreshTokenSchema | None = None,
+    payload: dict[str, Any] = Depends(get_token_payload),
+    session: AsyncSession = Depends(get_async_session),
+) -> None:
+    """Revokes the bearer access token and, when given, the refresh token
+    family it was issued with.
+
+    request body (optional):
+
+    - refresh_token: Token from login or previous refresh
+    """
+    if 'jti' in payload:
+        await revoke_token(
+            session=session,
+            jti=payload['jti'],
+            expires_at=datetime.fromtimestamp(payload['exp'], tz=timezone.utc),
+            user_id=payload.get('user_id'),
+        )
+    if body is not None:
+        await revoke_refresh_token(session=session, token=body.refresh_token)
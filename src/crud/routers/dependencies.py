@@ -0,0 +1,63 @@
+import uuid
+from typing import Any
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError
+
+from src.core.metrics import TOKENS_VERIFIED
+from src.core.settings import settings
+from src.crud.db.revocation_list import revocation_list
+from src.models.user_model import User
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={'WWW-Authenticate': 'Bearer'},
+    )
+
+
+async def get_token_payload(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> dict[str, Any]:
+    """
+    Verified claims of the bearer access token. Revocation is checked
+    against the in-memory revocation list, so there is no DB access.
+    """
+    if credentials is None:
+        raise _unauthorized('Not authenticated')
+    try:
+        payload = User.decode_token(credentials.credentials)
+    except JWTError:
+        raise _unauthorized('Invalid token')
+    jti: str | None = payload.get('jti')
+    if jti is not None and revocation_list.is_revoked(jti):
+        TOKENS_VERIFIED.labels('revoked').inc()
+        raise _unauthorized('Token revoked')
+    return payload
+
+
+async def get_current_user_id(
+    payload: dict[str, Any] = Depends(get_token_payload),
+) -> uuid.UUID:
+    """Authenticated user's id."""
+    try:
+        return uuid.UUID(payload['user_id'])
+    except (KeyError, ValueError):
+        raise _unauthorized('Invalid token')
+
+
+async def get_admin_user_id(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+) -> uuid.UUID:
+    """Authenticated user's id, if it's listed in settings.admin_user_ids.
+    Guards endpoints exposing other users' accounts."""
+    if user_id not in settings.admin_user_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail='Admin only'
+        )
+    return user_id
@@ -0,0 +1,27 @@
+import hashlib
+
+from fastapi import APIRouter, Request, Response, status
+
+from src.core.jwt_keys import jwks_document
+
+router = APIRouter(tags=['auth'])
+
+CACHE_CONTROL = 'public, max-age=300'
+
+
+@router.get('/.well-known/jwks.json')
+async def jwks(request: Request) -> Response:
+    """
+    Public keys verifying access tokens. Body only changes on key
+    rotation, so clients may cache it and revalidate with ETag.
+    """
+    body = jwks_document()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {'Cache-Control': CACHE_CONTROL, 'ETag': etag}
+    if request.headers.get('if-none-match') == etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    return Response(
+        content=body, media_type='application/json', headers=headers
+    )
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from src.core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=['metrics'])
+
+
+@router.get('/metrics', include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any, Sequence
+
+import orjson
+from fastapi import responses, status
+
+from src.crud.db.read_models import UserPage
+from src.schemas.user_schema import UserSchema
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """orjson handles exact uuid.UUID only, asyncpg returns a subclass"""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f'Type is not JSON serializable: {type(value)}')
+
+
+class ORJSONResponse(responses.ORJSONResponse):
+    """App default response class. UTC datetimes are written with Z, the
+    way pydantic writes them, so both paths produce the same text."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def user_response(
+    users: UserSchema | Sequence[UserSchema],
+    status_code: int = status.HTTP_200_OK,
+) -> ORJSONResponse:
+    """
+    Serializes users built from database rows straight to JSON. Field
+    values are in model __dict__ already and orjson encodes UUID and
+    datetime natively, so there is neither response model validation nor
+    jsonable_encoder pass. Declare response_model=UserSchema on the route
+    to keep the OpenAPI schema.
+
+    Args:
+        users (UserSchema | Sequence[UserSchema]): One user or a list.
+        status_code (int): Response status.
+
+    Returns:
+        ORJSONResponse: Response with the encoded body.
+    """
+    if isinstance(users, UserSchema):
+        return ORJSONResponse(users.__dict__, status_code=status_code)
+    return ORJSONResponse(
+        [user.__dict__ for user in users], status_code=status_code
+    )
+
+
+def user_page_response(page: UserPage) -> ORJSONResponse:
+    """Same as user_response, for a page of list_users."""
+    return ORJSONResponse(
+        {
+            'users': [user.__dict__ for user in page.users],
+            'next_cursor': page.next_cursor,
+        }
+    )
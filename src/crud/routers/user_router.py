@@ -0,0 +1,170 @@
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db_init import get_async_session, get_session_factory
+from src.core.settings import settings
+from src.crud.db.user_export import MEDIA_TYPES, ExportFormat, export_users
+from src.crud.db.user_service import (
+    create_user,
+    get_user_by_email,
+    list_users,
+)
+from src.crud.routers.dependencies import (
+    get_admin_user_id,
+    get_current_user_id,
+)
+from src.crud.routers.responses import user_page_response, user_response
+from src.errors.db_errors import (
+    InvalidCursorError,
+    UserAlreadyExistsError,
+    UserNotFoundError,
+)
+from src.models.user_model import User
+from src.schemas.user_schema import (
+    CreateUserSchema,
+    RegisterUserSchema,
+    UserPageSchema,
+    UserSchema,
+)
+
+router = APIRouter(prefix='/users', tags=['users'])
+
+
+@router.post(
+    '', status_code=status.HTTP_201_CREATED, response_model=UserSchema
+)
+async def register_user(
+    user: RegisterUserSchema,
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    """Registers new user.
+
+    request body:
+
+    - email: Unique identifier for a user
+
+    - full_name: Optional
+
+    - password:
+    """
+    hashed = await User.hash_password_async(user.password)
+    try:
+        created = await create_user(
+            session=session,
+            user=CreateUserSchema(
+                email=user.email,
+                full_name=user.full_name,
+                password=hashed.value,
+            ),
+        )
+    except UserAlreadyExistsError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail='User already exists',
+        )
+    return user_response(created, status_code=status.HTTP_201_CREATED)
+
+
+@router.get(
+    '',
+    response_model=UserPageSchema,
+    dependencies=[Depends(get_admin_user_id)],
+)
+async def read_users(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    """Lists users oldest first, requires admin bearer access token.
+
+    query parameters:
+
+    - limit: Page size
+
+    - cursor: next_cursor of the previous page, omit for the first page
+    """
+    try:
+        page = await list_users(session=session, limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor'
+        )
+    return user_page_response(page)
+
+
+@router.get(
+    '/export',
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_admin_user_id)],
+)
+async def export_users_file(
+    format: ExportFormat = Query('ndjson'),
+    is_active: bool | None = Query(None),
+    created_from: datetime | None = Query(None),
+    created_to: datetime | None = Query(None),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    """Streams all matching users oldest first, requires admin bearer
+    access token.
+
+    query parameters:
+
+    - format: ndjson or csv
+
+    - is_active: Only active or only inactive users
+
+    - created_from: Created at or after, ISO timestamp
+
+    - created_to: Created before, ISO timestamp
+    """
+    return StreamingResponse(
+        export_users(
+            session_factory,
+            export_format=format,
+            is_active=is_active,
+            created_from=created_from,
+            created_to=created_to,
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            'Content-Disposition': f'attachment; filename="users.{format}"'
+        },
+    )
+
+
+@router.get('/{email}', response_model=UserSchema)
+async def read_user(
+    email: str,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    """Returns user's public profile, requires bearer access token of that
+    user or of an admin. Others get 403 whether the email exists or not.
+    """
+    try:
+        user = await get_user_by_email(session=session, email=email)
+    except UserNotFoundError:
+        user = None
+    if user is not None and user.id == user_id:
+        return user_response(user)
+    if user_id not in settings.admin_user_ids:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail='Not allowed'
+        )
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail='User not found'
+        )
+    return user_response(user)
@@ -0,0 +1,13 @@
+class InvalidRefreshTokenError(Exception):
+    """Raised when refresh token is unknown, expired, used or revoked."""
+    pass
+
+
+class RefreshTokenReuseError(InvalidRefreshTokenError):
+    """Raised when already used refresh token is presented again."""
+    pass
+
+
+class LoginOverloadedError(Exception):
+    """Raised when login can't be admitted without exceeding capacity."""
+    pass
@@ -5,4 +5,14 @@ class UserAlreadyExistsError(Exception):
 
 class UserNotFoundError(Exception):
     """Raised when a user is not found."""
-    pass
\ No newline at end of file
+    pass
+
+
+class SchemaMismatchError(Exception):
+    """Raised when database schema revision differs from the code's."""
+    pass
+
+
+class InvalidCursorError(Exception):
+    """Raised when pagination cursor can't be decoded."""
+    pass
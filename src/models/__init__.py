@@ -1,3 +1,5 @@
+from src.models.refresh_token_model import RefreshToken
+from src.models.revoked_token_model import RevokedToken
 from src.models.user_model import User
 
-__all__ = ['User']
+__all__ = ['RefreshToken', 'RevokedToken', 'User']
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Identity, String, func
+from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.base import Base
+
+
+class RevokedToken(Base):
+    """
+    Revoked access token by its jti claim. Rows are useless after
+    expires_at (the token is rejected as expired anyway). Increasing id
+    lets workers fetch only rows added since their previous sync.
+    """
+
+    __tablename__ = 'revoked_tokens'
+
+    id: Mapped[int] = mapped_column(
+        BigInteger, Identity(always=True), primary_key=True
+    )
+    jti: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    user_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), index=True, nullable=False
+    )
+    revoked_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f'RevokedToken(id={self.id}, jti={self.jti})'
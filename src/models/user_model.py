@@ -4,14 +4,22 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, TypedDict
 
-import bcrypt
-from jose import jwt
-from sqlalchemy import Boolean, String, func
+from jose import JWTError
+from sqlalchemy import Boolean, Index, String, func
 from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core.base import Base
+from src.core.hashing import (
+    PoolResult,
+    check_password,
+    hash_password,
+    needs_rehash,
+    run_in_hash_pool,
+)
+from src.core.metrics import TOKENS_ISSUED, TOKENS_VERIFIED
 from src.core.settings import settings
+from src.core.tokens import decode_token, encode_token
 
 
 class TokenPayload(TypedDict):
@@ -21,6 +29,10 @@ class TokenPayload(TypedDict):
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        # keyset pagination order, see list_users
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -38,13 +50,15 @@ class User(Base):
     def __repr__(self) -> str:
         return f'User(id={self.id}, email={self.email})'
     
-    def to_dict(self) -> dict[str, str]:
+    def to_dict(self) -> dict[str, Any]:
+        """Public fields as they are, the JSON response class encodes
+        UUID and datetime itself"""
         return {
-            'id': str(self.id),
+            'id': self.id,
             'email': self.email,
             'full_name': self.full_name,
-            'is_active': str(self.is_active),
-            'created_at': str(self.created_at),
+            'is_active': self.is_active,
+            'created_at': self.created_at,
         }
 
     @staticmethod
@@ -52,22 +66,53 @@ class User(Base):
         """Transforms password from it's raw textual form to
         cryptographic hashes
         """
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode('utf-8')
+        return hash_password(password)
+
+    @staticmethod
+    async def hash_password_async(password: str) -> PoolResult[str]:
+        """Same as hash_password, but runs in the hashing pool leaving
+        the event loop free
+        """
+        return await run_in_hash_pool(
+            hash_password, password, settings.bcrypt_rounds
+        )
 
     def validate_password(self, password: str) -> bool:
         """Confirms password validity"""
-        return bcrypt.checkpw(password.encode(), self.hashed_password.encode())
+        return check_password(password, self.hashed_password)
 
-    def generate_token(self) -> dict[str, str]:
-        """Generates JWT token"""
-        payload: dict[str, Any] = {
+    async def validate_password_async(self, password: str) -> PoolResult[bool]:
+        """Same as validate_password, but runs in the hashing pool"""
+        return await run_in_hash_pool(
+            check_password, password, self.hashed_password
+        )
+
+    def needs_rehash(self) -> bool:
+        """Tells if hashed_password cost differs from the configured one"""
+        return needs_rehash(self.hashed_password)
+
+    def generate_claims(self) -> dict[str, Any]:
+        """Claims of a new access token"""
+        return {
             'user_id': str(self.id),
+            'jti': uuid.uuid4().hex,
             'exp': datetime.now(timezone.utc)
             + timedelta(minutes=settings.access_token_expire_minutes),
         }
-        token: str = jwt.encode(
-            claims=payload,
-            key=settings.secret_key,
-            algorithm=settings.algorithm
-        )
+
+    def generate_token(self) -> dict[str, str]:
+        """Generates JWT token signed with the active key"""
+        token: str = encode_token(self.generate_claims())
+        TOKENS_ISSUED.labels('access').inc()
         return {'access_token': token}
+
+    @staticmethod
+    def decode_token(token: str) -> dict[str, Any]:
+        """Verifies JWT token signature and expiration, returns its claims"""
+        try:
+            payload = decode_token(token)
+        except JWTError:
+            TOKENS_VERIFIED.labels('invalid').inc()
+            raise
+        TOKENS_VERIFIED.labels('valid').inc()
+        return payload
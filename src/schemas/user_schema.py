@@ -15,9 +15,29 @@ class CreateUserSchema(BaseUserSchema):
     hashed_password: str = Field(..., alias='password')
 
 
+class RegisterUserSchema(BaseUserSchema):
+    password: str = Field(...)
+
+
 class UserSchema(BaseUserSchema):
     id: UUID = Field(...)
     is_active: bool = Field(default=False)
     created_at: datetime = Field(..., description="Timestamp when user was created")
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserPageSchema(BaseModel):
+    users: list[UserSchema] = Field(...)
+    next_cursor: str | None = Field(
+        default=None, description='Pass as cursor to get the next page'
+    )
+
+
+class LoginSchema(BaseModel):
+    email: EmailStr = Field(...)
+    password: str = Field(...)
+
+
+class RefreshTokenSchema(BaseModel):
+    refresh_token: str = Field(...)
@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.harness import (
+    BenchCase,
+    BenchResult,
+    compare,
+    load_baseline,
+    run_case,
+    save_results,
+)
+
+
+def _result(name: str, ops_per_s: float, p50_us: float) -> BenchResult:
+    return BenchResult(
+        name=name,
+        iterations=10,
+        ops_per_s=ops_per_s,
+        p50_us=p50_us,
+        p99_us=p50_us * 2,
+        peak_alloc_bytes=100,
+    )
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_run_case_sync_and_async() -> None:
+    calls: list[int] = []
+
+    async def _async_case() -> None:
+        calls.append(1)
+
+    result = await run_case(
+        BenchCase('async', _async_case, iterations=20, warmup=2), repeat=2
+    )
+    """warmup + 2 timed rounds + traced calls"""
+    assert len(calls) == 2 + 20 * 2 + 20
+    assert result.iterations == 20
+    assert result.ops_per_s > 0
+    assert 0 < result.p50_us <= result.p99_us
+
+    result = await run_case(
+        BenchCase('sync', lambda: bytearray(100_000)), iterations=5
+    )
+    assert result.peak_alloc_bytes >= 100_000
+
+
+# @pytest.mark.active
+def test_compare_reports_regressions_beyond_threshold() -> None:
+    baseline = {
+        'fast': _result('fast', 1000, 100)._asdict(),
+        'slow': _result('slow', 1000, 100)._asdict(),
+    }
+    results = [
+        _result('fast', 900, 110),
+        _result('slow', 500, 200),
+        _result('new', 1, 1),
+    ]
+    regressions = compare(results, baseline, threshold=0.25)
+    assert {(r.name, r.metric) for r in regressions} == {
+        ('slow', 'ops_per_s'),
+        ('slow', 'p50_us'),
+    }
+    assert compare(results, baseline, threshold=1.5) == []
+
+
+# @pytest.mark.active
+def test_cli_saves_and_compares_baseline(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    baseline: Path = tmp_path / 'baseline.json'
+    args = [
+        '--no-db',
+        '--only',
+        'user_schema_validate',
+        '--iterations',
+        '50',
+        '--baseline',
+        str(baseline),
+    ]
+    assert main([*args, '--save-baseline']) == 0
+    stored = load_baseline(baseline)
+    assert set(stored) == {'user_schema_validate'}
+    output = json.loads(capsys.readouterr().out)
+    assert output['results'] == stored
+
+    """impossible baseline makes the run fail"""
+    save_results(
+        baseline, [_result('user_schema_validate', ops_per_s=1e9, p50_us=1)]
+    )
+    assert main(args) == 1
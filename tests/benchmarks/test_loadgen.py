@@ -0,0 +1,64 @@
+import random
+
+import pytest
+from httpx import AsyncClient
+
+from benchmarks.loadgen import LatencyHistogram, run_load
+from src.core.settings import settings
+from src.core.sql_instrumentation import PoolStats
+
+
+# @pytest.mark.active
+def test_latency_histogram_percentiles() -> None:
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0
+    values = [random.uniform(0.0001, 2.0) for _ in range(10_000)]
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    for percent in (50, 90, 99, 99.9):
+        exact = values[int(len(values) * percent / 100) - 1]
+        assert histogram.percentile(percent) == pytest.approx(exact, rel=0.02)
+    assert histogram.percentile(100) == pytest.approx(values[-1], abs=1e-6)
+    """buckets stay few however many values are recorded"""
+    assert len(histogram.counts) < 2000
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+@pytest.mark.parametrize('rate', [None, 200])
+async def test_run_load(
+    rate: float | None,
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 4)
+    monkeypatch.setattr(settings, 'login_rate_limit_enabled', False)
+    samples = iter(
+        PoolStats(5, checked_out, 0, checkouts, checkouts * 0.001, 0.002)
+        for checked_out, checkouts in zip(
+            [0, 5] + [1] * 1000, range(0, 10_000, 10)
+        )
+    )
+    report = await run_load(
+        async_client,
+        scenario='mixed',
+        concurrency=4,
+        rate=rate,
+        duration=30,
+        max_requests=40,
+        users=3,
+        pool_sample=lambda: next(samples),
+    )
+    assert report['requests'] == 40
+    assert report['error_rate'] == 0
+    assert report['mode'] == ('open' if rate else 'closed')
+    assert sum(
+        endpoint['requests'] for endpoint in report['endpoints'].values()
+    ) == 40
+    for endpoint in report['endpoints'].values():
+        if endpoint['requests']:
+            latency = endpoint['latency_ms']
+            assert 0 < latency['p50'] <= latency['p99'] <= latency['p100']
+    assert report['pool']['max_checked_out'] == 5
+    assert report['pool']['mean_checkout_wait_ms'] == pytest.approx(1)
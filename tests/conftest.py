@@ -2,4 +2,5 @@ pytest_plugins = [
     'tests.fixtures.creation_staff',
     'tests.fixtures.auth_staff',
     'tests.fixtures.db_technical',
+    'tests.fixtures.app_staff',
 ]
@@ -0,0 +1,36 @@
+import pytest
+
+from src.core.bloom import BloomFilter
+
+
+# @pytest.mark.active
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=10_000, fp_rate=0.01)
+    emails = [f'user{index}@example.com' for index in range(10_000)]
+    for email in emails:
+        bloom.add(email)
+    assert all(email in bloom for email in emails)
+    assert bloom.count == 10_000
+
+
+# @pytest.mark.active
+def test_bloom_filter_false_positive_rate() -> None:
+    bloom = BloomFilter(capacity=10_000, fp_rate=0.01)
+    for index in range(10_000):
+        bloom.add(f'user{index}@example.com')
+    false_positives = sum(
+        f'other{index}@example.com' in bloom for index in range(10_000)
+    )
+    assert false_positives / 10_000 < 0.02
+    assert bloom.estimated_fp_rate() == pytest.approx(0.01, rel=0.2)
+    """about 9.6 bits per item for 1%"""
+    assert bloom.memory_bytes == pytest.approx(10_000 * 9.6 / 8, rel=0.05)
+
+
+@pytest.mark.parametrize('capacity, fp_rate', [(0, 0.01), (10, 0), (10, 1)])
+# @pytest.mark.active
+def test_bloom_filter_validates_arguments(
+    capacity: int, fp_rate: float
+) -> None:
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=capacity, fp_rate=fp_rate)
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import text
+
+from src.core.db_init import create_app_engine
+from src.core.settings import settings
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_create_app_engine_keeps_connections(
+    async_admin_url: str,
+) -> None:
+    """Pool is configured from settings and connections survive sessions."""
+    engine = create_app_engine(url=async_admin_url)
+    try:
+        assert engine.pool.size() == settings.pg_pool_size
+        assert engine.pool._max_overflow == settings.pg_max_overflow  # type: ignore
+        assert engine.pool._timeout == settings.pg_pool_timeout  # type: ignore
+        assert engine.pool._pre_ping == settings.pg_pool_pre_ping
+        assert engine.pool._recycle == settings.pg_pool_recycle
+
+        backend_pids: set[int] = set()
+        for _ in range(3):
+            async with engine.connect() as conn:
+                result = await conn.execute(text('SELECT pg_backend_pid()'))
+                backend_pids.add(result.scalar_one())
+        """the same server connection is reused instead of reconnecting"""
+        assert len(backend_pids) == 1
+        assert engine.pool.checkedin() == 1
+    finally:
+        await engine.dispose()
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Generator
+
+import bcrypt
+import pytest
+
+from src.core.bcrypt_calibration import calibrate
+from src.core.hashing import (
+    HashPoolMode,
+    check_password,
+    create_hash_executor,
+    hash_password,
+    hash_rounds,
+    needs_rehash,
+    run_in_hash_pool,
+)
+from src.core.metrics import registry
+from src.core.settings import settings
+
+
+@pytest.fixture(params=['process', 'thread'])
+def hash_executor(request: pytest.FixtureRequest) -> Generator:
+    mode: HashPoolMode = request.param
+    executor = create_hash_executor(mode=mode, size=2)
+    try:
+        yield executor
+    finally:
+        executor.shutdown(wait=True)
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_run_in_hash_pool_hashes_and_checks(
+    hash_executor, raw_password: str
+) -> None:
+    """Both pool modes should produce valid hashes and verify them."""
+    hashed = await run_in_hash_pool(
+        hash_password, raw_password, executor=hash_executor
+    )
+    assert bcrypt.checkpw(raw_password.encode(), hashed.value.encode())
+    assert hashed.queue_wait >= 0
+
+    checked = await run_in_hash_pool(
+        check_password, raw_password, hashed.value, executor=hash_executor
+    )
+    assert checked.value is True
+    checked = await run_in_hash_pool(
+        check_password, 'WrongPassword', hashed.value, executor=hash_executor
+    )
+    assert checked.value is False
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_run_in_hash_pool_reports_queue_wait(raw_password: str) -> None:
+    """With a single worker the second call has to wait for the first."""
+    executor = create_hash_executor(mode='thread', size=1)
+    try:
+        hashed: str = hash_password(raw_password)
+        first, second = await asyncio.gather(
+            run_in_hash_pool(
+                check_password, raw_password, hashed, executor=executor
+            ),
+            run_in_hash_pool(
+                check_password, raw_password, hashed, executor=executor
+            ),
+        )
+    finally:
+        executor.shutdown(wait=True)
+    assert first.value and second.value
+    assert max(first.queue_wait, second.queue_wait) > 0.01
+
+
+# @pytest.mark.active
+def test_rounds_follow_settings(
+    raw_password: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 5)
+    hashed = hash_password(raw_password)
+    assert hash_rounds(hashed) == 5
+    assert not needs_rehash(hashed)
+    assert needs_rehash(hashed, rounds=6)
+    assert hash_rounds(hash_password(raw_password, rounds=4)) == 4
+
+
+# @pytest.mark.active
+def test_calibration_stays_within_target() -> None:
+    calibration = calibrate(target_ms=1000, max_rounds=6, samples=1)
+    assert 4 <= calibration.rounds <= 6
+    chosen = [t for t in calibration.timings if t.rounds == calibration.rounds]
+    assert calibration.rounds == 4 or chosen[0].median_ms <= 1000
+    """impossible target still yields the minimal cost"""
+    assert calibrate(target_ms=0, max_rounds=6, samples=1).rounds == 4
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_queue_depth_follows_executor_size(
+    raw_password: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Three calls on a one worker executor leave two queued, whatever
+    the configured pool size."""
+    monkeypatch.setattr(settings, 'hash_pool_size', 8)
+    executor = create_hash_executor(mode='thread', size=1)
+    hashed: str = hash_password(raw_password)
+    try:
+        calls = [
+            asyncio.create_task(
+                run_in_hash_pool(
+                    check_password, raw_password, hashed, executor=executor
+                )
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        assert 'hash_pool_queue_depth 2' in registry.render()
+        await asyncio.gather(*calls)
+    finally:
+        executor.shutdown(wait=True)
+    assert 'hash_pool_queue_depth 0' in registry.render()
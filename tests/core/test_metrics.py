@@ -0,0 +1,98 @@
+import pytest
+from httpx import AsyncClient
+
+from src.core.metrics import Registry
+from src.core.settings import settings
+
+
+# @pytest.mark.active
+def test_registry_renders_prometheus_text() -> None:
+    registry = Registry()
+    counter = registry.counter('jobs', 'Jobs done', ('queue',))
+    histogram = registry.histogram(
+        'latency_seconds', 'Latency', buckets=(0.1, 1)
+    )
+    depth = registry.collected('depth', 'Queue depth', lambda: [((), 3)])
+    counter.labels('mail').inc()
+    counter.labels('mail').inc(2)
+    for value in (0.05, 0.1, 0.5, 7):
+        histogram.observe(value)
+
+    assert registry.render().splitlines() == [
+        '# HELP jobs Jobs done',
+        '# TYPE jobs counter',
+        'jobs_total{queue="mail"} 3',
+        '# HELP latency_seconds Latency',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        'latency_seconds_sum 7.65',
+        'latency_seconds_count 4',
+        '# HELP depth Queue depth',
+        '# TYPE depth gauge',
+        'depth 3',
+    ]
+    """children are cached, label values are validated once"""
+    assert counter.labels('mail') is counter.labels('mail')
+    with pytest.raises(ValueError):
+        counter.labels()
+    with pytest.raises(ValueError):
+        registry.counter('jobs', 'Duplicate')
+    with pytest.raises(TypeError):
+        depth.labels()
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_metrics_endpoint(
+    test_user_email: str,
+    test_user_password: str,
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 4)
+    body = {'email': test_user_email, 'password': test_user_password}
+    await async_client.post('/users', json=body)
+    token = (await async_client.post('/login', json=body)).json()[
+        'access_token'
+    ]
+    await async_client.get(
+        f'/users/{test_user_email}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    response = await async_client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    text = response.text
+    assert (
+        'http_request_duration_seconds_count'
+        '{method="POST",route="/login",status="200"}'
+    ) in text
+    assert (
+        'http_request_duration_seconds_count'
+        '{method="GET",route="/users/{email}",status="200"}'
+    ) in text
+    assert 'hash_duration_seconds_count{operation="check_password"}' in text
+    assert 'hash_queue_wait_seconds_count{operation="hash_password"}' in text
+    assert 'hash_pool_queue_depth 0' in text
+    assert 'tokens_issued_total{kind="access"}' in text
+    assert 'tokens_verified_total{result="valid"}' in text
+    assert 'user_cache_lookups_total{result="miss"}' in text
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_metrics_method_label_is_bounded(
+    async_client: AsyncClient,
+) -> None:
+    """Arbitrary methods share one 'other' label value."""
+    for method in ('FOO', 'BAR', 'PURGE'):
+        await async_client.request(method, '/metrics')
+    text = (await async_client.get('/metrics')).text
+    assert (
+        'http_request_duration_seconds_count'
+        '{method="other",route="/metrics",status="405"}'
+    ) in text
+    assert 'method="FOO"' not in text and 'method="PURGE"' not in text
@@ -0,0 +1,67 @@
+import pytest
+from pydantic import ValidationError
+
+from src.core.rate_limit import AdmissionGate, TokenBucketLimiter
+from src.core.settings import Settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# @pytest.mark.active
+def test_token_bucket_burst_and_refill() -> None:
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1, burst=3, max_keys=100, clock=clock)
+    assert all(limiter.acquire('a').allowed for _ in range(3))
+    decision = limiter.acquire('a')
+    assert not decision.allowed and decision.retry_after == 1
+    assert limiter.acquire('b').allowed
+
+    clock.now += 2
+    assert limiter.acquire('a').allowed
+    assert limiter.acquire('a').allowed
+    assert not limiter.acquire('a').allowed
+    assert limiter.stats().limited == 2
+
+
+# @pytest.mark.active
+def test_token_bucket_memory_is_bounded() -> None:
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(
+        rate=1, burst=2, max_keys=64, shards=4, clock=clock
+    )
+    for i in range(10_000):
+        limiter.acquire(f'key-{i}')
+    assert len(limiter) <= 64
+    assert limiter.stats().evictions > 0
+
+    """refilled buckets are dropped on the next touch of their shard"""
+    clock.now += limiter.idle_ttl
+    for i in range(4):
+        limiter.acquire(f'new-{i}')
+    assert len(limiter) < 64
+
+
+# @pytest.mark.active
+def test_admission_gate_rejects_without_waiting() -> None:
+    gate = AdmissionGate(limit=2)
+    assert gate.try_enter() and gate.try_enter()
+    assert not gate.try_enter()
+    gate.leave()
+    assert gate.try_enter()
+    assert gate.rejected == 1
+
+
+# @pytest.mark.active
+@pytest.mark.parametrize(
+    'name', ['LOGIN_IP_PER_MINUTE', 'LOGIN_EMAIL_PER_MINUTE']
+)
+def test_login_rates_must_be_positive(name: str) -> None:
+    """A zero rate would never refill, Retry-After would be infinite."""
+    with pytest.raises(ValidationError):
+        Settings(**{name: 0})
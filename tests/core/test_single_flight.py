@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from src.core.single_flight import SingleFlight
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution() -> None:
+    flights: SingleFlight[str, int] = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def _work() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    callers = [asyncio.create_task(flights.do('k', _work)) for _ in range(5)]
+    other = asyncio.create_task(flights.do('other', _work))
+    await asyncio.sleep(0)
+    assert len(flights) == 2
+    release.set()
+    results = await asyncio.gather(*callers)
+    await other
+    assert calls == 2
+    assert [result.shared for result in results] == [False] + [True] * 4
+    assert len(flights) == 0
+
+    """finished flights are not cached"""
+    assert (await flights.do('k', _work)).shared is False
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_leader_cancel_is_isolated() -> None:
+    flights: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def _fail() -> int:
+        await release.wait()
+        raise ValueError('boom')
+
+    async def _slow() -> int:
+        await release.wait()
+        return 1
+
+    failing = [asyncio.create_task(flights.do('f', _fail)) for _ in range(3)]
+    leader = asyncio.create_task(flights.do('s', _slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do('s', _slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+    for caller in failing:
+        with pytest.raises(ValueError):
+            await caller
+    assert (await follower).value == 1
+    with pytest.raises(asyncio.CancelledError):
+        await leader
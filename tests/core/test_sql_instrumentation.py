@@ -0,0 +1,158 @@
+import json
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import command
+from src.core.migrate import alembic_config
+from src.core.sql_instrumentation import (
+    InstrumentedAsyncPool,
+    fingerprint,
+    instrument_engine,
+    pool_stats,
+)
+
+
+# @pytest.mark.active
+def test_fingerprint_strips_literals() -> None:
+    """Statements differing only in literals share a fingerprint."""
+    digest0, normalized0 = fingerprint("CREATE USER bob WITH PASSWORD 'secret'")
+    digest1, normalized1 = fingerprint(
+        "CREATE USER bob   WITH\n PASSWORD 'other''s'"
+    )
+    assert digest0 == digest1
+    assert normalized0 == normalized1 == 'CREATE USER bob WITH PASSWORD ?'
+    _, normalized = fingerprint('SELECT 1 FROM users WHERE id = $1 LIMIT 10')
+    assert normalized == 'SELECT ? FROM users WHERE id = $1 LIMIT ?'
+
+
+async def _instrumented_records(
+    mode: str, options: dict, async_admin_url: str, caplog
+) -> list[dict]:
+    """Runs SELECT 42 three times on an engine instrumented with mode and
+    returns the structured records logged meanwhile."""
+    engine = instrument_engine(
+        create_async_engine(
+            url=async_admin_url,
+            isolation_level='AUTOCOMMIT',
+            poolclass=InstrumentedAsyncPool,
+        ),
+        mode=mode,
+        **options,
+    )
+    try:
+        async with engine.connect() as conn:
+            for _ in range(3):
+                await conn.execute(text('SELECT 42'))
+    finally:
+        await engine.dispose()
+    return [
+        record.sql  # type: ignore[attr-defined]
+        for record in caplog.records
+        if record.name == 'src.sql'
+    ]
+
+
+@pytest.mark.parametrize(
+    'mode, options, expected',
+    [
+        ('off', {}, 0),
+        ('sample', {'sample_percent': 100}, 3),
+        ('sample', {'sample_percent': 0}, 0),
+        ('slow', {'slow_threshold_ms': 0}, 3),
+        ('slow', {'slow_threshold_ms': 60_000}, 0),
+    ],
+)
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_instrument_engine_modes(
+    mode, options, expected: int, async_admin_url: str, caplog
+) -> None:
+    """Only statements selected by mode produce structured records."""
+    records = await _instrumented_records(
+        mode, options, async_admin_url, caplog
+    )
+    assert len(records) == expected
+    for record in records:
+        assert record['statement'] == 'SELECT ?'
+        assert record['duration_ms'] >= 0
+        assert record['checkout_wait_ms'] >= 0
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_instrumentation_survives_migration(
+    async_admin_url: str, caplog, capsys
+) -> None:
+    """Running migrations in process, as src.core.migrate does, keeps the
+    src.sql logger enabled."""
+    command.upgrade(alembic_config(), 'head', sql=True)
+    capsys.readouterr()
+    assert not logging.getLogger('src.sql').disabled
+    records = await _instrumented_records(
+        'sample', {'sample_percent': 100}, async_admin_url, caplog
+    )
+    assert len(records) == 3
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_instrumentation_writes_json_lines(
+    async_admin_url: str, capsys, monkeypatch
+) -> None:
+    """Without any logging configuration both modes reach stderr as JSON
+    lines carrying the statement and checkout wait."""
+    sql_logger = logging.getLogger('src.sql')
+    monkeypatch.setattr(logging.getLogger(), 'handlers', [])
+    monkeypatch.setattr(sql_logger, 'handlers', [])
+    sql_logger.setLevel(logging.NOTSET)
+    for mode, options in (
+        ('sample', {'sample_percent': 100}),
+        ('slow', {'slow_threshold_ms': 0}),
+    ):
+        engine = instrument_engine(
+            create_async_engine(
+                url=async_admin_url,
+                isolation_level='AUTOCOMMIT',
+                poolclass=InstrumentedAsyncPool,
+            ),
+            mode=mode,
+            **options,
+        )
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text('SELECT 42'))
+        finally:
+            await engine.dispose()
+    assert len(sql_logger.handlers) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [line['level'] for line in lines] == ['INFO', 'WARNING']
+    for line in lines:
+        assert line['statement'] == 'SELECT ?'
+        assert line['checkout_wait_ms'] >= 0
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_pool_stats(async_admin_url: str) -> None:
+    engine = create_async_engine(
+        url=async_admin_url, poolclass=InstrumentedAsyncPool, pool_size=2
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+            stats = pool_stats(engine)
+            assert stats is not None
+            assert stats.size == 2
+            assert stats.checked_out == 1
+        async with engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+        stats = pool_stats(engine)
+        assert stats.checked_out == 0
+        assert stats.checkouts == 2
+        assert stats.checkout_wait_max <= stats.checkout_wait_total
+    finally:
+        await engine.dispose()
+    assert pool_stats(create_async_engine(url=async_admin_url)) is None
@@ -0,0 +1,89 @@
+import asyncio
+from typing import AsyncIterator, Callable
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.base import Base
+from src.core.migrate import head_revision, upgrade
+from src.core.startup.creation import (
+    get_schema_revision,
+    is_provisioned,
+    provision_database,
+)
+from src.models.user_model import User  # noqa: F401
+from tests.consts_and_utils import remove_db, remove_user
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_provisioning_fast_path(
+    test_db_name: str,
+    test_user_name: str,
+    test_user_password: str,
+    async_engine_factory_func: Callable[[str], AsyncIterator[AsyncEngine]],
+    async_admin_url: str,
+    async_user_url_test_db: str,
+) -> None:
+    async for admin_engine in async_engine_factory_func(async_admin_url):
+        await remove_db(engine=admin_engine)
+        async with admin_engine.begin() as conn:
+            await conn.execute(text(f'DROP ROLE IF EXISTS {test_user_name}'))
+        async for user_engine in async_engine_factory_func(
+            async_user_url_test_db
+        ):
+            """neither role nor database exist"""
+            assert not await is_provisioned(user_engine, head_revision())
+
+            async with admin_engine.connect() as conn:
+                messages = await provision_database(
+                    conn,
+                    db_name=test_db_name,
+                    user_name=test_user_name,
+                    password=test_user_password,
+                )
+            assert f"[INFO] User '{test_user_name}' created." in messages
+            assert f"[INFO] Database '{test_db_name}' created." in messages
+            assert (
+                '[INFO] Granted all privileges on database '
+                f"'{test_db_name}' to user '{test_user_name}'."
+            ) in messages
+
+            """schema is not migrated yet"""
+            assert await get_schema_revision(user_engine) is None
+            assert not await is_provisioned(user_engine, head_revision())
+            await asyncio.to_thread(
+                upgrade, user_engine.url.render_as_string(hide_password=False)
+            )
+            assert await get_schema_revision(user_engine) == head_revision()
+            assert await is_provisioned(user_engine, head_revision())
+            assert not await is_provisioned(user_engine, 'other')
+
+            """migrations produce exactly what the models describe"""
+            async with user_engine.connect() as conn:
+                diff = await conn.run_sync(
+                    lambda sync_conn: compare_metadata(
+                        MigrationContext.configure(sync_conn), Base.metadata
+                    )
+                )
+            assert diff == []
+
+            """second run finds everything in place"""
+            async with admin_engine.connect() as conn:
+                messages = await provision_database(
+                    conn,
+                    db_name=test_db_name,
+                    user_name=test_user_name,
+                    password=test_user_password,
+                )
+            assert (
+                f"[INFO] User '{test_user_name}' already exists." in messages
+            )
+            assert (
+                f"[INFO] Database '{test_db_name}' already exists." in messages
+            )
+        await remove_db(engine=admin_engine)
+        await remove_user(engine=admin_engine)
@@ -0,0 +1,127 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from jose import ExpiredSignatureError, JWTError, jwt
+
+from src.core.jwt_keys import KeyRing, generate_pem, load_key_ring
+from src.core.tokens import TOKEN_CODECS, build_token_codec
+
+ASYMMETRIC_BACKENDS = ['jose', 'pyjwt']
+
+
+def _claims(minutes: int = 5) -> dict:
+    return {
+        'user_id': 'abc',
+        'exp': datetime.now(timezone.utc) + timedelta(minutes=minutes),
+    }
+
+
+def _roundtrip(key_ring: KeyRing, backends: list[str]) -> None:
+    """every backend verifies tokens of every other one"""
+    codecs = [build_token_codec(backend, key_ring) for backend in backends]
+    for encoder in codecs:
+        token = encoder.encode(_claims())
+        assert jwt.get_unverified_header(token)['kid'] == key_ring.active.kid
+        for decoder in codecs:
+            assert decoder.decode(token)['user_id'] == 'abc'
+            with pytest.raises(JWTError):
+                decoder.decode(token[:-4] + 'AAAA')
+            with pytest.raises(ExpiredSignatureError):
+                decoder.decode(encoder.encode(_claims(-1)))
+            with pytest.raises(JWTError):
+                decoder.decode('not.a-token')
+
+
+# @pytest.mark.active
+@pytest.mark.parametrize(
+    'kind, algorithm', [('rsa', 'RS256'), ('ed25519', 'EdDSA')]
+)
+def test_asymmetric_roundtrip(
+    tmp_path: Path, kind: str, algorithm: str
+) -> None:
+    (tmp_path / 'k1.pem').write_bytes(generate_pem(kind))
+    key_ring = load_key_ring(keys_dir=str(tmp_path))
+    assert key_ring.active.algorithm == algorithm
+    assert key_ring.jwks()['keys'][0]['kid'] == 'k1'
+    _roundtrip(key_ring, ASYMMETRIC_BACKENDS)
+    with pytest.raises(ValueError):
+        build_token_codec('hmac', key_ring)
+
+
+# @pytest.mark.active
+def test_hmac_roundtrip() -> None:
+    key_ring = load_key_ring(secret_key='secret', algorithm='HS256')
+    assert key_ring.jwks() == {'keys': []}
+    _roundtrip(key_ring, list(TOKEN_CODECS))
+
+    """tokens issued before kid was added are still accepted"""
+    legacy = jwt.encode(_claims(), 'secret', algorithm='HS256')
+    for backend in TOKEN_CODECS:
+        codec = build_token_codec(backend, key_ring)
+        assert codec.decode(legacy)['user_id'] == 'abc'
+
+
+# @pytest.mark.active
+@pytest.mark.parametrize('backend', ASYMMETRIC_BACKENDS)
+def test_rotation_keeps_old_tokens_valid(tmp_path: Path, backend: str) -> None:
+    (tmp_path / 'old.pem').write_bytes(generate_pem('rsa'))
+    old_token = build_token_codec(
+        backend, load_key_ring(str(tmp_path))
+    ).encode(_claims())
+
+    (tmp_path / 'new.pem').write_bytes(generate_pem('ed25519'))
+    with pytest.raises(ValueError):
+        load_key_ring(str(tmp_path))
+    key_ring = load_key_ring(str(tmp_path), active_kid='new')
+    codec = build_token_codec(backend, key_ring)
+    new_token = codec.encode(_claims())
+    assert jwt.get_unverified_header(new_token)['kid'] == 'new'
+    assert codec.decode(old_token)['user_id'] == 'abc'
+    assert codec.decode(new_token)['user_id'] == 'abc'
+    assert {key['kid'] for key in key_ring.jwks()['keys']} == {'old', 'new'}
+
+    """old key removed: its tokens are rejected"""
+    (tmp_path / 'old.pem').unlink()
+    codec = build_token_codec(backend, load_key_ring(str(tmp_path)))
+    with pytest.raises(JWTError):
+        codec.decode(old_token)
+
+
+# @pytest.mark.active
+@pytest.mark.parametrize('backend', ASYMMETRIC_BACKENDS)
+def test_algorithm_comes_from_key(tmp_path: Path, backend: str) -> None:
+    """HS256 token claiming an RSA key's kid must not verify"""
+    (tmp_path / 'k1.pem').write_bytes(generate_pem('rsa'))
+    codec = build_token_codec(backend, load_key_ring(str(tmp_path)))
+    forged = jwt.encode(
+        _claims(), 'secret', algorithm='HS256', headers={'kid': 'k1'}
+    )
+    with pytest.raises(JWTError):
+        codec.decode(forged)
+
+
+# @pytest.mark.active
+@pytest.mark.parametrize('backend', list(TOKEN_CODECS))
+@pytest.mark.parametrize(
+    'header',
+    [
+        {'alg': 'HS256', 'kid': [1]},
+        {'alg': 'HS256', 'kid': {}},
+        {'kid': 'k1'},
+        {'alg': ['HS256']},
+    ],
+)
+def test_malformed_header_is_rejected(backend: str, header: dict) -> None:
+    """kid and alg of the unverified header are never used as is"""
+    codec = build_token_codec(
+        backend, load_key_ring(secret_key='secret', algorithm='HS256')
+    )
+    segments = [
+        base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b'=')
+        for part in (header, {'user_id': 'abc'})
+    ]
+    with pytest.raises(JWTError):
+        codec.decode(b'.'.join(segments + [b'AAAA']).decode())
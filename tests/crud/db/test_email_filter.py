@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.core.settings import settings
+from src.crud.db.email_filter import EmailFilter, email_filter
+from src.crud.db.user_service import (
+    create_user,
+    create_users_bulk,
+    get_login_credentials,
+    get_user_by_email,
+)
+from src.errors.db_errors import UserNotFoundError
+from src.models.user_model import User
+from src.schemas.user_schema import CreateUserSchema, RegisterUserSchema
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_email_filter_rebuild_and_sync(
+    test_user_password: str,
+    create_empty_test_db: AsyncEngine,
+) -> None:
+    async_session = async_sessionmaker(
+        bind=create_empty_test_db, expire_on_commit=False
+    )
+    emails = [f'user{index}@example.com' for index in range(20)]
+    async with async_session() as session:
+        await session.execute(
+            insert(User),
+            [
+                {'email': email, 'hashed_password': test_user_password}
+                for email in emails
+            ],
+        )
+        await session.commit()
+
+        email_filter = EmailFilter(capacity=100, fp_rate=0.001, fetch_size=7)
+        assert email_filter.might_exist('unknown@example.com')
+        await email_filter.rebuild(session)
+        assert email_filter.stats().ready
+        assert all(email_filter.might_exist(email) for email in emails)
+        assert not email_filter.might_exist('unknown@example.com')
+        assert email_filter.stats().short_circuits == 1
+
+        """emails created elsewhere arrive with sync"""
+        await session.execute(
+            insert(User).values(
+                email='late@example.com', hashed_password=test_user_password
+            )
+        )
+        await session.commit()
+        await email_filter.sync(session)
+        assert 'late@example.com' in email_filter.bloom
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_email_filter_sees_other_workers_registrations(
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Users registered through another worker arrive as notifications,
+    before its periodic sync."""
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 4)
+    monkeypatch.setattr(settings, 'email_filter_enabled', True)
+    other_worker = EmailFilter(capacity=100, fp_rate=0.001, fetch_size=10)
+    async with (
+        test_session_factory() as listen_session,
+        other_worker.listen(listen_session),
+    ):
+        assert other_worker.stats().listening
+        async with test_session_factory() as session:
+            await other_worker.rebuild(session)
+            await create_user(
+                session=session,
+                user=CreateUserSchema(
+                    email='new@example.com', password=test_user_password
+                ),
+            )
+            await create_users_bulk(
+                session=session,
+                users=[
+                    RegisterUserSchema(
+                        email=f'bulk{index}@example.com',
+                        password='Password1!',
+                    )
+                    for index in range(3)
+                ],
+                chunk_size=2,
+            )
+
+        expected = ['new@example.com'] + [
+            f'bulk{index}@example.com' for index in range(3)
+        ]
+        for _ in range(100):
+            if all(email in other_worker.bloom for email in expected):
+                break
+            await asyncio.sleep(0.01)
+        assert all(other_worker.might_exist(email) for email in expected)
+        assert not other_worker.might_exist('unknown@example.com')
+        assert other_worker.short_circuits == 1
+    assert not other_worker.stats().listening
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_email_filter_short_circuits_lookups(
+    test_user_email: str,
+    test_user_password: str,
+    create_empty_test_db: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(email_filter, 'bloom', None)
+    async_session = async_sessionmaker(
+        bind=create_empty_test_db, expire_on_commit=False
+    )
+    async with async_session() as session:
+        await email_filter.rebuild(session)
+        """new users are added on insert"""
+        await create_user(
+            session=session,
+            user=CreateUserSchema(
+                email=test_user_email, password=test_user_password
+            ),
+        )
+        assert await get_user_by_email(session=session, email=test_user_email)
+        assert await get_login_credentials(
+            session=session, email=test_user_email
+        )
+    """definite misses never touch the database"""
+    short_circuits: int = email_filter.short_circuits
+    await create_empty_test_db.dispose()
+    async with async_session() as session:
+        with pytest.raises(UserNotFoundError):
+            await get_user_by_email(
+                session=session, email='unknown@example.com'
+            )
+        assert (
+            await get_login_credentials(
+                session=session, email='unknown@example.com'
+            )
+            is None
+        )
+    assert email_filter.short_circuits == short_circuits + 2
+    assert create_empty_test_db.pool.checkedout() == 0
@@ -0,0 +1,107 @@
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.crud.db.user_service import encode_cursor, list_users
+from src.errors.db_errors import InvalidCursorError
+from src.models.user_model import User
+
+DEEP_PAGE = 1000
+PAGE_SIZE = 50
+LATENCY_SAMPLES = 30
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_pages_cover_all_users_once(
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """several users share created_at, id breaks the ties"""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    async with test_session_factory() as session:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    'email': f'user{i}@example.com',
+                    'hashed_password': 'x',
+                    'created_at': base + timedelta(seconds=i % 3),
+                }
+                for i in range(25)
+            ],
+        )
+        await session.commit()
+        expected = (
+            await session.scalars(
+                select(User.id).order_by(User.created_at, User.id)
+            )
+        ).all()
+
+        seen: list[uuid.UUID] = []
+        cursor = None
+        while True:
+            page = await list_users(session=session, limit=10, cursor=cursor)
+            seen += [user.id for user in page.users]
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert seen == expected
+
+        with pytest.raises(InvalidCursorError):
+            await list_users(session=session, cursor='not-a-cursor')
+
+
+async def _median_latency(session: AsyncSession, cursor: str | None) -> float:
+    latencies: list[float] = []
+    for _ in range(LATENCY_SAMPLES):
+        started_at = time.perf_counter()
+        page = await list_users(session=session, limit=PAGE_SIZE, cursor=cursor)
+        latencies.append(time.perf_counter() - started_at)
+        assert len(page.users) == PAGE_SIZE
+    return statistics.median(latencies)
+
+
+# @pytest.mark.active
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_deep_page_costs_as_much_as_first(
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    rows = (DEEP_PAGE + 1) * PAGE_SIZE
+    async with test_session_factory() as session:
+        await session.execute(
+            text(
+                'INSERT INTO users (id, email, hashed_password, is_active, '
+                'created_at) SELECT gen_random_uuid(), '
+                "'user' || n || '@example.com', 'x', true, "
+                "now() - n * interval '1 second' "
+                'FROM generate_series(1, :rows) AS n'
+            ),
+            {'rows': rows},
+        )
+        await session.commit()
+        await session.execute(text('ANALYZE users'))
+        last_of_previous = (
+            await session.execute(
+                select(User.created_at, User.id)
+                .order_by(User.created_at, User.id)
+                .offset((DEEP_PAGE - 1) * PAGE_SIZE - 1)
+                .limit(1)
+            )
+        ).one()
+        deep_cursor = encode_cursor(*last_of_previous)
+
+        """warm up"""
+        await _median_latency(session, None)
+        first = await _median_latency(session, None)
+        deep = await _median_latency(session, deep_cursor)
+        print(
+            f'\n\nlist_users p50: page 1 {first * 1000:.2f}ms, '
+            f'page {DEEP_PAGE} {deep * 1000:.2f}ms\n\n'
+        )
+        assert deep < first * 1.5 + 0.001
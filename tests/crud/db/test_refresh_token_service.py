@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.crud.db.refresh_token_service import (
+    hash_refresh_token,
+    issue_refresh_token,
+    rotate_refresh_token,
+)
+from src.crud.db.user_service import create_user
+from src.errors.auth_errors import (
+    InvalidRefreshTokenError,
+    RefreshTokenReuseError,
+)
+from src.models.refresh_token_model import RefreshToken
+from src.models.user_model import User
+from src.schemas.user_schema import CreateUserSchema
+
+
+async def _create_user(
+    session: AsyncSession, email: str, password: str
+) -> User:
+    created = await create_user(
+        session=session,
+        user=CreateUserSchema(email=email, password=password),
+    )
+    return User(id=created.id)
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_rotation_and_reuse_detection(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with test_session_factory() as session:
+        user = await _create_user(session, test_user_email, test_user_password)
+        first = await issue_refresh_token(session=session, user_id=user.id)
+        stored = await session.scalar(
+            select(RefreshToken).where(
+                RefreshToken.token_hash == hash_refresh_token(first)
+            )
+        )
+        assert stored is not None and stored.user_id == user.id
+        assert first not in stored.token_hash
+
+        second = await rotate_refresh_token(session=session, token=first)
+        assert second.user_id == user.id
+        third = await rotate_refresh_token(
+            session=session, token=second.refresh_token
+        )
+
+        """first token replayed: family is revoked, latest token too"""
+        with pytest.raises(RefreshTokenReuseError):
+            await rotate_refresh_token(session=session, token=first)
+        with pytest.raises(InvalidRefreshTokenError):
+            await rotate_refresh_token(
+                session=session, token=third.refresh_token
+            )
+
+        """other families are untouched"""
+        other = await issue_refresh_token(session=session, user_id=user.id)
+        assert (await rotate_refresh_token(session, other)).user_id == user.id
+
+        with pytest.raises(InvalidRefreshTokenError):
+            await rotate_refresh_token(session=session, token='unknown')
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_expired_token_and_inactive_user(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with test_session_factory() as session:
+        user = await _create_user(session, test_user_email, test_user_password)
+        expired = await issue_refresh_token(session=session, user_id=user.id)
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.token_hash == hash_refresh_token(expired))
+            .values(expires_at=datetime.now(timezone.utc) - timedelta(1))
+        )
+        with pytest.raises(InvalidRefreshTokenError) as exc_info:
+            await rotate_refresh_token(session=session, token=expired)
+        assert not isinstance(exc_info.value, RefreshTokenReuseError)
+
+        token = await issue_refresh_token(session=session, user_id=user.id)
+        await session.execute(
+            update(User).where(User.id == user.id).values(is_active=False)
+        )
+        with pytest.raises(InvalidRefreshTokenError):
+            await rotate_refresh_token(session=session, token=token)
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_concurrent_rotation_single_winner(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with test_session_factory() as session:
+        user = await _create_user(session, test_user_email, test_user_password)
+        token = await issue_refresh_token(session=session, user_id=user.id)
+
+    async def _rotate() -> str:
+        async with test_session_factory() as session:
+            try:
+                await rotate_refresh_token(session=session, token=token)
+                return 'rotated'
+            except RefreshTokenReuseError:
+                return 'reuse'
+
+    outcomes = await asyncio.gather(*(_rotate() for _ in range(5)))
+    assert outcomes.count('rotated') == 1
+    assert outcomes.count('reuse') == 4
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.crud.db.revocation_list import RevocationList
+from src.models.revoked_token_model import RevokedToken
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# @pytest.mark.active
+def test_entries_pruned_after_exp() -> None:
+    clock = FakeClock()
+    revocations = RevocationList(clock=clock)
+    revocations.add('late', 1100)
+    revocations.add('early', 1010)
+    revocations.add('expired', 999)
+    assert revocations.is_revoked('late') and revocations.is_revoked('early')
+    assert not revocations.is_revoked('expired')
+
+    clock.now = 1050
+    assert revocations.prune() == 1
+    assert not revocations.is_revoked('early')
+    assert revocations.is_revoked('late')
+    assert revocations.stats().entries == 1
+    assert revocations.memory_bytes() > 0
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_sync_is_incremental_and_rechecks_gaps(
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+    revocations = RevocationList()
+    async with test_session_factory() as session:
+        await session.execute(
+            insert(RevokedToken).values(
+                jti='old', expires_at=expires_at - timedelta(hours=1)
+            )
+        )
+        for jti in ('a', 'b'):
+            await session.execute(
+                insert(RevokedToken).values(jti=jti, expires_at=expires_at)
+            )
+        await revocations.sync(session)
+        assert revocations.is_revoked('a') and revocations.is_revoked('b')
+        assert not revocations.is_revoked('old')
+        cursor = revocations.cursor
+
+        """id cursor + 1 is taken by a transaction that commits later"""
+        await session.execute(
+            text(
+                'INSERT INTO revoked_tokens (id, jti, expires_at) '
+                'OVERRIDING SYSTEM VALUE VALUES (:id, :jti, :expires_at)'
+            ),
+            {'id': cursor + 2, 'jti': 'c', 'expires_at': expires_at},
+        )
+        await revocations.sync(session)
+        assert revocations.is_revoked('c')
+        assert revocations.stats().gaps == 1
+
+        await session.execute(
+            text(
+                'INSERT INTO revoked_tokens (id, jti, expires_at) '
+                'OVERRIDING SYSTEM VALUE VALUES (:id, :jti, :expires_at)'
+            ),
+            {'id': cursor + 1, 'jti': 'late', 'expires_at': expires_at},
+        )
+        await revocations.sync(session)
+        assert revocations.is_revoked('late')
+        assert revocations.stats().gaps == 0
+        assert revocations.cursor == cursor + 2
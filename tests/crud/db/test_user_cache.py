@@ -0,0 +1,63 @@
+import pytest
+
+from src.crud.db.user_cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# @pytest.mark.active
+def test_ttl_cache_expires_and_evicts() -> None:
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    """'b' is least recently used now"""
+    cache.set('c', 3)
+    assert cache.get('b') is MISSING
+    assert cache.get('c') == 3
+    clock.now = 10
+    assert cache.get('a') is MISSING
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 2, 1)
+    assert stats.size == 1
+
+
+# @pytest.mark.active
+def test_ttl_cache_negative_entries() -> None:
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=10, clock=clock)
+    """negative entries are off by default"""
+    cache.set_negative('a')
+    assert cache.get('a') is MISSING
+    cache.negative_ttl = 5
+    cache.set_negative('a')
+    assert cache.get('a') is None
+    assert cache.stats().negative_hits == 1
+    clock.now = 5
+    assert cache.get('a') is MISSING
+
+
+# @pytest.mark.active
+def test_ttl_cache_skips_stale_loads() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=10)
+    generation: int = cache.generation
+    cache.invalidate('a')
+    cache.set('a', 1, generation=generation)
+    assert cache.get('a') is MISSING
+    cache.set('a', 1, generation=cache.generation)
+    assert cache.get('a') == 1
+
+
+@pytest.mark.parametrize('maxsize, ttl', [(0, 10), (10, 0)])
+# @pytest.mark.active
+def test_ttl_cache_disabled(maxsize: int, ttl: float) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+    cache.set('a', 1)
+    assert cache.get('a') is MISSING
@@ -0,0 +1,124 @@
+import csv
+import io
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.crud.db.user_export import FIELDS, export_users
+from src.models.user_model import User
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def _insert_users(
+    session_factory: async_sessionmaker[AsyncSession], count: int
+) -> None:
+    async with session_factory() as session:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    'email': f'user{i:05}@example.com',
+                    'full_name': f'User {i}' if i % 2 else None,
+                    'hashed_password': 'x',
+                    'is_active': i % 3 != 0,
+                    'created_at': BASE + timedelta(minutes=i),
+                }
+                for i in range(count)
+            ],
+        )
+        await session.commit()
+
+
+async def _collect(
+    session_factory: async_sessionmaker[AsyncSession], **kwargs
+) -> list[bytes]:
+    return [chunk async for chunk in export_users(session_factory, **kwargs)]
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_export_formats_and_filters(
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    await _insert_users(test_session_factory, 25)
+
+    chunks = await _collect(test_session_factory, fetch_size=10)
+    assert len(chunks) == 3
+    users = [orjson.loads(line) for line in b''.join(chunks).splitlines()]
+    assert [user['email'] for user in users] == [
+        f'user{i:05}@example.com' for i in range(25)
+    ]
+    assert tuple(users[0]) == FIELDS
+    assert users[0]['full_name'] is None
+    assert users[0]['created_at'] == '2026-01-01T00:00:00Z'
+
+    chunks = await _collect(
+        test_session_factory,
+        export_format='csv',
+        is_active=False,
+        created_from=BASE + timedelta(minutes=3),
+        created_to=BASE + timedelta(minutes=12),
+        fetch_size=2,
+    )
+    rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode())))
+    assert [row['email'] for row in rows] == [
+        'user00003@example.com',
+        'user00006@example.com',
+        'user00009@example.com',
+    ]
+    assert rows[0]['full_name'] == 'User 3'
+    assert rows[1]['full_name'] == ''
+    assert {row['is_active'] for row in rows} == {'false'}
+
+
+async def _export_peak(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> tuple[int, int]:
+    """bytes exported and peak traced memory while exporting them"""
+    exported = 0
+    tracemalloc.start()
+    try:
+        async for chunk in export_users(session_factory, fetch_size=500):
+            exported += len(chunk)
+        return exported, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# @pytest.mark.active
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_export_memory_does_not_grow_with_table(
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async def _grow_to(rows: int) -> None:
+        async with test_session_factory() as session:
+            await session.execute(
+                text(
+                    'INSERT INTO users (id, email, hashed_password, '
+                    'is_active, created_at) SELECT gen_random_uuid(), '
+                    "'user' || n || '@example.com', 'x', true, now() "
+                    'FROM generate_series('
+                    '(SELECT count(*) FROM users) + 1, :rows) AS n'
+                ),
+                {'rows': rows},
+            )
+            await session.commit()
+
+    await _grow_to(5_000)
+    """warm up"""
+    await _export_peak(test_session_factory)
+    small_size, small_peak = await _export_peak(test_session_factory)
+    await _grow_to(50_000)
+    large_size, large_peak = await _export_peak(test_session_factory)
+    print(
+        f'\n\nexport peak memory: {small_size} bytes -> {small_peak} '
+        f'bytes traced, {large_size} bytes -> {large_peak} bytes traced\n\n'
+    )
+    assert large_size > small_size * 9
+    assert large_peak < small_peak * 2
@@ -1,6 +1,8 @@
 # from typing import AsyncGenerator
 
+import asyncio
 from datetime import datetime
+from typing import AsyncIterator
 from uuid import UUID
 
 import pytest
@@ -13,9 +15,17 @@ from sqlalchemy.ext.asyncio import (
     # create_async_engine,
 )
 
-from src.crud.db.user_service import create_user, get_user_by_email
+from src.crud.db.user_cache import user_cache
+from src.crud.db.user_service import (
+    MAX_BULK_CHUNK_SIZE,
+    create_user,
+    create_users_bulk,
+    get_login_credentials,
+    get_user_by_email,
+)
 from src.errors.db_errors import UserAlreadyExistsError, UserNotFoundError
-from src.schemas.user_schema import CreateUserSchema
+from src.models.user_model import User
+from src.schemas.user_schema import CreateUserSchema, RegisterUserSchema
 
 # from src.core.base import Base
 # from src.core.settings import settings
@@ -79,3 +89,167 @@ async def test_get_user_by_email(
             assert 'User not found exists' in str(exec_info.value)
 
     
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_get_login_credentials(
+    test_user_email: str,
+    test_user_password: str,
+    create_empty_test_db: AsyncEngine,
+) -> None:
+    create_user_schema = CreateUserSchema(
+        email=test_user_email,
+        password=test_user_password,
+    )
+    async_session = async_sessionmaker(
+        bind=create_empty_test_db, expire_on_commit=False
+    )
+    async with async_session() as session:
+        created = await create_user(session=session, user=create_user_schema)
+        credentials = await get_login_credentials(
+            session=session, email=test_user_email
+        )
+        assert credentials is not None
+        assert credentials.id == created.id
+        assert credentials.hashed_password == test_user_password
+        assert credentials.is_active
+        assert await get_login_credentials(
+            session=session, email='nonexisting@example.com'
+        ) is None
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_create_users_bulk(
+    test_user_email: str,
+    test_user_password: str,
+    create_empty_test_db: AsyncEngine,
+) -> None:
+    async_session = async_sessionmaker(
+        bind=create_empty_test_db, expire_on_commit=False
+    )
+    emails: list[str] = [
+        'bulk0@example.com',
+        test_user_email,
+        'bulk1@example.com',
+        'bulk0@example.com',
+        'bulk2@example.com',
+    ]
+
+    async def _users() -> AsyncIterator[RegisterUserSchema]:
+        for email in emails:
+            yield RegisterUserSchema(email=email, password=test_user_password)
+
+    async with async_session() as session:
+        await create_user(
+            session=session,
+            user=CreateUserSchema(
+                email=test_user_email, password=test_user_password
+            ),
+        )
+        report = await create_users_bulk(
+            session=session, users=_users(), chunk_size=2
+        )
+        assert report.created == [
+            'bulk0@example.com',
+            'bulk1@example.com',
+            'bulk2@example.com',
+        ]
+        assert report.duplicates == [test_user_email, 'bulk0@example.com']
+
+        credentials = await get_login_credentials(
+            session=session, email='bulk1@example.com'
+        )
+        assert credentials is not None
+        assert User(
+            hashed_password=credentials.hashed_password
+        ).validate_password(test_user_password)
+
+        """sync iterables work too, repeated import creates nothing"""
+        report = await create_users_bulk(
+            session=session,
+            users=[
+                RegisterUserSchema(email=email, password=test_user_password)
+                for email in emails
+            ],
+        )
+        assert report.created == []
+        assert report.duplicates == emails
+
+        for chunk_size in (0, MAX_BULK_CHUNK_SIZE + 1):
+            with pytest.raises(ValueError):
+                await create_users_bulk(
+                    session=session, users=[], chunk_size=chunk_size
+                )
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_create_user_concurrent_duplicates(
+    test_user_email: str,
+    test_user_password: str,
+    create_empty_test_db: AsyncEngine,
+) -> None:
+    """Racing registrations of one email: exactly one wins."""
+    async_session = async_sessionmaker(
+        bind=create_empty_test_db, expire_on_commit=False
+    )
+
+    async def _register() -> bool:
+        async with async_session() as session:
+            try:
+                await create_user(
+                    session=session,
+                    user=CreateUserSchema(
+                        email=test_user_email, password=test_user_password
+                    ),
+                )
+                return True
+            except UserAlreadyExistsError:
+                return False
+
+    results = await asyncio.gather(*(_register() for _ in range(5)))
+    assert sorted(results) == [False, False, False, False, True]
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_get_user_by_email_cache(
+    test_user_email: str,
+    test_user_password: str,
+    create_empty_test_db: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(user_cache, 'negative_ttl', 60)
+    async_session = async_sessionmaker(
+        bind=create_empty_test_db, expire_on_commit=False
+    )
+    async with async_session() as session:
+        """unknown email is remembered as absent"""
+        with pytest.raises(UserNotFoundError):
+            await get_user_by_email(session=session, email=test_user_email)
+        negative_hits: int = user_cache.negative_hits
+        with pytest.raises(UserNotFoundError):
+            await get_user_by_email(session=session, email=test_user_email)
+        assert user_cache.negative_hits == negative_hits + 1
+
+        """create_user drops the negative entry"""
+        created = await create_user(
+            session=session,
+            user=CreateUserSchema(
+                email=test_user_email, password=test_user_password
+            ),
+        )
+        result0 = await get_user_by_email(
+            session=session, email=test_user_email
+        )
+        hits: int = user_cache.hits
+        result1 = await get_user_by_email(
+            session=session, email=test_user_email
+        )
+        assert user_cache.hits == hits + 1
+        assert result0 == result1
+        assert result1 is not None
+        assert result1.id == created.id
+        assert result1.created_at == created.created_at
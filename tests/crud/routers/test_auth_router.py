@@ -0,0 +1,348 @@
+import asyncio
+import statistics
+import time
+from typing import AsyncIterator
+
+import bcrypt
+import pytest
+from httpx import AsyncClient
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app import app
+from src.core.db_init import get_async_session
+from src.core.hashing import hash_rounds
+from src.core.rate_limit import password_check_gate
+from src.core.settings import settings
+from src.crud.db.login_service import LOGIN_VERIFICATIONS
+from src.crud.db.user_service import create_user, get_login_credentials
+from src.schemas.user_schema import CreateUserSchema
+
+LOGIN_CONCURRENCY = 16
+LOGIN_REQUESTS = 160
+LOGIN_P50_BUDGET = 0.25
+LOGIN_P99_BUDGET = 1.0
+
+
+async def _create_login_user(
+    session_factory: async_sessionmaker[AsyncSession],
+    email: str,
+    password: str,
+    rounds: int = 12,
+) -> None:
+    hashed_password: str = bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(rounds=rounds)
+    ).decode('utf-8')
+    async with session_factory() as session:
+        await create_user(
+            session=session,
+            user=CreateUserSchema(email=email, password=hashed_password),
+        )
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_login(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+    async_client: AsyncClient,
+) -> None:
+    await _create_login_user(
+        test_session_factory, test_user_email, test_user_password
+    )
+    """correct credentials"""
+    response = await async_client.post(
+        '/login',
+        json={'email': test_user_email, 'password': test_user_password},
+    )
+    assert response.status_code == 200
+    token: str = response.json()['access_token']
+    payload = jwt.decode(
+        token, settings.secret_key, algorithms=[settings.algorithm]
+    )
+    assert 'user_id' in payload
+
+    """wrong password"""
+    response = await async_client.post(
+        '/login', json={'email': test_user_email, 'password': 'WrongPassword'}
+    )
+    assert response.status_code == 401
+
+    """unknown email"""
+    response = await async_client.post(
+        '/login',
+        json={'email': 'nonexisting@example.com', 'password': 'any'},
+    )
+    assert response.status_code == 401
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_login_uses_no_request_session(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Verification and refresh token issue open sessions one after the
+    other, the request scoped session is never checked out."""
+    await _create_login_user(
+        test_session_factory, test_user_email, test_user_password, rounds=4
+    )
+
+    async def _no_session() -> AsyncIterator[AsyncSession]:
+        raise AssertionError('login took a request scoped session')
+        yield
+
+    monkeypatch.setitem(
+        app.dependency_overrides, get_async_session, _no_session
+    )
+    response = await async_client.post(
+        '/login',
+        json={'email': test_user_email, 'password': test_user_password},
+    )
+    assert response.status_code == 200
+    assert response.json()['refresh_token']
+
+
+# @pytest.mark.active
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_login_latency_budget(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Latency of the whole login pipeline under concurrent load. The stored
+    hash uses the minimal bcrypt cost, so the budget covers lookup, pool
+    dispatch and token issue rather than bcrypt itself.
+    """
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 4)
+    monkeypatch.setattr(settings, 'login_rate_limit_enabled', False)
+    monkeypatch.setattr(password_check_gate, 'limit', LOGIN_CONCURRENCY)
+    await _create_login_user(
+        test_session_factory, test_user_email, test_user_password, rounds=4
+    )
+    body = {'email': test_user_email, 'password': test_user_password}
+    """warm up pools"""
+    await async_client.post('/login', json=body)
+
+    semaphore = asyncio.Semaphore(LOGIN_CONCURRENCY)
+    latencies: list[float] = []
+
+    async def _login() -> None:
+        async with semaphore:
+            started_at = time.perf_counter()
+            response = await async_client.post('/login', json=body)
+            latencies.append(time.perf_counter() - started_at)
+            assert response.status_code == 200
+
+    await asyncio.gather(*(_login() for _ in range(LOGIN_REQUESTS)))
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    p50, p99 = quantiles[49], quantiles[98]
+    print(
+        f'\n\nlogin latency, concurrency {LOGIN_CONCURRENCY}: '
+        f'p50={p50 * 1000:.1f}ms p99={p99 * 1000:.1f}ms\n\n'
+    )
+    assert p50 < LOGIN_P50_BUDGET
+    assert p99 < LOGIN_P99_BUDGET
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_cost(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 5)
+    await _create_login_user(
+        test_session_factory, test_user_email, test_user_password, rounds=4
+    )
+    body = {'email': test_user_email, 'password': test_user_password}
+    response = await async_client.post('/login', json=body)
+    assert response.status_code == 200
+
+    """background task completes before the in-process response returns"""
+    async with test_session_factory() as session:
+        credentials = await get_login_credentials(session, test_user_email)
+    assert credentials is not None
+    assert hash_rounds(credentials.hashed_password) == 5
+    assert bcrypt.checkpw(
+        test_user_password.encode(), credentials.hashed_password.encode()
+    )
+
+    """rehashed password still logs in, nothing left to rehash"""
+    response = await async_client.post('/login', json=body)
+    assert response.status_code == 200
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_refresh_token_flow(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+    async_client: AsyncClient,
+) -> None:
+    await _create_login_user(
+        test_session_factory, test_user_email, test_user_password, rounds=4
+    )
+    response = await async_client.post(
+        '/login',
+        json={'email': test_user_email, 'password': test_user_password},
+    )
+    tokens = response.json()
+    assert set(tokens) == {'access_token', 'refresh_token'}
+
+    response = await async_client.post(
+        '/token/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated['refresh_token'] != tokens['refresh_token']
+    payload = jwt.decode(
+        rotated['access_token'],
+        settings.secret_key,
+        algorithms=[settings.algorithm],
+    )
+    assert payload['user_id'] == jwt.get_unverified_claims(
+        tokens['access_token']
+    )['user_id']
+
+    """replay of the consumed token revokes the rotated one as well"""
+    response = await async_client.post(
+        '/token/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Refresh token reuse detected'
+    response = await async_client.post(
+        '/token/refresh', json={'refresh_token': rotated['refresh_token']}
+    )
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Invalid refresh token'
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_logout_revokes_tokens(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+    async_client: AsyncClient,
+) -> None:
+    await _create_login_user(
+        test_session_factory, test_user_email, test_user_password, rounds=4
+    )
+    body = {'email': test_user_email, 'password': test_user_password}
+    tokens = (await async_client.post('/login', json=body)).json()
+    other = (await async_client.post('/login', json=body)).json()
+    assert jwt.get_unverified_claims(tokens['access_token'])['jti'] != (
+        jwt.get_unverified_claims(other['access_token'])['jti']
+    )
+    headers = {'Authorization': f'Bearer {tokens["access_token"]}'}
+    profile_url = f'/users/{test_user_email}'
+    assert (await async_client.get(profile_url, headers=headers)).is_success
+
+    response = await async_client.post(
+        '/logout',
+        json={'refresh_token': tokens['refresh_token']},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    response = await async_client.get(profile_url, headers=headers)
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Token revoked'
+    response = await async_client.post(
+        '/token/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+    assert response.status_code == 401
+
+    """other session stays logged in"""
+    response = await async_client.get(
+        profile_url,
+        headers={'Authorization': f'Bearer {other["access_token"]}'},
+    )
+    assert response.status_code == 200
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_login_rate_limited_before_verification(
+    test_user_email: str,
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """unknown account: limits apply even though nothing is looked up"""
+    body = {'email': test_user_email, 'password': 'WrongPassword'}
+    for _ in range(settings.login_email_burst):
+        response = await async_client.post('/login', json=body)
+        assert response.status_code == 401
+    response = await async_client.post(
+        '/login', json={**body, 'email': test_user_email.upper()}
+    )
+    assert response.status_code == 429
+    assert int(response.headers['retry-after']) >= 1
+
+    """other accounts from the same client are limited per IP"""
+    statuses = [
+        (
+            await async_client.post(
+                '/login', json={**body, 'email': f'user{i}@example.com'}
+            )
+        ).status_code
+        for i in range(settings.login_ip_burst)
+    ]
+    assert statuses.count(429) == settings.login_email_burst + 1
+
+    """hashing capacity exhausted: shed load right away"""
+    monkeypatch.setattr(settings, 'login_rate_limit_enabled', False)
+    monkeypatch.setattr(
+        password_check_gate, 'in_flight', password_check_gate.limit
+    )
+    response = await async_client.post('/login', json=body)
+    assert response.status_code == 503
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_identical_logins_share_verification(
+    test_user_email: str,
+    test_user_password: str,
+    test_session_factory: async_sessionmaker[AsyncSession],
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'login_rate_limit_enabled', False)
+    await _create_login_user(
+        test_session_factory, test_user_email, test_user_password, rounds=4
+    )
+    leaders = LOGIN_VERIFICATIONS.labels('leader').value
+    shared = LOGIN_VERIFICATIONS.labels('shared').value
+    body = {'email': test_user_email, 'password': test_user_password}
+    responses = await asyncio.gather(
+        *(async_client.post('/login', json=body) for _ in range(4))
+    )
+    assert [response.status_code for response in responses] == [200] * 4
+    tokens = {response.json()['access_token'] for response in responses}
+    refresh_tokens = {
+        response.json()['refresh_token'] for response in responses
+    }
+    assert len(tokens) == len(refresh_tokens) == 4
+    assert LOGIN_VERIFICATIONS.labels('leader').value - leaders < 4
+    assert LOGIN_VERIFICATIONS.labels('shared').value > shared
+
+    """different password is a different flight, and fails"""
+    responses = await asyncio.gather(
+        async_client.post('/login', json=body),
+        async_client.post('/login', json={**body, 'password': 'Wrong1'}),
+    )
+    assert [response.status_code for response in responses] == [200, 401]
@@ -0,0 +1,49 @@
+from pathlib import Path
+from typing import Generator
+
+import pytest
+from httpx import AsyncClient
+from jose import jwk, jwt
+
+from src.core import jwt_keys
+from src.core.jwt_keys import generate_pem
+from src.core.settings import settings
+from src.core.tokens import reload_token_codec
+from src.models.user_model import User
+
+
+@pytest.fixture
+def rsa_keys_dir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[Path, None, None]:
+    (tmp_path / 'k1.pem').write_bytes(generate_pem('rsa'))
+    monkeypatch.setattr(settings, 'jwt_keys_dir', str(tmp_path))
+    reload_token_codec()
+    yield tmp_path
+    monkeypatch.undo()
+    reload_token_codec()
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_jwks_is_cacheable(
+    rsa_keys_dir: Path, test_user: User, async_client: AsyncClient
+) -> None:
+    response = await async_client.get('/.well-known/jwks.json')
+    assert response.status_code == 200
+    assert 'max-age' in response.headers['cache-control']
+    (key,) = response.json()['keys']
+    assert key['kid'] == 'k1' and key['kty'] == 'RSA'
+    assert 'd' not in key
+
+    """token verifies with the published key only"""
+    token = test_user.generate_token()['access_token']
+    payload = jwt.decode(token, jwk.construct(key), algorithms=['RS256'])
+    assert payload['user_id'] == str(test_user.id)
+
+    response = await async_client.get(
+        '/.well-known/jwks.json',
+        headers={'If-None-Match': response.headers['etag']},
+    )
+    assert response.status_code == 304
+    assert jwt_keys.jwks_document.cache_info().hits >= 1
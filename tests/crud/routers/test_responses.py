@@ -0,0 +1,26 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+import asyncpg.pgproto.pgproto as pgproto
+
+from src.crud.routers.responses import user_response
+from src.schemas.user_schema import UserSchema
+
+
+# @pytest.mark.active
+def test_user_response_matches_pydantic_json() -> None:
+    user = UserSchema.model_construct(
+        id=uuid.uuid4(),
+        email='user@example.com',
+        full_name=None,
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+    )
+    expected = json.loads(user.model_dump_json())
+    assert json.loads(user_response(user).body) == expected
+    assert json.loads(user_response([user, user]).body) == [expected] * 2
+
+    """asyncpg hands out its own UUID subclass"""
+    row_user = user.model_copy(update={'id': pgproto.UUID(str(user.id))})
+    assert json.loads(user_response(row_user).body) == expected
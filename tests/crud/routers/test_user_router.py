@@ -0,0 +1,178 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.settings import settings
+from src.models.user_model import User
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_register_and_read_user(
+    test_user_email: str,
+    test_user_password: str,
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 4)
+    body = {
+        'email': test_user_email,
+        'full_name': 'Test User',
+        'password': test_user_password,
+    }
+    response = await async_client.post('/users', json=body)
+    assert response.status_code == 201
+    created = response.json()
+    assert created['email'] == test_user_email
+    assert 'password' not in created and 'hashed_password' not in created
+
+    """duplicate email"""
+    response = await async_client.post('/users', json=body)
+    assert response.status_code == 409
+
+    """profile needs a token"""
+    response = await async_client.get(f'/users/{test_user_email}')
+    assert response.status_code == 401
+    response = await async_client.get(
+        f'/users/{test_user_email}',
+        headers={'Authorization': 'Bearer not-a-token'},
+    )
+    assert response.status_code == 401
+
+    response = await async_client.post(
+        '/login',
+        json={'email': test_user_email, 'password': test_user_password},
+    )
+    headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+    response = await async_client.get(
+        f'/users/{test_user_email}', headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json() == created
+
+    """other users' profiles are for admins only, existing or not"""
+    other = {'email': 'other@example.com', 'password': test_user_password}
+    response = await async_client.post('/users', json=other)
+    assert response.status_code == 201
+    response = await async_client.post('/login', json=other)
+    other_headers = {
+        'Authorization': f'Bearer {response.json()["access_token"]}'
+    }
+    for email in (test_user_email, 'nonexisting@example.com'):
+        response = await async_client.get(
+            f'/users/{email}', headers=other_headers
+        )
+        assert response.status_code == 403
+
+    monkeypatch.setattr(
+        settings, 'admin_user_ids', frozenset({uuid.UUID(created['id'])})
+    )
+    response = await async_client.get(
+        '/users/other@example.com', headers=headers
+    )
+    assert response.status_code == 200
+    response = await async_client.get(
+        '/users/nonexisting@example.com', headers=headers
+    )
+    assert response.status_code == 404
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_list_users_pages(
+    test_user: User,
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 4)
+    emails = [f'user{i}@example.com' for i in range(3)]
+    for email in emails:
+        response = await async_client.post(
+            '/users', json={'email': email, 'password': 'Password1'}
+        )
+        assert response.status_code == 201
+    monkeypatch.setattr(settings, 'admin_user_ids', frozenset({test_user.id}))
+    headers = {
+        'Authorization': f'Bearer {test_user.generate_token()["access_token"]}'
+    }
+    assert (await async_client.get('/users')).status_code == 401
+
+    """self registered users can't list accounts"""
+    response = await async_client.post(
+        '/login', json={'email': emails[0], 'password': 'Password1'}
+    )
+    user_headers = {
+        'Authorization': f'Bearer {response.json()["access_token"]}'
+    }
+    response = await async_client.get('/users', headers=user_headers)
+    assert response.status_code == 403
+
+    response = await async_client.get('/users?limit=2', headers=headers)
+    assert response.status_code == 200
+    first = response.json()
+    assert [user['email'] for user in first['users']] == emails[:2]
+    response = await async_client.get(
+        '/users',
+        params={'limit': 2, 'cursor': first['next_cursor']},
+        headers=headers,
+    )
+    second = response.json()
+    assert [user['email'] for user in second['users']] == emails[2:]
+    assert second['next_cursor'] is None
+
+    response = await async_client.get(
+        '/users', params={'cursor': 'garbage'}, headers=headers
+    )
+    assert response.status_code == 400
+    response = await async_client.get('/users?limit=0', headers=headers)
+    assert response.status_code == 422
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_export_users(
+    test_user: User,
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'bcrypt_rounds', 4)
+    monkeypatch.setattr(settings, 'admin_user_ids', frozenset({test_user.id}))
+    response = await async_client.post(
+        '/users', json={'email': 'user@example.com', 'password': 'Password1'}
+    )
+    assert response.status_code == 201
+    assert (await async_client.get('/users/export')).status_code == 401
+    headers = {
+        'Authorization': f'Bearer {test_user.generate_token()["access_token"]}'
+    }
+
+    """self registered users can't export accounts"""
+    response = await async_client.post(
+        '/login', json={'email': 'user@example.com', 'password': 'Password1'}
+    )
+    user_headers = {
+        'Authorization': f'Bearer {response.json()["access_token"]}'
+    }
+    response = await async_client.get('/users/export', headers=user_headers)
+    assert response.status_code == 403
+
+    response = await async_client.get('/users/export', headers=headers)
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = response.text.splitlines()
+    assert len(lines) == 1 and 'user@example.com' in lines[0]
+
+    response = await async_client.get(
+        '/users/export',
+        params={'format': 'csv', 'is_active': False},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'text/csv; charset=utf-8'
+    assert response.text == 'id,email,full_name,is_active,created_at\n'
+
+    response = await async_client.get(
+        '/users/export', params={'format': 'xml'}, headers=headers
+    )
+    assert response.status_code == 422
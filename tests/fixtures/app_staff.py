@@ -0,0 +1,47 @@
+from typing import AsyncGenerator
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.app import app
+from src.core.db_init import get_async_session, get_session_factory
+from src.core.hashing import shutdown_hash_executor
+from src.core.rate_limit import login_email_limiter, login_ip_limiter
+
+
+@pytest_asyncio.fixture(scope='function')
+async def test_session_factory(
+    create_empty_test_db: AsyncEngine,
+) -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to the freshly created test DB."""
+    return async_sessionmaker(bind=create_empty_test_db, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture(scope='function')
+async def async_client(
+    test_session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[AsyncClient, None]:
+    """
+    In-process client for the app with the DB session dependencies pointed
+    to the test DB. Lifespan is not run, so startup provisioning is skipped.
+    """
+
+    async def _get_test_session() -> AsyncGenerator[AsyncSession, None]:
+        async with test_session_factory() as session:
+            yield session
+
+    login_ip_limiter.clear()
+    login_email_limiter.clear()
+    app.dependency_overrides[get_async_session] = _get_test_session
+    app.dependency_overrides[get_session_factory] = lambda: (
+        test_session_factory
+    )
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url='http://test'
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        shutdown_hash_executor()
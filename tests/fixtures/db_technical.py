@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
+from src.crud.db.user_cache import user_cache
 from tests.consts_and_utils import (
     create_tables,
     create_test_db,
@@ -29,7 +30,6 @@ async def async_engine_factory_func() -> Callable[
         engine: AsyncEngine = create_async_engine(
             url=async_url,
             isolation_level='AUTOCOMMIT',
-            echo=True,
             future=True,
         )
         try:
@@ -47,7 +47,6 @@ async def async_admin_engine_instance(
     engine = create_async_engine(
         async_admin_url,
         isolation_level='AUTOCOMMIT',
-        echo=True,
         future=True,
     )
     try:
@@ -63,7 +62,6 @@ async def async_user_test_db_engine_instance(
     engine = create_async_engine(
         async_user_url_test_db,
         isolation_level='AUTOCOMMIT',
-        echo=True,
         future=True,
     )
     try:
@@ -87,6 +85,8 @@ async def create_empty_test_db(
     await grant_preveleges(engine=engine)
     local_engine = async_user_test_db_engine_instance
     await create_tables(engine=local_engine)
+    """Cached users belong to the previous incarnation of the test DB"""
+    user_cache.clear()
     try:
         """yield the engine connected to the test DB for consumers"""
         yield async_user_test_db_engine_instance
@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
+import pytest
 from jose import jwt
 
+from src.core.hashing import shutdown_hash_executor
 from src.core.settings import settings
 from src.models.user_model import User
 
@@ -63,3 +65,28 @@ def test_generate_token_contains_required_fields(test_user: User) -> None:
     print(f'\n\ntoken_data: {token_data}\n\n')
     assert set(token_data.keys()) == {'access_token'}
     assert isinstance(token_data['access_token'], str)
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_async_password_helpers(
+    test_user: User, raw_password: str
+) -> None:
+    """Async helpers should agree with their sync counterparts."""
+    hashed = await User.hash_password_async(raw_password)
+    assert bcrypt.checkpw(raw_password.encode(), hashed.value.encode())
+    assert hashed.queue_wait >= 0
+
+    checked = await test_user.validate_password_async(raw_password)
+    assert checked.value is True
+    checked = await test_user.validate_password_async('WrongPassword')
+    assert checked.value is False
+    shutdown_hash_executor()
+
+
+# @pytest.mark.active
+def test_decode_token(test_user: User) -> None:
+    token: str = test_user.generate_token()['access_token']
+    assert User.decode_token(token)['user_id'] == str(test_user.id)
+    with pytest.raises(jwt.JWTError):
+        User.decode_token(token + 'x')
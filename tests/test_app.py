@@ -0,0 +1,64 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.core import engines
+
+IMPORT_TIME_BUDGET = 2.0
+
+PROBE = """
+import json, time
+started_at = time.perf_counter()
+import src.app
+elapsed = time.perf_counter() - started_at
+from src.core.engines import created_engines
+print(json.dumps({'elapsed': elapsed, 'engines': created_engines()}))
+"""
+
+
+# @pytest.mark.active
+def test_import_app_is_cheap_and_creates_no_engines() -> None:
+    """Importing the app must not build engines, they are created lazily."""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f'\n\nsrc.app import time: {probe["elapsed"] * 1000:.0f}ms\n\n')
+    assert probe['engines'] == []
+    assert probe['elapsed'] < IMPORT_TIME_BUDGET
+
+
+# @pytest.mark.active
+@pytest.mark.asyncio
+async def test_engine_registry_lifecycle() -> None:
+    created: list[AsyncEngine] = []
+
+    def _factory() -> AsyncEngine:
+        engine = create_async_engine('postgresql+asyncpg://u:p@localhost/db')
+        created.append(engine)
+        return engine
+
+    engines.register_engine('test', _factory)
+    try:
+        assert 'test' not in engines.created_engines()
+        engine = engines.get_engine('test')
+        assert engines.get_engine('test') is engine
+        assert 'test' in engines.created_engines()
+
+        """child process after fork gets its own engine"""
+        engines._forget_inherited_engines()
+        assert engines.get_engine('test') is not engine
+        assert len(created) == 2
+
+        await engines.close_all_engines()
+        assert engines.created_engines() == []
+    finally:
+        engines._factories.pop('test')